@@ -0,0 +1,253 @@
+from __future__ import annotations
+
+from PyQt5.QtCore import QLineF, QPointF, QRectF, Qt
+from PyQt5.QtGui import QColor, QFontMetricsF, QPainterPath
+from PyQt5.QtWidgets import QGraphicsItem, QStyle, QStyleOptionGraphicsItem
+
+from canvas.items.decorator_pool import bp_pen, ilk_pen, label_font, line_pen
+from canvas.items.device_item import DeviceItem
+from canvas.items.signal_chip_item import exec_chip_menu, paint_chip
+from canvas.items.test_block import should_show_test_block
+from diagnostics.profiler import PROFILER
+
+BP_COLOR = QColor(160, 40, 40)
+ILK_COLOR = QColor(55, 65, 80)
+
+
+def _chip_key(chip) -> tuple[str, str]:
+    return chip.direction, chip.signal_id
+
+
+class BatchedDeviceItem(DeviceItem):
+    """Equipo que dibuja sus filas (chips, líneas base, B.P. y enclavamientos) en su propio
+    `paint`, sin items hijos.
+
+    Los chips son los `ChipData` del layout; la geometría de las filas visibles se calcula
+    al rearmar/desplazar (`_layout_chips`) y el click, el menú contextual, el doble click y
+    el tooltip se resuelven por índice de fila. La selección de filas vive en el equipo
+    (que queda seleccionado mientras tenga filas seleccionadas).
+    """
+
+    def __init__(self, device_id: str, name: str, dev_type: str):
+        super().__init__(device_id, name, dev_type)
+        self._selected_rows: set[tuple[str, str]] = set()
+        self._row_press = False
+        # geometría precalculada de las filas visibles
+        self._rows: list[tuple[QRectF, object]] = []
+        self._line_segs: list[QLineF] = []
+        self._bp_segs: list[QLineF] = []
+        self._ilk_segs: list[QLineF] = []
+        self._labels: list[tuple[QRectF, str, QColor]] = []
+        self._shape = QPainterPath()
+        self.setAcceptHoverEvents(True)
+        self.setFlag(QGraphicsItem.ItemUsesExtendedStyleOption, True)
+
+    # ---------------- Public API ----------------
+    def set_signals(self, in_chips, out_chips) -> None:
+        self.prepareGeometryChange()
+        self._in_chips = list(in_chips)
+        self._out_chips = list(out_chips)
+        self._selected_rows &= {_chip_key(c) for c in self._in_chips + self._out_chips}
+        self._auto_resize_and_layout()
+
+    def select_chip(self, chip):
+        self.reveal_chip(chip)
+        self._selected_rows = {_chip_key(chip)}
+        self.setSelected(True)
+        self.update()
+        return self
+
+    def selected_chips(self) -> list:
+        return [c for c in self._in_chips + self._out_chips if _chip_key(c) in self._selected_rows]
+
+    # ---------------- Geometry ----------------
+    def boundingRect(self) -> QRectF:
+        r = self.rect()
+        side = self.CHIP_W + self.CONNECTOR_GAP
+        left = side if self._in_chips else 0
+        right = side if self._out_chips else 0
+        return QRectF(r.x() - left - 1, r.y() - 1, r.width() + left + right + 2, r.height() + 2)
+
+    def shape(self) -> QPainterPath:
+        return self._shape
+
+    def _visible_range(self) -> tuple[float, int, int]:
+        top = self.HEADER_H + self.CAPTIONS_H + self.PAD_TOP
+        max_rows = max(1, int((self.rect().height() - top - self.BOTTOM_PAD) / self.ROW_H))
+        return top, self._scroll, max_rows
+
+    def _layout_chips(self) -> None:
+        top, start, max_rows = self._visible_range()
+        total_rows = max(len(self._in_chips), len(self._out_chips), 1)
+        self._scroll = start = max(0, min(start, total_rows - max_rows))
+        self._has_overflow = total_rows > max_rows
+        self._overflow_hidden = max(0, total_rows - max_rows)
+
+        fm = QFontMetricsF(label_font())
+        rows, lines, bp, ilk, labels = [], [], [], [], []
+        shape = QPainterPath()
+        shape.addRect(self.rect())
+
+        def label(text: str, cx: float, y: float, color: QColor, left: float | None = None):
+            w = fm.horizontalAdvance(text)
+            x = cx - w / 2 if left is None else left
+            labels.append((QRectF(x, y - 18, w, fm.height()), text, color))
+
+        def cross(cx: float, y: float):
+            bp.append(QLineF(cx - 6, y - 6, cx + 6, y + 6))
+            bp.append(QLineF(cx - 6, y + 6, cx + 6, y - 6))
+
+        for direction, chips in (("IN", self._in_chips), ("OUT", self._out_chips)):
+            for r, chip in enumerate(chips[start:start + max_rows]):
+                if direction == "IN":
+                    x0, x1 = 0.0, float(-self.CONNECTOR_GAP)
+                    rect = QRectF(x1 - self.CHIP_W, top + r * self.ROW_H, self.CHIP_W, self.CHIP_H)
+                else:
+                    x0 = self.rect().width()
+                    x1 = x0 + self.CONNECTOR_GAP
+                    rect = QRectF(x1, top + r * self.ROW_H, self.CHIP_W, self.CHIP_H)
+                y = rect.center().y()
+                rows.append((rect, chip))
+                shape.addRect(rect)
+                lines.append(QLineF(x0, y, x1, y))
+
+                if chip.test_block and should_show_test_block(direction, chip.nature):
+                    cx = x0 + (x1 - x0) / 2
+                    cross(cx, y)
+                    label("B.P.", cx, y, BP_COLOR)
+
+                if direction != "IN":
+                    continue
+                # Enclavamientos (IN): hasta 2 contactos NC en serie, el resto como +N
+                tags = [t for t in (chip.interlocks or []) if (t or "").strip()]
+                for j, tag in enumerate(tags[:2]):
+                    cx = max(min(-(26 + j * 30), -14), x1 + 14)
+                    ilk.append(QLineF(cx - 6, y - 7, cx - 6, y + 7))
+                    ilk.append(QLineF(cx + 2, y - 7, cx + 2, y + 7))
+                    ilk.append(QLineF(cx - 8, y - 3, cx + 4, y + 3))
+                    label(tag, cx, y, ILK_COLOR)
+                if len(tags) > 2:
+                    text = f"+{len(tags) - 2}"
+                    label(text, 0, y, ILK_COLOR, left=x1 - fm.horizontalAdvance(text) - 4)
+
+        self._rows, self._line_segs, self._bp_segs, self._ilk_segs, self._labels = rows, lines, bp, ilk, labels
+        self._shape = shape
+
+    def _row_at(self, pos: QPointF):
+        """Chip bajo `pos` (coordenadas del item), calculado por índice de fila."""
+        top, start, max_rows = self._visible_range()
+        x = pos.x()
+        if -self.CONNECTOR_GAP - self.CHIP_W <= x <= -self.CONNECTOR_GAP:
+            chips = self._in_chips
+        elif self.rect().width() + self.CONNECTOR_GAP <= x <= self.rect().width() + self.CONNECTOR_GAP + self.CHIP_W:
+            chips = self._out_chips
+        else:
+            return None
+        dy = pos.y() - top
+        if dy < 0:
+            return None
+        r = int(dy // self.ROW_H)
+        if r >= max_rows or dy - r * self.ROW_H > self.CHIP_H or start + r >= len(chips):
+            return None
+        return chips[start + r]
+
+    # ---------------- Paint ----------------
+    def _body_selected(self) -> bool:
+        return self.isSelected() and not self._selected_rows
+
+    def paint(self, painter, option, widget=None):
+        # el recuadro punteado de selección de Qt abarcaría también las filas
+        body = QStyleOptionGraphicsItem(option)
+        body.state &= ~QStyle.State_Selected
+        super().paint(painter, body, widget)
+
+        exposed = option.exposedRect
+        painter.save()
+        painter.setBrush(Qt.NoBrush)
+        if self._line_segs:
+            painter.setPen(line_pen())
+            painter.drawLines(self._line_segs)
+        if self._bp_segs:
+            painter.setPen(bp_pen())
+            painter.drawLines(self._bp_segs)
+        if self._ilk_segs:
+            painter.setPen(ilk_pen())
+            painter.drawLines(self._ilk_segs)
+        painter.setFont(label_font())
+        for rect, text, color in self._labels:
+            if rect.intersects(exposed):
+                painter.setPen(color)
+                painter.drawText(rect, Qt.AlignLeft | Qt.AlignTop, text)
+        selected = self._selected_rows
+        for rect, chip in self._rows:
+            if rect.intersects(exposed):
+                paint_chip(painter, rect, chip, _chip_key(chip) in selected)
+        painter.restore()
+
+    # ---------------- Events ----------------
+    def itemChange(self, change, value):
+        if change == QGraphicsItem.ItemSelectedHasChanged and not value and self._selected_rows:
+            self._selected_rows = set()
+            self.update()
+        return super().itemChange(change, value)
+
+    def mousePressEvent(self, event):
+        chip = self._row_at(event.pos())
+        self._row_press = chip is not None
+        if chip is None:
+            super().mousePressEvent(event)
+            return
+        if event.button() == Qt.LeftButton:
+            key = _chip_key(chip)
+            if event.modifiers() & Qt.ControlModifier:
+                self._selected_rows ^= {key}
+            else:
+                if self.scene() is not None:
+                    self.scene().clearSelection()
+                self._selected_rows = {key}
+            if self._selected_rows:
+                self.setSelected(True)
+            self.update()
+        event.accept()
+
+    def mouseMoveEvent(self, event):
+        if self._row_press:
+            event.accept()
+            return
+        super().mouseMoveEvent(event)
+
+    def mouseReleaseEvent(self, event):
+        if self._row_press:
+            self._row_press = False
+            event.accept()
+            return
+        super().mouseReleaseEvent(event)
+
+    def mouseDoubleClickEvent(self, event):
+        chip = self._row_at(event.pos())
+        scene = self.scene()
+        if chip is not None and scene and hasattr(scene, "edit_signal_from_chip"):
+            scene.edit_signal_from_chip(chip)
+            event.accept()
+            return
+        super().mouseDoubleClickEvent(event)
+
+    def contextMenuEvent(self, event):
+        chip = self._row_at(event.pos())
+        if chip is None:
+            super().contextMenuEvent(event)
+            return
+        exec_chip_menu(self.scene(), chip, event.screenPos())
+
+    def hoverMoveEvent(self, event):
+        chip = self._row_at(event.pos())
+        self.setToolTip(chip.tooltip if chip is not None else "")
+        super().hoverMoveEvent(event)
+
+    def hoverLeaveEvent(self, event):
+        self.setToolTip("")
+        super().hoverLeaveEvent(event)
+
+
+PROFILER.hook(BatchedDeviceItem, "_layout_chips")
+PROFILER.hook(BatchedDeviceItem, "paint")
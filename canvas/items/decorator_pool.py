@@ -0,0 +1,140 @@
+from __future__ import annotations
+
+from functools import lru_cache
+
+from PyQt5.QtCore import Qt
+from PyQt5.QtGui import QBrush, QColor, QFont, QPainterPath, QPen
+from PyQt5.QtWidgets import QGraphicsPathItem, QGraphicsSimpleTextItem
+
+# Tipos de decoración (cada uno con su estilo fijo)
+LINE = "line"            # línea base equipo-chip
+BP_SYMBOL = "bp_sym"     # cruz de block de pruebas
+BP_LABEL = "bp_lbl"      # texto "B.P."
+ILK_SYMBOL = "ilk_sym"   # contacto NC de enclavamiento
+ILK_LABEL = "ilk_lbl"    # relay_tag del enclavamiento (o "+N")
+
+# Items libres guardados por tipo; el resto se deja al recolector.
+MAX_FREE_PER_KIND = 4000
+
+
+# ---------------- Recursos compartidos ----------------
+# Pens, brushes, fuentes y formas se crean una vez (perezosamente: requieren QApplication)
+# y los comparten todas las decoraciones de todos los equipos.
+@lru_cache(maxsize=None)
+def line_pen() -> QPen:
+    return QPen(QColor(170, 180, 190), 1)
+
+
+@lru_cache(maxsize=None)
+def bp_pen() -> QPen:
+    return QPen(QColor(160, 40, 40), 1.6)
+
+
+@lru_cache(maxsize=None)
+def ilk_pen() -> QPen:
+    return QPen(QColor(40, 40, 40), 1.2)
+
+
+@lru_cache(maxsize=None)
+def no_brush() -> QBrush:
+    return QBrush(Qt.NoBrush)
+
+
+@lru_cache(maxsize=None)
+def label_font() -> QFont:
+    f = QFont("Segoe UI", 7)
+    f.setBold(True)
+    return f
+
+
+@lru_cache(maxsize=None)
+def bp_cross_path() -> QPainterPath:
+    """Cruz del B.P., centrada en (0, 0)."""
+    p = QPainterPath()
+    p.moveTo(-6, -6)
+    p.lineTo(6, 6)
+    p.moveTo(-6, 6)
+    p.lineTo(6, -6)
+    return p
+
+
+@lru_cache(maxsize=None)
+def nc_contact_path() -> QPainterPath:
+    """Contacto NC (dos barras + diagonal), relativo al centro del símbolo."""
+    p = QPainterPath()
+    p.moveTo(-6, -7)
+    p.lineTo(-6, 7)
+    p.moveTo(2, -7)
+    p.lineTo(2, 7)
+    p.moveTo(-8, -3)
+    p.lineTo(4, 3)
+    return p
+
+
+@lru_cache(maxsize=256)
+def hline_path(length: float) -> QPainterPath:
+    """Segmento horizontal desde (0, 0); el largo depende del ancho del chip, que se repite."""
+    p = QPainterPath()
+    p.moveTo(0, 0)
+    p.lineTo(length, 0)
+    return p
+
+
+def _create(kind: str, parent):
+    if kind in (BP_LABEL, ILK_LABEL):
+        item = QGraphicsSimpleTextItem("B.P." if kind == BP_LABEL else "", parent)
+        item.setFont(label_font())
+        item.setBrush(QColor(160, 40, 40) if kind == BP_LABEL else QColor(55, 65, 80))
+        item.setZValue(-9)
+        return item
+    item = QGraphicsPathItem(parent)
+    item.setBrush(no_brush())
+    if kind == LINE:
+        item.setPen(line_pen())
+        item.setZValue(-10)  # detrás de chips
+    elif kind == BP_SYMBOL:
+        item.setPen(bp_pen())
+        item.setPath(bp_cross_path())
+        item.setZValue(-9)
+    else:
+        item.setPen(ilk_pen())
+        item.setPath(nc_contact_path())
+        item.setZValue(-9)
+    return item
+
+
+class DecoratorPool:
+    """Pool de items decorativos compartido por todos los DeviceItem.
+
+    Re-armar un equipo devuelve las filas sobrantes al pool y toma de él las que faltan;
+    en régimen (mismas cantidades de filas) no se crea ni se destruye ningún item.
+    """
+
+    def __init__(self):
+        self._free: dict[str, list] = {}
+
+    def acquire(self, kind: str, parent):
+        free = self._free.get(kind)
+        if free:
+            item = free.pop()
+            item.setParentItem(parent)
+            item.setVisible(True)
+            return item
+        return _create(kind, parent)
+
+    def release(self, kind: str, item) -> None:
+        item.setVisible(False)
+        item.setParentItem(None)
+        if item.scene() is not None:
+            item.scene().removeItem(item)
+        free = self._free.setdefault(kind, [])
+        if len(free) < MAX_FREE_PER_KIND:
+            free.append(item)
+
+    def free_count(self, kind: str | None = None) -> int:
+        if kind is not None:
+            return len(self._free.get(kind, ()))
+        return sum(len(v) for v in self._free.values())
+
+
+POOL = DecoratorPool()
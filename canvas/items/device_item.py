@@ -1,18 +1,23 @@
 from __future__ import annotations
 
 import json
-from PyQt5.QtCore import Qt, QRectF
-from PyQt5.QtGui import QBrush, QPen, QFont, QColor, QPainter, QPainterPath
-from PyQt5.QtWidgets import QGraphicsRectItem, QMenu, QGraphicsPathItem, QGraphicsSimpleTextItem
+from PyQt5.QtCore import Qt, QPointF, QRectF
+from PyQt5.QtGui import QBrush, QPen, QFont, QColor, QPainter
+from PyQt5.QtWidgets import QGraphicsItem, QGraphicsRectItem, QMenu, QGraphicsPathItem, QGraphicsSimpleTextItem
 
+from canvas.items.decorator_pool import (
+    POOL, BP_LABEL, BP_SYMBOL, ILK_LABEL, ILK_SYMBOL, LINE, hline_path,
+)
 from canvas.items.signal_chip_item import SignalChipItem
 from canvas.items.test_block import should_show_test_block
+from diagnostics.profiler import PROFILER
 
 
 class DeviceItem(QGraphicsRectItem):
     """Nodo de equipo (IED o primario) con chips IN/OUT.
 
-    - Sin líneas entre equipos: claridad por listas IN/OUT separadas.
+    - Sin líneas entre equipos: claridad por listas IN/OUT separadas (las conexiones son
+      una capa opcional de la escena, ver `LinkOverlayItem`).
     - Auto-resize por cantidad de señales (hasta tope) + scroll interno con rueda.
     """
 
@@ -32,6 +37,10 @@ class DeviceItem(QGraphicsRectItem):
     # Necesaria para dibujar decoraciones "en serie" (B.P. / enclavamientos).
     CONNECTOR_GAP = 80
 
+    # tamaño de un chip (SignalChipItem / fila agrupada)
+    CHIP_W = 300
+    CHIP_H = 22
+
     def __init__(self, device_id: str, name: str, dev_type: str):
         super().__init__(0, 0, self.W, self.MIN_H)
         self.device_id = device_id
@@ -58,6 +67,9 @@ class DeviceItem(QGraphicsRectItem):
         self._in_ilk_symbols: list[list[QGraphicsPathItem]] = []
         self._in_ilk_labels: list[list[QGraphicsSimpleTextItem]] = []
 
+        # DeviceLayoutData con que se armaron los chips (CanvasScene.reconcile compara contra él)
+        self.layout_data = None
+
         self._scroll = 0
         self._has_overflow = False
         self._overflow_hidden = 0
@@ -79,12 +91,14 @@ class DeviceItem(QGraphicsRectItem):
         self.update()
 
     def set_signals(self, in_chips: list[SignalChipItem], out_chips: list[SignalChipItem]) -> None:
-        # detach old
+        # detach old (sin padre quedarían como items sueltos de la escena)
         for c in self._in_chips + self._out_chips:
             c.setParentItem(None)
+            if c.scene() is not None:
+                c.scene().removeItem(c)
 
-        # detach / delete old decorators
-        self._reset_decorators()
+        # decoraciones: se conservan las filas que siguen existiendo, el resto vuelve al pool
+        self._trim_decorators(len(in_chips), len(out_chips))
 
         self._in_chips = list(in_chips)
         self._out_chips = list(out_chips)
@@ -94,77 +108,106 @@ class DeviceItem(QGraphicsRectItem):
 
         self._auto_resize_and_layout()
 
-    def _reset_decorators(self) -> None:
-        """Elimina todos los items decorativos (líneas, BP, enclavamientos).
-
-        Nota: los QGraphicsItem se garbage-coleccionan cuando quedan sin escena/parent.
-        """
-        for it in self._in_lines + self._out_lines:
-            it.setParentItem(None)
-        for it in self._out_bp_symbols + self._out_bp_labels:
-            it.setParentItem(None)
-        for it in self._in_bp_symbols + self._in_bp_labels:
-            it.setParentItem(None)
-        for row in self._in_ilk_symbols:
-            for it in row:
-                it.setParentItem(None)
-        for row in self._in_ilk_labels:
-            for it in row:
-                it.setParentItem(None)
-
-        self._in_lines = []
-        self._out_lines = []
-        self._out_bp_symbols = []
-        self._out_bp_labels = []
-        self._in_bp_symbols = []
-        self._in_bp_labels = []
-        self._in_ilk_symbols = []
-        self._in_ilk_labels = []
+    def find_chip(self, signal_id: str, direction: str | None = None) -> SignalChipItem | None:
+        chips = self._in_chips if direction == "IN" else self._out_chips if direction == "OUT" \
+            else self._in_chips + self._out_chips
+        return next((c for c in chips if c.signal_id == signal_id), None)
+
+    def reveal_chip(self, chip: SignalChipItem) -> None:
+        """Desplaza las filas (scroll interno) para que el chip quede visible."""
+        chips = self._in_chips if chip.direction == "IN" else self._out_chips
+        try:
+            idx = chips.index(chip)
+        except ValueError:
+            return
+        top = self.HEADER_H + self.CAPTIONS_H + self.PAD_TOP
+        max_rows = max(1, int((self.rect().height() - top - self.BOTTOM_PAD) / self.ROW_H))
+        if idx < self._scroll:
+            self._scroll = idx
+        elif idx >= self._scroll + max_rows:
+            self._scroll = idx - max_rows + 1
+        else:
+            return
+        self._layout_chips()
+        self.update()
+        self._notify_rows_moved()
+
+    def select_chip(self, chip: SignalChipItem):
+        """Selecciona el chip (desplazando las filas si hace falta) y retorna el item a centrar."""
+        self.reveal_chip(chip)
+        chip.setSelected(True)
+        return chip
+
+    def selected_chips(self) -> list[SignalChipItem]:
+        return [c for c in self._in_chips + self._out_chips if c.isSelected()]
+
+    def row_anchor(self, direction: str, slot: int) -> QPointF:
+        """Punto (coordenadas del item) donde termina hacia afuera el chip de la fila `slot`;
+        las filas fuera del scroll se anclan al borde superior/inferior de la lista."""
+        top = self.HEADER_H + self.CAPTIONS_H + self.PAD_TOP
+        max_rows = max(1, int((self.rect().height() - top - self.BOTTOM_PAD) / self.ROW_H))
+        r = slot - self._scroll
+        if r < 0:
+            y = top
+        elif r >= max_rows:
+            y = top + max_rows * self.ROW_H
+        else:
+            y = top + r * self.ROW_H + self.CHIP_H / 2
+        if direction == "IN":
+            return QPointF(-self.CONNECTOR_GAP - self.CHIP_W, y)
+        return QPointF(self.rect().width() + self.CONNECTOR_GAP + self.CHIP_W, y)
+
+    def _notify_rows_moved(self) -> None:
+        """Avisa a la escena que cambiaron los anclajes del equipo (posición o scroll)."""
+        scene = self.scene()
+        if scene is not None and hasattr(scene, "device_moved"):
+            scene.device_moved(self.device_id)
+
+    def release_decorators(self) -> None:
+        """Devuelve todas las decoraciones al pool (antes de quitar el equipo de la escena)."""
+        self._trim_decorators(0, 0)
+
+    def _trim_decorators(self, n_in: int, n_out: int) -> None:
+        """Devuelve al pool compartido las decoraciones de filas >= n_in / n_out."""
+        for lines, n in ((self._in_lines, n_in), (self._out_lines, n_out)):
+            while len(lines) > n:
+                POOL.release(LINE, lines.pop())
+        for syms, lbls, n in ((self._in_bp_symbols, self._in_bp_labels, n_in),
+                              (self._out_bp_symbols, self._out_bp_labels, n_out)):
+            while len(syms) > n:
+                POOL.release(BP_SYMBOL, syms.pop())
+                POOL.release(BP_LABEL, lbls.pop())
+        while len(self._in_ilk_symbols) > n_in:
+            for it in self._in_ilk_symbols.pop():
+                POOL.release(ILK_SYMBOL, it)
+            for it in self._in_ilk_labels.pop():
+                POOL.release(ILK_LABEL, it)
 
     def _ensure_line(self, lines: list[QGraphicsPathItem], idx: int) -> QGraphicsPathItem:
         while len(lines) <= idx:
-            item = QGraphicsPathItem(self)
-            item.setPen(QPen(QColor(170, 180, 190), 1))
-            item.setBrush(QBrush(Qt.NoBrush))
-            item.setZValue(-10)  # detrás de chips
-            lines.append(item)
+            lines.append(POOL.acquire(LINE, self))
         return lines[idx]
 
     def _ensure_bp_items(self, idx: int):
         while len(self._out_bp_symbols) <= idx:
-            sym = QGraphicsPathItem(self)
-            sym.setPen(QPen(QColor(160, 40, 40), 1.6))
-            sym.setBrush(QBrush(Qt.NoBrush))
-            sym.setZValue(-9)
-            lbl = QGraphicsSimpleTextItem("B.P.", self)
-            f = QFont("Segoe UI", 7)
-            f.setBold(True)
-            lbl.setFont(f)
-            lbl.setBrush(QColor(160, 40, 40))
-            lbl.setZValue(-9)
-            self._out_bp_symbols.append(sym)
-            self._out_bp_labels.append(lbl)
+            self._out_bp_symbols.append(POOL.acquire(BP_SYMBOL, self))
+            self._out_bp_labels.append(POOL.acquire(BP_LABEL, self))
 
     def _ensure_in_bp_items(self, idx: int):
         while len(self._in_bp_symbols) <= idx:
-            sym = QGraphicsPathItem(self)
-            sym.setPen(QPen(QColor(160, 40, 40), 1.6))
-            sym.setBrush(QBrush(Qt.NoBrush))
-            sym.setZValue(-9)
-            lbl = QGraphicsSimpleTextItem("B.P.", self)
-            f = QFont("Segoe UI", 7)
-            f.setBold(True)
-            lbl.setFont(f)
-            lbl.setBrush(QColor(160, 40, 40))
-            lbl.setZValue(-9)
-            self._in_bp_symbols.append(sym)
-            self._in_bp_labels.append(lbl)
+            self._in_bp_symbols.append(POOL.acquire(BP_SYMBOL, self))
+            self._in_bp_labels.append(POOL.acquire(BP_LABEL, self))
 
     def _ensure_ilk_row(self, idx: int):
         while len(self._in_ilk_symbols) <= idx:
             self._in_ilk_symbols.append([])
             self._in_ilk_labels.append([])
 
+    def _ensure_ilk_items(self, idx: int, n: int):
+        while len(self._in_ilk_symbols[idx]) < n:
+            self._in_ilk_symbols[idx].append(POOL.acquire(ILK_SYMBOL, self))
+            self._in_ilk_labels[idx].append(POOL.acquire(ILK_LABEL, self))
+
     def _auto_resize_and_layout(self):
         top = self.HEADER_H + self.CAPTIONS_H + self.PAD_TOP
         desired_rows = max(len(self._in_chips), len(self._out_chips), 1)
@@ -200,28 +243,22 @@ class DeviceItem(QGraphicsRectItem):
         for idx, chip in enumerate(self._in_chips):
             if start <= idx < end:
                 chip.setVisible(True)
-                chip.setPos(-chip.boundingRect().width() - self.CONNECTOR_GAP, top + (idx - start) * self.ROW_H)
+                chip.setPos(-self.CHIP_W - self.CONNECTOR_GAP, top + (idx - start) * self.ROW_H)
 
                 # Línea base IN (siempre visible)
                 line = self._ensure_line(self._in_lines, idx)
-                y = chip.pos().y() + chip.boundingRect().height() / 2
+                y = chip.pos().y() + self.CHIP_H / 2
                 x0 = 0
-                x1 = chip.pos().x() + chip.boundingRect().width()  # ~ -CONNECTOR_GAP
-                path = QPainterPath()
-                path.moveTo(x0, y)
-                path.lineTo(x1, y)
-                line.setPath(path)
+                x1 = chip.pos().x() + self.CHIP_W  # ~ -CONNECTOR_GAP
+                # formas compartidas (cacheadas): el item sólo se posiciona
+                line.setPath(hline_path(x0 - x1))
+                line.setPos(x1, y)
                 line.setVisible(True)
 
                 self._ensure_in_bp_items(idx)
                 if bool(getattr(chip, "test_block", False)) and should_show_test_block("IN", chip.nature):
                     cx = x0 + (x1 - x0) / 2
-                    p = QPainterPath()
-                    p.moveTo(cx - 6, y - 6)
-                    p.lineTo(cx + 6, y + 6)
-                    p.moveTo(cx - 6, y + 6)
-                    p.lineTo(cx + 6, y - 6)
-                    self._in_bp_symbols[idx].setPath(p)
+                    self._in_bp_symbols[idx].setPos(cx, y)
                     self._in_bp_symbols[idx].setVisible(True)
 
                     br = self._in_bp_labels[idx].boundingRect()
@@ -239,19 +276,7 @@ class DeviceItem(QGraphicsRectItem):
                 extra = max(0, len(tags) - len(vis))
 
                 # Ensure items count (símbolos+labels) para tags visibles
-                while len(self._in_ilk_symbols[idx]) < len(vis):
-                    sym = QGraphicsPathItem(self)
-                    sym.setPen(QPen(QColor(40, 40, 40), 1.2))
-                    sym.setBrush(QBrush(Qt.NoBrush))
-                    sym.setZValue(-9)
-                    self._in_ilk_symbols[idx].append(sym)
-                    lbl = QGraphicsSimpleTextItem("", self)
-                    f = QFont("Segoe UI", 7)
-                    f.setBold(True)
-                    lbl.setFont(f)
-                    lbl.setBrush(QColor(55, 65, 80))
-                    lbl.setZValue(-9)
-                    self._in_ilk_labels[idx].append(lbl)
+                self._ensure_ilk_items(idx, len(vis))
 
                 # Hide unused existing
                 for k in range(len(vis), len(self._in_ilk_symbols[idx])):
@@ -266,15 +291,8 @@ class DeviceItem(QGraphicsRectItem):
                         # clamp within [x1+14, -14]
                         cx = max(min(cx, -14), x1 + 14)
 
-                        # NC contact: two bars + slash
-                        p = QPainterPath()
-                        p.moveTo(cx - 6, y - 7)
-                        p.lineTo(cx - 6, y + 7)
-                        p.moveTo(cx + 2, y - 7)
-                        p.lineTo(cx + 2, y + 7)
-                        p.moveTo(cx - 8, y - 3)
-                        p.lineTo(cx + 4, y + 3)
-                        self._in_ilk_symbols[idx][j].setPath(p)
+                        # NC contact: two bars + slash (forma compartida)
+                        self._in_ilk_symbols[idx][j].setPos(cx, y)
                         self._in_ilk_symbols[idx][j].setVisible(True)
 
                         self._in_ilk_labels[idx][j].setText(tag)
@@ -286,19 +304,7 @@ class DeviceItem(QGraphicsRectItem):
                     # extra summary
                     if extra > 0:
                         # reuse/add a label without symbol (3rd slot)
-                        if len(self._in_ilk_labels[idx]) < len(vis) + 1:
-                            lbl = QGraphicsSimpleTextItem("", self)
-                            f = QFont("Segoe UI", 7)
-                            f.setBold(True)
-                            lbl.setFont(f)
-                            lbl.setBrush(QColor(55, 65, 80))
-                            lbl.setZValue(-9)
-                            self._in_ilk_labels[idx].append(lbl)
-                            sym = QGraphicsPathItem(self)
-                            sym.setPen(QPen(QColor(40, 40, 40), 1.2))
-                            sym.setBrush(QBrush(Qt.NoBrush))
-                            sym.setZValue(-9)
-                            self._in_ilk_symbols[idx].append(sym)
+                        self._ensure_ilk_items(idx, len(vis) + 1)
 
                         j = len(vis)
                         self._in_ilk_symbols[idx][j].setVisible(False)
@@ -336,25 +342,18 @@ class DeviceItem(QGraphicsRectItem):
 
                 # Línea base OUT (siempre visible)
                 line = self._ensure_line(self._out_lines, idx)
-                y = chip.pos().y() + chip.boundingRect().height() / 2
+                y = chip.pos().y() + self.CHIP_H / 2
                 x0 = self.rect().width()
                 x1 = chip.pos().x()
-                path = QPainterPath()
-                path.moveTo(x0, y)
-                path.lineTo(x1, y)
-                line.setPath(path)
+                line.setPath(hline_path(x1 - x0))
+                line.setPos(x0, y)
                 line.setVisible(True)
 
                 # Block de pruebas (OUT): símbolo X + texto fijo "B.P."
                 self._ensure_bp_items(idx)
                 if bool(getattr(chip, "test_block", False)) and should_show_test_block("OUT", chip.nature):
                     cx = x0 + (x1 - x0) / 2
-                    p = QPainterPath()
-                    p.moveTo(cx - 6, y - 6)
-                    p.lineTo(cx + 6, y + 6)
-                    p.moveTo(cx - 6, y + 6)
-                    p.lineTo(cx + 6, y - 6)
-                    self._out_bp_symbols[idx].setPath(p)
+                    self._out_bp_symbols[idx].setPos(cx, y)
                     self._out_bp_symbols[idx].setVisible(True)
 
                     br = self._out_bp_labels[idx].boundingRect()
@@ -380,6 +379,7 @@ class DeviceItem(QGraphicsRectItem):
         self._scroll += step
         self._layout_chips()
         self.update()
+        self._notify_rows_moved()
         event.accept()
 
     def paint(self, painter: QPainter, option, widget=None):
@@ -387,7 +387,7 @@ class DeviceItem(QGraphicsRectItem):
         super().paint(painter, option, widget)
 
         # selection overlay
-        if self.isSelected():
+        if self._body_selected():
             painter.save()
             painter.setPen(QPen(QColor(60, 120, 200), 2))
             painter.setBrush(QBrush(Qt.NoBrush))
@@ -458,6 +458,14 @@ class DeviceItem(QGraphicsRectItem):
 
         painter.restore()
 
+    def _body_selected(self) -> bool:
+        return self.isSelected()
+
+    def itemChange(self, change, value):
+        if change == QGraphicsItem.ItemPositionHasChanged:
+            self._notify_rows_moved()
+        return super().itemChange(change, value)
+
     # ---------- Context menu ----------
     def contextMenuEvent(self, event):
         menu = QMenu()
@@ -499,3 +507,7 @@ class DeviceItem(QGraphicsRectItem):
         pen.setCosmetic(True)
         pen.setWidthF(1.2)
         return pen
+
+
+PROFILER.hook(DeviceItem, "_layout_chips")
+PROFILER.hook(DeviceItem, "paint")
@@ -0,0 +1,184 @@
+from __future__ import annotations
+
+import math
+from functools import lru_cache
+
+from PyQt5.QtCore import QPointF, QRectF, Qt
+from PyQt5.QtGui import QColor, QFont, QPainterPath, QPen
+from PyQt5.QtWidgets import QGraphicsItem, QStyleOptionGraphicsItem
+
+from domain.services.bay_links_service import bay_links
+from diagnostics.profiler import PROFILER
+
+# Umbrales de nivel de detalle (escala efectiva de la vista)
+LOD_FANS = 0.3       # por debajo: sólo el tronco de cada haz
+LOD_TEXT = 0.45      # por debajo: sin conteo sobre el haz
+
+# distancia entre el extremo del chip y el punto donde el haz se junta
+FAN_OUT = 60.0
+
+BASE = QColor(90, 120, 160, 140)
+ACCENT = QColor(40, 110, 210, 230)
+
+
+@lru_cache(maxsize=None)
+def _pen(width: float, hot: bool) -> QPen:
+    pen = QPen(ACCENT if hot else BASE, width)
+    pen.setCapStyle(Qt.RoundCap)
+    pen.setCosmetic(width <= 1.0)
+    return pen
+
+
+@lru_cache(maxsize=None)
+def _font() -> QFont:
+    return QFont("Segoe UI", 8, QFont.Bold)
+
+
+def _curve(path: QPainterPath, p: QPointF, q: QPointF) -> None:
+    """Tramo con salida y llegada horizontales (OUT hacia la derecha, IN desde la izquierda)."""
+    dx = max(FAN_OUT, abs(q.x() - p.x()) / 2)
+    path.moveTo(p)
+    path.cubicTo(QPointF(p.x() + dx, p.y()), QPointF(q.x() - dx, q.y()), q)
+
+
+class _Bundle:
+    __slots__ = ("out_dev", "in_dev", "links", "fans", "trunk", "width", "rect", "center")
+
+    def __init__(self, out_dev: str, in_dev: str, links):
+        self.out_dev = out_dev
+        self.in_dev = in_dev
+        self.links = links
+        self.fans = QPainterPath()
+        self.trunk = QPainterPath()
+        self.width = 1.0 + 1.5 * math.log2(len(links))
+        self.rect = QRectF()
+        self.center = QPointF()
+
+
+class LinkOverlayItem(QGraphicsItem):
+    """Conexiones entre los chips OUT e IN que comparten signal_id dentro de la bahía.
+
+    Un solo item para toda la escena (debajo de los equipos). Las conexiones de un mismo par
+    de equipos forman un haz: cada chip llega con un tramo corto a un punto de reunión y los
+    puntos se unen con un tronco de grosor según la cantidad. Las conexiones salen del índice
+    de extremos (`bay_links`); la geometría se recalcula sólo para los haces del equipo que se
+    movió o desplazó sus filas, y al pintar se descartan los haces fuera de la zona expuesta.
+    """
+
+    def __init__(self, scene):
+        super().__init__()
+        self._scene = scene
+        self._bundles: dict[tuple[str, str], _Bundle] = {}
+        self._by_device: dict[str, list[_Bundle]] = {}
+        self._rect = QRectF()
+        self.setZValue(-1)
+        self.setAcceptedMouseButtons(Qt.NoButton)
+        self.setAcceptHoverEvents(False)
+        self.setFlag(QGraphicsItem.ItemUsesExtendedStyleOption, True)
+
+    # ---------------- API ----------------
+    def rebuild(self) -> None:
+        """Vuelve a leer las conexiones de la bahía y recalcula todos los haces."""
+        bay = self._scene.project.bays.get(self._scene.bay_id)
+        links = bay_links(bay) if bay is not None else {}
+        items = self._scene.device_items
+        self._bundles = {}
+        self._by_device = {}
+        for (a, b), rows in links.items():
+            if a not in items or b not in items:
+                continue
+            bundle = _Bundle(a, b, rows)
+            self._bundles[(a, b)] = bundle
+            self._by_device.setdefault(a, []).append(bundle)
+            self._by_device.setdefault(b, []).append(bundle)
+        for bundle in self._bundles.values():
+            self._route(bundle)
+        self._update_rect()
+
+    def device_moved(self, device_id: str) -> None:
+        bundles = self._by_device.get(device_id)
+        if not bundles:
+            return
+        old = QRectF()
+        for bundle in bundles:
+            old = old.united(bundle.rect)
+            self._route(bundle)
+        self._update_rect()
+        self.update(old)
+        for bundle in bundles:
+            self.update(bundle.rect)
+
+    # ---------------- Geometría ----------------
+    def _route(self, bundle: _Bundle) -> None:
+        items = self._scene.device_items
+        src, dst = items[bundle.out_dev], items[bundle.in_dev]
+        outs = [src.mapToScene(src.row_anchor("OUT", s_out)) for s_out, _s_in, _sid in bundle.links]
+        ins = [dst.mapToScene(dst.row_anchor("IN", s_in)) for _s_out, s_in, _sid in bundle.links]
+
+        fans, trunk = QPainterPath(), QPainterPath()
+        if len(bundle.links) == 1:
+            _curve(trunk, outs[0], ins[0])
+        else:
+            # filas ocultas por scroll comparten anclaje: un tramo por punto distinto
+            s = QPointF(max(p.x() for p in outs) + FAN_OUT, sum(p.y() for p in outs) / len(outs))
+            t = QPointF(min(p.x() for p in ins) - FAN_OUT, sum(p.y() for p in ins) / len(ins))
+            for p in {(p.x(), p.y()) for p in outs}:
+                _curve(fans, QPointF(*p), s)
+            for p in {(p.x(), p.y()) for p in ins}:
+                _curve(fans, t, QPointF(*p))
+            _curve(trunk, s, t)
+        bundle.fans, bundle.trunk = fans, trunk
+        bundle.center = trunk.pointAtPercent(0.5)
+        m = bundle.width + 2
+        bundle.rect = fans.boundingRect().united(trunk.boundingRect()).adjusted(-m, -m, m, m)
+
+    def _update_rect(self) -> None:
+        rect = QRectF()
+        for bundle in self._bundles.values():
+            rect = rect.united(bundle.rect)
+        if rect != self._rect:
+            self.prepareGeometryChange()
+            self._rect = rect
+
+    # ---------------- Qt ----------------
+    def boundingRect(self) -> QRectF:
+        return self._rect
+
+    def shape(self) -> QPainterPath:
+        # no participa de la selección ni de los clicks
+        return QPainterPath()
+
+    def paint(self, painter, option, widget=None):
+        if not self._bundles:
+            return
+        lod = QStyleOptionGraphicsItem.levelOfDetailFromTransform(painter.worldTransform())
+        exposed = option.exposedRect
+        items = self._scene.device_items
+        selected = {d for d, it in items.items() if it.isSelected()}
+        painter.setBrush(Qt.NoBrush)
+        labels = []
+        for bundle in self._bundles.values():
+            if not bundle.rect.intersects(exposed):
+                continue
+            hot = bundle.out_dev in selected or bundle.in_dev in selected
+            if lod >= LOD_FANS and not bundle.fans.isEmpty():
+                painter.setPen(_pen(1.0, hot))
+                painter.drawPath(bundle.fans)
+            painter.setPen(_pen(bundle.width, hot))
+            painter.drawPath(bundle.trunk)
+            if lod >= LOD_TEXT and len(bundle.links) > 1:
+                labels.append((bundle.center, len(bundle.links)))
+
+        if labels:
+            painter.setFont(_font())
+            painter.setPen(QColor(35, 45, 55))
+            painter.setBrush(QColor(255, 255, 255, 220))
+            for c, n in labels:
+                r = QRectF(c.x() - 16, c.y() - 9, 32, 18)
+                painter.drawRoundedRect(r, 6, 6)
+                painter.drawText(r, Qt.AlignCenter, str(n))
+
+
+PROFILER.hook(LinkOverlayItem, "rebuild")
+PROFILER.hook(LinkOverlayItem, "device_moved")
+PROFILER.hook(LinkOverlayItem, "paint")
@@ -1,8 +1,12 @@
 from __future__ import annotations
-from PyQt5.QtCore import QRectF, Qt
+from functools import lru_cache
+
+from PyQt5.QtCore import QLineF, QRectF, Qt
 from PyQt5.QtGui import QBrush, QPen, QFont, QColor
 from PyQt5.QtWidgets import QGraphicsItem, QMenu
 
+from diagnostics.profiler import PROFILER
+
 class SignalChipItem(QGraphicsItem):
     def __init__(
         self, *,
@@ -32,64 +36,11 @@ class SignalChipItem(QGraphicsItem):
         self.setAcceptedMouseButtons(Qt.LeftButton | Qt.RightButton)
 
     def boundingRect(self) -> QRectF:
-        return QRectF(0, 0, self._w, self._h)
+        # incluye el medio trazo del borde (la vista puede no ajustar por antialiasing)
+        return QRectF(-1, -1, self._w + 2, self._h + 2)
 
     def paint(self, painter, option, widget=None):
-        if self.status == "PENDING":
-            fill, border = QColor(255, 230, 160), QColor(190, 140, 0)
-        elif self.nature == "ANALOG":
-            fill, border = QColor(200, 245, 210), QColor(80, 140, 90)
-        else:
-            fill, border = QColor(230, 235, 242), QColor(120, 135, 155)
-
-        painter.setPen(QPen(border, 1))
-        painter.setBrush(QBrush(fill))
-        painter.drawRoundedRect(self.boundingRect(), 6, 6)
-
-        # selection highlight
-        if self.isSelected():
-            painter.setPen(QPen(QColor(50, 120, 220), 2))
-            painter.setBrush(Qt.NoBrush)
-            painter.drawRoundedRect(self.boundingRect().adjusted(1, 1, -1, -1), 6, 6)
-
-        painter.setPen(QColor(25, 25, 25))
-        painter.setFont(QFont("Segoe UI", 9))
-
-        # reserve space for markers
-        marker_space = 54
-        text_rect = self.boundingRect().adjusted(8, 0, -marker_space, 0)
-
-        t = self.text
-        if len(t) > 62:
-            t = t[:59] + "…"
-        painter.drawText(text_rect, Qt.AlignVCenter | Qt.AlignLeft, t)
-
-        # markers area
-        x0 = self.boundingRect().right() - marker_space + 6
-        mid_y = self.boundingRect().center().y()
-
-        # Block de pruebas marker (OUT): texto fijo "B.P."
-        if self.test_block:
-            painter.setFont(QFont("Segoe UI", 7, QFont.Bold))
-            painter.setPen(QColor(160, 40, 40))
-            painter.drawText(QRectF(x0 - 2, 0, 26, self._h), Qt.AlignCenter, "B.P.")
-
-        # Interlock marker: draw a tiny NC symbol + count
-        if self.interlocks:
-            painter.setPen(QPen(QColor(40, 40, 40), 1))
-            # draw NC contact symbol near right edge
-            cx = x0 + 26
-            top = mid_y - 6
-            bot = mid_y + 6
-            painter.drawLine(cx, top, cx, bot)
-            painter.drawLine(cx + 8, top, cx + 8, bot)
-            # diagonal slash (NC indication)
-            painter.drawLine(cx - 2, mid_y - 2, cx + 10, mid_y + 2)
-
-            painter.setFont(QFont("Segoe UI", 7))
-            painter.setPen(QColor(55, 65, 80))
-            cnt = len(self.interlocks)
-            painter.drawText(QRectF(cx + 12, 0, 18, self._h), Qt.AlignVCenter | Qt.AlignLeft, f"x{cnt}")
+        paint_chip(painter, QRectF(0, 0, self._w, self._h), self, self.isSelected())
 
     def mouseDoubleClickEvent(self, event):
         scene = self.scene()
@@ -102,30 +53,102 @@ class SignalChipItem(QGraphicsItem):
         super().mouseDoubleClickEvent(event)
 
     def contextMenuEvent(self, event):
-        scene = self.scene()
-        menu = QMenu()
-
-        act_recognize = None
-        if self.status == "PENDING" and self.direction == "OUT":
-            act_recognize = menu.addAction("Reconocer señal…")
-
-        act_edit = menu.addAction("Editar señal (nombre/naturaleza)…")
-        act_decor = menu.addAction("Editar block de pruebas / enclavamientos…")
-        act_validate = menu.addAction("Validar señal")
-        menu.addSeparator()
-        act_delete = menu.addAction("Eliminar señal (ambos extremos)…")
-
-        chosen = menu.exec_(event.screenPos())
-        if not chosen or not scene:
-            return
-
-        if chosen == act_recognize and hasattr(scene, "recognize_signal_from_chip"):
-            scene.recognize_signal_from_chip(self)
-        elif chosen == act_edit and hasattr(scene, "edit_signal_from_chip"):
-            scene.edit_signal_from_chip(self)
-        elif chosen == act_decor and hasattr(scene, "edit_decorations_from_chip"):
-            scene.edit_decorations_from_chip(self)
-        elif chosen == act_validate and hasattr(scene, "validate_signal_from_chip"):
-            scene.validate_signal_from_chip(self)
-        elif chosen == act_delete and hasattr(scene, "delete_signal_from_chip"):
-            scene.delete_signal_from_chip(self)
+        exec_chip_menu(self.scene(), self, event.screenPos())
+
+
+@lru_cache(maxsize=None)
+def _font(size: int, bold: bool = False) -> QFont:
+    return QFont("Segoe UI", size, QFont.Bold if bold else QFont.Normal)
+
+
+def paint_chip(painter, rect: QRectF, chip, selected: bool) -> None:
+    """Dibuja un chip en `rect`. `chip` puede ser un SignalChipItem o un ChipData
+    (filas agrupadas de BatchedDeviceItem): sólo se leen texto, estado, naturaleza y marcas."""
+    if chip.status == "PENDING":
+        fill, border = QColor(255, 230, 160), QColor(190, 140, 0)
+    elif chip.nature == "ANALOG":
+        fill, border = QColor(200, 245, 210), QColor(80, 140, 90)
+    else:
+        fill, border = QColor(230, 235, 242), QColor(120, 135, 155)
+
+    painter.setPen(QPen(border, 1))
+    painter.setBrush(QBrush(fill))
+    painter.drawRoundedRect(rect, 6, 6)
+
+    # selection highlight
+    if selected:
+        painter.setPen(QPen(QColor(50, 120, 220), 2))
+        painter.setBrush(Qt.NoBrush)
+        painter.drawRoundedRect(rect.adjusted(1, 1, -1, -1), 6, 6)
+
+    painter.setPen(QColor(25, 25, 25))
+    painter.setFont(_font(9))
+
+    # reserve space for markers
+    marker_space = 54
+    text_rect = rect.adjusted(8, 0, -marker_space, 0)
+
+    t = chip.text
+    if len(t) > 62:
+        t = t[:59] + "…"
+    painter.drawText(text_rect, Qt.AlignVCenter | Qt.AlignLeft, t)
+
+    # markers area
+    x0 = rect.right() - marker_space + 6
+    mid_y = rect.center().y()
+
+    # Block de pruebas marker (OUT): texto fijo "B.P."
+    if chip.test_block:
+        painter.setFont(_font(7, True))
+        painter.setPen(QColor(160, 40, 40))
+        painter.drawText(QRectF(x0 - 2, rect.top(), 26, rect.height()), Qt.AlignCenter, "B.P.")
+
+    # Interlock marker: draw a tiny NC symbol + count
+    if chip.interlocks:
+        painter.setPen(QPen(QColor(40, 40, 40), 1))
+        # draw NC contact symbol near right edge
+        cx = x0 + 26
+        top = mid_y - 6
+        bot = mid_y + 6
+        painter.drawLine(QLineF(cx, top, cx, bot))
+        painter.drawLine(QLineF(cx + 8, top, cx + 8, bot))
+        # diagonal slash (NC indication)
+        painter.drawLine(QLineF(cx - 2, mid_y - 2, cx + 10, mid_y + 2))
+
+        painter.setFont(_font(7))
+        painter.setPen(QColor(55, 65, 80))
+        cnt = len(chip.interlocks)
+        painter.drawText(QRectF(cx + 12, rect.top(), 18, rect.height()), Qt.AlignVCenter | Qt.AlignLeft, f"x{cnt}")
+
+
+def exec_chip_menu(scene, chip, screen_pos) -> None:
+    """Menú contextual de un chip (item o fila agrupada); las acciones las resuelve la escena."""
+    menu = QMenu()
+
+    act_recognize = None
+    if chip.status == "PENDING" and chip.direction == "OUT":
+        act_recognize = menu.addAction("Reconocer señal…")
+
+    act_edit = menu.addAction("Editar señal (nombre/naturaleza)…")
+    act_decor = menu.addAction("Editar block de pruebas / enclavamientos…")
+    act_validate = menu.addAction("Validar señal")
+    menu.addSeparator()
+    act_delete = menu.addAction("Eliminar señal (ambos extremos)…")
+
+    chosen = menu.exec_(screen_pos)
+    if not chosen or not scene:
+        return
+
+    if chosen == act_recognize and hasattr(scene, "recognize_signal_from_chip"):
+        scene.recognize_signal_from_chip(chip)
+    elif chosen == act_edit and hasattr(scene, "edit_signal_from_chip"):
+        scene.edit_signal_from_chip(chip)
+    elif chosen == act_decor and hasattr(scene, "edit_decorations_from_chip"):
+        scene.edit_decorations_from_chip(chip)
+    elif chosen == act_validate and hasattr(scene, "validate_signal_from_chip"):
+        scene.validate_signal_from_chip(chip)
+    elif chosen == act_delete and hasattr(scene, "delete_signal_from_chip"):
+        scene.delete_signal_from_chip(chip)
+
+
+PROFILER.hook(SignalChipItem, "paint")
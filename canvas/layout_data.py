@@ -0,0 +1,153 @@
+from __future__ import annotations
+
+from dataclasses import dataclass, field
+from typing import Dict, List, Tuple
+
+from canvas.items.test_block import should_show_test_block
+from diagnostics.profiler import profiled
+from domain.services.interlock_service import interlock_tags
+
+
+@dataclass
+class ChipData:
+    signal_id: str
+    owner_device_id: str
+    text: str
+    nature: str
+    status: str
+    direction: str
+    tooltip: str
+    test_block: bool = False
+    interlocks: List[str] = field(default_factory=list)
+
+
+@dataclass
+class DeviceLayoutData:
+    device_id: str
+    name: str
+    dev_type: str
+    pos: Tuple[float, float]
+    in_pending: int
+    out_pending: int
+    in_chips: List[ChipData] = field(default_factory=list)
+    out_chips: List[ChipData] = field(default_factory=list)
+
+
+@dataclass
+class BayLayoutData:
+    bay_id: str
+    devices: List[DeviceLayoutData] = field(default_factory=list)
+
+
+@dataclass(frozen=True)
+class BayLayoutSnapshot:
+    """Copia en datos planos (strings/tuplas) de lo que necesita el layout de una bahía.
+
+    Se toma en el hilo GUI; `layout_data_from_snapshot` la procesa en cualquier hilo sin
+    tocar el modelo ni instalar cachés en la bahía.
+    """
+    bay_id: str
+    # (device_id, name, dev_type, entradas, salidas); extremo = (signal_id, text, status, test_block, enclavamientos)
+    devices: Tuple[tuple, ...]
+    natures: Dict[str, str]
+    positions: Dict[str, Tuple[float, float]]
+
+
+def snapshot_bay_layout(project, bay_id: str) -> BayLayoutSnapshot:
+    """Copia la bahía para calcular su layout (llamar en el hilo GUI)."""
+    bay = project.bays[bay_id]
+
+    def ends(lst):
+        return tuple(
+            (e.signal_id, e.text, e.status, bool(getattr(e, "test_block", False)),
+             tuple(interlock_tags(getattr(e, "interlocks", None))))
+            for e in lst
+        )
+
+    devices = tuple(
+        (dev.device_id, dev.name, dev.dev_type, ends(dev.inputs), ends(dev.outputs))
+        for dev in bay.devices.values()
+    )
+    layout = project.canvases.get(bay_id)
+    positions = {}
+    if layout:
+        for dev_id, p in layout.device_positions.items():
+            positions[dev_id] = (float(p.get("x", 0.0)), float(p.get("y", 0.0)))
+    natures = {sid: sig.nature for sid, sig in bay.signals.items()}
+    return BayLayoutSnapshot(bay_id=bay_id, devices=devices, natures=natures, positions=positions)
+
+
+@profiled()
+def compute_bay_layout_data(project, bay_id: str) -> BayLayoutData:
+    """Calcula los datos de layout de la bahía (chips, tooltips, pendientes, B.P., posiciones).
+
+    Para calcularlos fuera del hilo GUI, tomar `snapshot_bay_layout` en el hilo GUI y pasar
+    la copia a `layout_data_from_snapshot` en el hilo de trabajo; quien consuma el resultado
+    debe descartarlo si la bahía fue invalidada mientras tanto.
+    """
+    return layout_data_from_snapshot(snapshot_bay_layout(project, bay_id))
+
+
+@profiled()
+def layout_data_from_snapshot(snap: BayLayoutSnapshot) -> BayLayoutData:
+    """Datos de layout a partir de una copia de la bahía. No usa Qt ni el modelo."""
+    signals = snap.natures
+    out_test_block = {sid for dev in snap.devices for sid, _t, _st, tb, _i in dev[4] if tb}
+
+    data = BayLayoutData(bay_id=snap.bay_id)
+    x, y = 160, 140
+    for dev_id, name, dev_type, inputs, outputs in snap.devices:
+        pos = snap.positions.get(dev_id)
+        if pos is None:
+            pos = (float(x), float(y))
+            x += 560
+            if x > 1700:
+                x = 160
+                y += 340
+
+        item = DeviceLayoutData(
+            device_id=dev_id,
+            name=name,
+            dev_type=dev_type,
+            pos=pos,
+            in_pending=sum(1 for e in inputs if (e[2] or "").upper() == "PENDING"),
+            out_pending=sum(1 for e in outputs if (e[2] or "").upper() == "PENDING"),
+        )
+
+        for sid, text, status, _tb, itags in inputs:
+            nature = signals.get(sid, "DIGITAL")
+            tooltip = (
+                f"Equipo: {name}\nDirección: IN\nSignalID: {sid}\nTexto: {text}\nEstado: {status}"
+                + (f"\nEnclavamientos: {', '.join(itags)}" if itags else "")
+            )
+            item.in_chips.append(ChipData(
+                signal_id=sid,
+                owner_device_id=dev_id,
+                text=text,
+                nature=nature,
+                status=status,
+                direction="IN",
+                tooltip=tooltip,
+                interlocks=list(itags),
+                test_block=sid in out_test_block and should_show_test_block("IN", nature),
+            ))
+
+        for sid, text, status, tb, _itags in outputs:
+            nature = signals.get(sid, "DIGITAL")
+            tooltip = (
+                f"Equipo: {name}\nDirección: OUT\nSignalID: {sid}\nTexto: {text}\nEstado: {status}"
+                + ("\nBlock de pruebas: B.P." if tb else "")
+            )
+            item.out_chips.append(ChipData(
+                signal_id=sid,
+                owner_device_id=dev_id,
+                text=text,
+                nature=nature,
+                status=status,
+                direction="OUT",
+                tooltip=tooltip,
+                test_block=tb and should_show_test_block("OUT", nature),
+            ))
+
+        data.devices.append(item)
+    return data
@@ -0,0 +1,256 @@
+from __future__ import annotations
+
+import math
+from functools import lru_cache
+
+from PyQt5.QtCore import QLineF, QPointF, QRectF, Qt, pyqtSignal
+from PyQt5.QtGui import QBrush, QColor, QFont, QPen
+from PyQt5.QtWidgets import QGraphicsItem, QGraphicsScene, QStyleOptionGraphicsItem
+
+from domain.services.overview_service import compute_project_overview
+from diagnostics.profiler import PROFILER
+
+# Umbrales de nivel de detalle (escala efectiva de la vista)
+LOD_BOXES = 0.15     # por debajo: sólo el recuadro de la bahía
+LOD_TEXT = 0.45      # por debajo: cajas de equipo sin texto
+
+
+@lru_cache(maxsize=None)
+def _font(size: int, bold: bool = False) -> QFont:
+    return QFont("Segoe UI", size, QFont.Bold if bold else QFont.Normal)
+
+
+def _pending_color(pending: int, total: int) -> QColor:
+    if not pending:
+        return QColor(230, 235, 242)
+    ratio = min(1.0, pending / max(1, total))
+    # de amarillo claro a naranja según la proporción de pendientes
+    return QColor(255, int(236 - 80 * ratio), int(190 - 150 * ratio))
+
+
+class BayTileItem(QGraphicsItem):
+    """Bahía en la vista general: un solo item que dibuja el recuadro de la bahía y las
+    cajas agregadas de sus equipos (conteos IN/OUT y pendientes), según el nivel de detalle."""
+
+    W = 460
+    H = 320
+    HEADER_H = 40
+    PAD = 10
+    MAX_BOXES = 96
+
+    def __init__(self, summary):
+        super().__init__()
+        self.summary = None
+        self._boxes: list[tuple[QRectF, object]] = []
+        self._hidden = 0
+        self.setFlag(QGraphicsItem.ItemIsSelectable, True)
+        self.setFlag(QGraphicsItem.ItemUsesExtendedStyleOption, True)
+        self.set_summary(summary)
+
+    @property
+    def bay_id(self) -> str:
+        return self.summary.bay_id
+
+    def set_summary(self, summary) -> None:
+        if summary == self.summary:
+            return
+        self.summary = summary
+        self._layout_boxes()
+        self.setToolTip(
+            f"Bahía: {summary.name}\nEquipos: {len(summary.devices)}\n"
+            f"IN: {summary.n_in}   OUT: {summary.n_out}   Pendientes: {summary.pending}"
+        )
+        self.update()
+
+    def _layout_boxes(self) -> None:
+        devices = self.summary.devices[:self.MAX_BOXES]
+        self._hidden = len(self.summary.devices) - len(devices)
+        self._boxes = []
+        if not devices:
+            return
+        area = QRectF(self.PAD, self.HEADER_H, self.W - 2 * self.PAD, self.H - self.HEADER_H - self.PAD - 12)
+        cols = max(1, math.ceil(math.sqrt(len(devices) * area.width() / area.height())))
+        rows = math.ceil(len(devices) / cols)
+        cw, ch = area.width() / cols, area.height() / rows
+        for i, dev in enumerate(devices):
+            r, c = divmod(i, cols)
+            self._boxes.append((QRectF(area.x() + c * cw + 2, area.y() + r * ch + 2, cw - 4, ch - 4), dev))
+
+    def boundingRect(self) -> QRectF:
+        return QRectF(-1, -1, self.W + 2, self.H + 2)
+
+    def paint(self, painter, option, widget=None):
+        lod = QStyleOptionGraphicsItem.levelOfDetailFromTransform(painter.worldTransform())
+        s = self.summary
+        total = s.n_in + s.n_out
+
+        painter.setPen(QPen(QColor(60, 120, 200), 3) if self.isSelected() else QPen(QColor(150, 160, 175), 1))
+        painter.setBrush(QBrush(_pending_color(s.pending, total) if lod < LOD_BOXES else QColor(250, 252, 255)))
+        painter.drawRoundedRect(QRectF(0, 0, self.W, self.H), 8, 8)
+
+        if lod < LOD_BOXES:
+            return
+
+        painter.setPen(QColor(35, 45, 55))
+        painter.setFont(_font(12, True))
+        painter.drawText(QRectF(self.PAD, 4, self.W - 2 * self.PAD, 20), Qt.AlignLeft | Qt.AlignVCenter, s.name)
+        if lod >= LOD_TEXT:
+            painter.setFont(_font(8))
+            painter.setPen(QColor(90, 100, 110))
+            painter.drawText(
+                QRectF(self.PAD, 22, self.W - 2 * self.PAD, 14), Qt.AlignLeft | Qt.AlignVCenter,
+                f"{len(s.devices)} equipos · IN {s.n_in} · OUT {s.n_out} · pendientes {s.pending}",
+            )
+
+        exposed = option.exposedRect
+        painter.setPen(QPen(QColor(120, 135, 155), 1))
+        for rect, dev in self._boxes:
+            if rect.intersects(exposed):
+                painter.setBrush(_pending_color(dev.pending, dev.n_in + dev.n_out))
+                painter.drawRect(rect)
+
+        if lod >= LOD_TEXT:
+            painter.setFont(_font(7))
+            painter.setPen(QColor(35, 45, 55))
+            for rect, dev in self._boxes:
+                if rect.intersects(exposed) and rect.height() >= 14:
+                    text = f"{dev.name}\nIN {dev.n_in} / OUT {dev.n_out}" if rect.height() >= 26 else dev.name
+                    painter.drawText(rect.adjusted(3, 1, -3, -1), Qt.AlignLeft | Qt.AlignVCenter, text)
+
+        if self._hidden:
+            painter.setPen(QColor(110, 120, 130))
+            painter.setFont(_font(8))
+            painter.drawText(QRectF(self.PAD, self.H - 20, 200, 14), Qt.AlignLeft | Qt.AlignVCenter,
+                             f"+{self._hidden} equipos")
+
+    def mouseDoubleClickEvent(self, event):
+        scene = self.scene()
+        if scene is not None and hasattr(scene, "bayActivated"):
+            scene.bayActivated.emit(self.bay_id)
+            event.accept()
+            return
+        super().mouseDoubleClickEvent(event)
+
+
+class LinkBundlesItem(QGraphicsItem):
+    """Haces de enlaces entre bahías: una línea por par de bahías (ambos sentidos juntos),
+    de grosor según la cantidad de señales. Un solo item para todos los haces; sólo se
+    dibujan los que cruzan la zona expuesta."""
+
+    def __init__(self):
+        super().__init__()
+        # (línea, a, b, a->b, b->a, ancho)
+        self._bundles: list[tuple[QLineF, str, str, int, int, float]] = []
+        self._rect = QRectF()
+        self._highlight: set[str] = set()
+        self.setZValue(-1)   # debajo de las bahías
+        self.setFlag(QGraphicsItem.ItemUsesExtendedStyleOption, True)
+
+    def set_bundles(self, bundles: dict, centers: dict) -> None:
+        pairs: dict[tuple[str, str], list[int]] = {}
+        for (a, b), n in bundles.items():
+            if a not in centers or b not in centers:
+                continue
+            key = (a, b) if a < b else (b, a)
+            counts = pairs.setdefault(key, [0, 0])
+            counts[0 if key == (a, b) else 1] += n
+        self.prepareGeometryChange()
+        self._bundles = []
+        rect = QRectF()
+        for (a, b), (ab, ba) in pairs.items():
+            line = QLineF(centers[a], centers[b])
+            self._bundles.append((line, a, b, ab, ba, 1.0 + 1.5 * math.log2(ab + ba)))
+            rect = rect.united(QRectF(line.p1(), line.p2()).normalized())
+        self._rect = rect.adjusted(-20, -20, 20, 20)
+        self.update()
+
+    def set_highlight(self, bay_ids) -> None:
+        self._highlight = set(bay_ids)
+        self.update()
+
+    def boundingRect(self) -> QRectF:
+        return self._rect
+
+    def paint(self, painter, option, widget=None):
+        lod = QStyleOptionGraphicsItem.levelOfDetailFromTransform(painter.worldTransform())
+        exposed = option.exposedRect
+        base, accent = QColor(120, 140, 170, 150), QColor(40, 110, 210, 220)
+        labels = []
+        for line, a, b, ab, ba, width in self._bundles:
+            if not QRectF(line.p1(), line.p2()).normalized().adjusted(-width, -width, width, width).intersects(exposed):
+                continue
+            hot = a in self._highlight or b in self._highlight
+            pen = QPen(accent if hot else base, width)
+            pen.setCapStyle(Qt.RoundCap)
+            painter.setPen(pen)
+            painter.drawLine(line)
+            if lod >= LOD_BOXES:
+                labels.append((line.center(), ab, ba))
+
+        if labels:
+            painter.setFont(_font(9, True))
+            painter.setPen(QColor(35, 45, 55))
+            for c, ab, ba in labels:
+                text = f"{ab} / {ba}" if ab and ba else str(ab or ba)
+                r = QRectF(c.x() - 40, c.y() - 10, 80, 20)
+                painter.setBrush(QColor(255, 255, 255, 220))
+                painter.drawRoundedRect(r, 6, 6)
+                painter.drawText(r, Qt.AlignCenter, text)
+
+
+class OverviewScene(QGraphicsScene):
+    """Vista general del proyecto: todas las bahías como recuadros en grilla, con cajas de
+    equipos agregadas y haces de enlaces entre bahías (señales con OUT en una e IN en otra).
+
+    `refresh()` recalcula el resumen (los conteos por bahía se reusan si la bahía no cambió)
+    y actualiza los items existentes en su lugar. Doble click en una bahía emite `bayActivated`.
+    """
+
+    bayActivated = pyqtSignal(str)
+
+    GAP = 180
+
+    def __init__(self, project, parent=None):
+        super().__init__(parent)
+        self.project = project
+        self.tiles: dict[str, BayTileItem] = {}
+        self.bundles = LinkBundlesItem()
+        self.addItem(self.bundles)
+        self.selectionChanged.connect(self._on_selection_changed)
+        self.refresh()
+
+    def refresh(self) -> None:
+        data = compute_project_overview(self.project)
+        seen = set()
+        for summary in data.bays:
+            seen.add(summary.bay_id)
+            tile = self.tiles.get(summary.bay_id)
+            if tile is None:
+                tile = BayTileItem(summary)
+                self.addItem(tile)
+                self.tiles[summary.bay_id] = tile
+            else:
+                tile.set_summary(summary)
+        for bay_id in [k for k in self.tiles if k not in seen]:
+            self.removeItem(self.tiles.pop(bay_id))
+
+        # grilla en el orden del proyecto
+        cols = max(1, math.ceil(math.sqrt(len(data.bays))))
+        centers = {}
+        for i, summary in enumerate(data.bays):
+            r, c = divmod(i, cols)
+            tile = self.tiles[summary.bay_id]
+            tile.setPos(QPointF(c * (BayTileItem.W + self.GAP), r * (BayTileItem.H + self.GAP)))
+            centers[summary.bay_id] = tile.pos() + QPointF(BayTileItem.W / 2, BayTileItem.H / 2)
+        self.bundles.set_bundles(data.bundles, centers)
+        self.setSceneRect(self.itemsBoundingRect().adjusted(-200, -200, 200, 200))
+
+    def _on_selection_changed(self):
+        self.bundles.set_highlight(
+            it.bay_id for it in self.selectedItems() if isinstance(it, BayTileItem)
+        )
+
+
+PROFILER.hook(BayTileItem, "paint")
+PROFILER.hook(LinkBundlesItem, "paint")
+PROFILER.hook(OverviewScene, "refresh")
@@ -3,28 +3,50 @@ from PyQt5.QtWidgets import QGraphicsScene, QMessageBox, QFileDialog, QInputDial
 from PyQt5.QtCore import QPointF, QRectF,Qt
 from PyQt5.QtGui import QImage, QPainter
 
+from canvas.items.batched_device_item import BatchedDeviceItem
 from canvas.items.device_item import DeviceItem
+from canvas.items.link_overlay import LinkOverlayItem
 from canvas.items.signal_chip_item import SignalChipItem
-from canvas.items.test_block import should_show_test_block
-from domain.services.pending_service import count_pending_for_device
+from canvas.layout_data import BayLayoutData, compute_bay_layout_data
+from domain.events import (
+    DeviceAdded, DeviceRemoved, EndpointAdded, EndpointChanged, EndpointRemoved, SignalChanged, emit,
+)
+from domain.services.name_index_service import touch_devices
+from diagnostics.profiler import PROFILER
 
 class CanvasScene(QGraphicsScene):
-    def __init__(self, project, bay_id: str, parent=None, *, on_project_mutated=None):
+    """Escena de una bahía. Las acciones modifican el modelo y emiten eventos en
+    `project.events`; la reconstrucción la dispara quien escucha el bus (CanvasController).
+
+    Con `batched_rows=True` los equipos dibujan sus filas de chips en un solo item
+    (`BatchedDeviceItem`); las acciones de chip reciben entonces el `ChipData` de la fila.
+    Con `show_links=True` se dibujan las conexiones entre equipos (`LinkOverlayItem`)."""
+
+    def __init__(self, project, bay_id: str, parent=None, *, batched_rows: bool = False,
+                 show_links: bool = False):
         super().__init__(parent)
         self.project = project
         self.bay_id = bay_id
+        self.batched_rows = batched_rows
+        self.show_links = show_links
+        self.link_overlay: LinkOverlayItem | None = None
         self.device_items = {}
         self._base_scene_rect = QRectF(0, 0, 2200, 1400)
         self._scene_margin = 200
         self._updating_scene_rect = False
         self.setSceneRect(self._base_scene_rect)
         self._clipboard_device_id = None
-        self._on_project_mutated = on_project_mutated
         self.changed.connect(self._on_scene_changed)
+        self.selectionChanged.connect(self._on_selection_changed)
 
     def _on_scene_changed(self, _regions):
         self._update_scene_rect()
 
+    def _on_selection_changed(self):
+        # las conexiones de los equipos seleccionados se resaltan
+        if self.link_overlay is not None:
+            self.link_overlay.update()
+
     def _update_scene_rect(self):
         if self._updating_scene_rect:
             return
@@ -45,91 +67,127 @@ class CanvasScene(QGraphicsScene):
             self._updating_scene_rect = False
 
     # ---------------- Build / Layout ----------------
-    def build_from_model(self):
+    def build_from_model(self, data: BayLayoutData | None = None):
+        """Reconstruye la escena. `data` puede venir precalculado (prefetch en segundo plano);
+        si no, se calcula aquí."""
         # IMPORTANT: antes de reconstruir, persistimos posiciones actuales
         if self.device_items:
             self.persist_layout_to_model()
 
+        if data is None or data.bay_id != self.bay_id:
+            data = compute_bay_layout_data(self.project, self.bay_id)
+
+        # las decoraciones vuelven al pool compartido antes de destruir los equipos
+        for item in self.device_items.values():
+            item.release_decorators()
+        self.link_overlay = None
         self.clear()
         self.device_items.clear()
 
-        bay = self.project.bays[self.bay_id]
-        out_test_block = {}
-        for dev in bay.devices.values():
-            for e in dev.outputs:
-                if bool(getattr(e, "test_block", False)):
-                    out_test_block[e.signal_id] = True
-        layout = self.project.canvases.get(self.bay_id)
+        for d in data.devices:
+            self._add_device_item(d)
+        if self.show_links:
+            self._add_link_overlay()
+        self._update_scene_rect()
 
-        x, y = 160, 140
-        for dev in bay.devices.values():
-            item = DeviceItem(dev.device_id, dev.name, dev.dev_type)
-            pc = count_pending_for_device(dev)
-            item.set_pending_counts(pc['in_pending'], pc['out_pending'])
-
-            if layout and dev.device_id in layout.device_positions:
-                p = layout.device_positions[dev.device_id]
-                item.setPos(QPointF(p.get("x", x), p.get("y", y)))
-            else:
-                item.setPos(QPointF(x, y))
-                x += 560
-                if x > 1700:
-                    x = 160
-                    y += 340
-            in_chips = []
-            for e in dev.inputs:
-                sig = bay.signals.get(e.signal_id)
-                nature = sig.nature if sig else "DIGITAL"
-                itags = e.interlock_tags() if hasattr(e, "interlock_tags") else []
-                tooltip = (
-                    f"Equipo: {dev.name}\nDirección: IN\nSignalID: {e.signal_id}\nTexto: {e.text}\nEstado: {e.status}"
-                    + (f"\nEnclavamientos: {', '.join(itags)}" if itags else "")
-                )
-                in_chips.append(SignalChipItem(
-                    signal_id=e.signal_id,
-                    owner_device_id=dev.device_id,
-                    text=e.text,
-                    nature=nature,
-                    status=e.status,
-                    direction="IN",
-                    tooltip=tooltip,
-                    interlocks=itags,
-                    test_block=bool(out_test_block.get(e.signal_id, False))
-                    and should_show_test_block("IN", nature),
-                ))
-
-            out_chips = []
-            for e in dev.outputs:
-                sig = bay.signals.get(e.signal_id)
-                nature = sig.nature if sig else "DIGITAL"
-                tooltip = (
-                    f"Equipo: {dev.name}\nDirección: OUT\nSignalID: {e.signal_id}\nTexto: {e.text}\nEstado: {e.status}"
-                    + ("\nBlock de pruebas: B.P." if bool(getattr(e, "test_block", False)) else "")
-                )
-                out_chips.append(SignalChipItem(
-                    signal_id=e.signal_id,
-                    owner_device_id=dev.device_id,
-                    text=e.text,
-                    nature=nature,
-                    status=e.status,
-                    direction="OUT",
-                    tooltip=tooltip,
-                    test_block=bool(getattr(e, "test_block", False))
-                    and should_show_test_block("OUT", nature),
-                    interlocks=[],
-                ))
-
-            item.set_signals(in_chips, out_chips)
-            self.addItem(item)
-            self.device_items[dev.device_id] = item
+    def reconcile(self, data: BayLayoutData | None = None):
+        """Aplica el modelo sobre los items existentes en vez de reconstruir la escena.
+
+        Equipos nuevos se crean, los eliminados se quitan y en los demás sólo se actualiza
+        lo que cambió (nombre/tipo, pendientes, chips). Las posiciones actuales se respetan
+        y la vista conserva zoom/scroll; la selección y el scroll interno de cada equipo
+        también, salvo en equipos cuyos chips cambiaron.
+        """
+        if self.device_items:
+            self.persist_layout_to_model()
+        if data is None or data.bay_id != self.bay_id:
+            data = compute_bay_layout_data(self.project, self.bay_id)
+
+        seen = set()
+        for d in data.devices:
+            seen.add(d.device_id)
+            item = self.device_items.get(d.device_id)
+            if item is None:
+                self._add_device_item(d)
+                continue
+            if (item.name, item.dev_type) != (d.name, d.dev_type):
+                item.name, item.dev_type = d.name, d.dev_type
+                item.update()
+            if (item._pending_in, item._pending_out) != (d.in_pending, d.out_pending):
+                item.set_pending_counts(d.in_pending, d.out_pending)
+            old = item.layout_data
+            if old is None or old.in_chips != d.in_chips or old.out_chips != d.out_chips:
+                item.set_signals(*self._chips_for(d))
+            item.layout_data = d
+
+        for dev_id in [k for k in self.device_items if k not in seen]:
+            item = self.device_items.pop(dev_id)
+            item.release_decorators()
+            self.removeItem(item)
+        if self.link_overlay is not None:
+            self.link_overlay.rebuild()
+        self._update_scene_rect()
+
+    def _add_device_item(self, d) -> DeviceItem:
+        cls = BatchedDeviceItem if self.batched_rows else DeviceItem
+        item = cls(d.device_id, d.name, d.dev_type)
+        item.set_pending_counts(d.in_pending, d.out_pending)
+        item.setPos(QPointF(*d.pos))
+        item.set_signals(*self._chips_for(d))
+        item.layout_data = d
+        self.addItem(item)
+        self.device_items[d.device_id] = item
+        return item
+
+    # ---------------- Conexiones ----------------
+    def set_links_visible(self, visible: bool) -> None:
+        self.show_links = bool(visible)
+        if self.show_links and self.link_overlay is None:
+            self._add_link_overlay()
+        elif not self.show_links and self.link_overlay is not None:
+            self.removeItem(self.link_overlay)
+            self.link_overlay = None
         self._update_scene_rect()
 
+    def _add_link_overlay(self) -> None:
+        self.link_overlay = LinkOverlayItem(self)
+        self.addItem(self.link_overlay)
+        self.link_overlay.rebuild()
+
+    def device_moved(self, device_id: str) -> None:
+        """Un equipo cambió de posición o desplazó sus filas (lo llama DeviceItem)."""
+        if self.link_overlay is not None:
+            self.link_overlay.device_moved(device_id)
+
+    def _chips_for(self, d):
+        """Chips IN/OUT para el equipo: items, o los propios ChipData en modo agrupado."""
+        if self.batched_rows:
+            return d.in_chips, d.out_chips
+        return [self._chip_from_data(c) for c in d.in_chips], [self._chip_from_data(c) for c in d.out_chips]
+
+    @staticmethod
+    def _chip_from_data(c) -> SignalChipItem:
+        return SignalChipItem(
+            signal_id=c.signal_id,
+            owner_device_id=c.owner_device_id,
+            text=c.text,
+            nature=c.nature,
+            status=c.status,
+            direction=c.direction,
+            tooltip=c.tooltip,
+            interlocks=c.interlocks,
+            test_block=c.test_block,
+        )
+
     def persist_layout_to_model(self):
         from domain.models import CanvasLayout
         if self.bay_id not in self.project.canvases:
             self.project.canvases[self.bay_id] = CanvasLayout(bay_id=self.bay_id)
         layout = self.project.canvases[self.bay_id]
+        devices = self.project.bays[self.bay_id].devices if self.bay_id in self.project.bays else {}
         for dev_id, item in self.device_items.items():
+            if dev_id not in devices:   # equipo eliminado antes de reconstruir la escena
+                continue
             pos = item.pos()
             layout.device_positions[dev_id] = {"x": float(pos.x()), "y": float(pos.y())}
 
@@ -146,18 +204,20 @@ class CanvasScene(QGraphicsScene):
             self.project.canvases[self.bay_id] = CanvasLayout(bay_id=self.bay_id)
         p = pos or QPointF(200, 200)
         self.project.canvases[self.bay_id].device_positions[device_id] = {"x": float(p.x()), "y": float(p.y())}
-        self.build_from_model()
-        if callable(self._on_project_mutated):
-            self._on_project_mutated({self.bay_id})
+        emit(self.project, DeviceAdded(self.bay_id, device_id))
 
     def delete_device(self, device_id: str):
         bay = self.project.bays[self.bay_id]
         if device_id not in bay.devices:
             return
-        del bay.devices[device_id]
-        if self.bay_id in self.project.canvases:
-            self.project.canvases[self.bay_id].device_positions.pop(device_id, None)
-        self.build_from_model()
+        with self.project.batch([self.bay_id]):
+            dev = bay.devices.pop(device_id)
+            touch_devices(bay, [device_id])
+            if self.bay_id in self.project.canvases:
+                self.project.canvases[self.bay_id].device_positions.pop(device_id, None)
+            for e in dev.inputs + dev.outputs:
+                emit(self.project, EndpointRemoved(self.bay_id, device_id, e.signal_id, e.direction))
+            emit(self.project, DeviceRemoved(self.bay_id, device_id))
 
     # ---------------- Signals creation ----------------
     def on_template_dropped(self, origin_device_id: str, template: dict):
@@ -165,7 +225,7 @@ class CanvasScene(QGraphicsScene):
         self.persist_layout_to_model()
 
         from ui.dialogs.signal_link_dialog import SignalLinkDialog
-        from domain.models import Signal, SignalEnd
+        from domain.models import Signal
 
         bay = self.project.bays[self.bay_id]
         origin = bay.devices[origin_device_id]
@@ -179,7 +239,14 @@ class CanvasScene(QGraphicsScene):
 
         sid = f"SIG-{len(bay.signals) + 1:03d}"
         signal = Signal(signal_id=sid, name=data["signal_name"], nature=data["nature"])
-        bay.signals[sid] = signal
+        with self.project.batch([self.bay_id]):
+            bay.signals[sid] = signal
+            emit(self.project, SignalChanged(self.bay_id, sid))
+            self._link_new_signal(bay, origin, signal, data)
+
+    def _link_new_signal(self, bay, origin, signal, data: dict):
+        from domain.models import SignalEnd
+        sid = signal.signal_id
 
         if data["dest_device_id"] is None:
             dest_name, status = "EXTERNO", "PENDING"
@@ -193,6 +260,7 @@ class CanvasScene(QGraphicsScene):
             text=f"{signal.name} hacia {dest_name}" + (" (pendiente)" if status == "PENDING" else ""),
             status=status
         ))
+        emit(self.project, EndpointAdded(self.bay_id, origin.device_id, sid, "OUT"))
 
         if data["dest_device_id"] is not None:
             dest = bay.devices[data["dest_device_id"]]
@@ -202,21 +270,22 @@ class CanvasScene(QGraphicsScene):
                 text=f"{signal.name} desde {origin.name}",
                 status="CONFIRMED"
             ))
-
-        self.build_from_model()
+            touch_devices(bay, [dest.device_id])
+            emit(self.project, EndpointAdded(self.bay_id, dest.device_id, sid, "IN"))
+        touch_devices(bay, [origin.device_id])
 
     # ---------------- Chip actions ----------------
     def recognize_signal_from_chip(self, chip: SignalChipItem):
         from ui.dialogs.recognize_signal_dialog import RecognizeSignalDialog
         from domain.services.link_service import recognize_pending_link_cross
-        dlg = RecognizeSignalDialog(self.project, origin_bay_id=self.bay_id, origin_device_id=chip.owner_device_id)
+        dlg = RecognizeSignalDialog(self.project, origin_bay_id=self.bay_id, origin_device_id=chip.owner_device_id,
+                                    signal_id=chip.signal_id)
         if dlg.exec_() != dlg.Accepted:
             return
         dest_bay_id, dest_id = dlg.get_selection()
         if dest_id is None or dest_bay_id is None:
             return
         recognize_pending_link_cross(self.project, self.bay_id, chip.owner_device_id, chip.signal_id, dest_bay_id, dest_id)
-        self.build_from_model()
         QMessageBox.information(None, "OK", "Señal reconocida (se creó entrada espejo en el equipo destino).")
 
     def edit_signal_from_chip(self, chip: SignalChipItem):
@@ -224,6 +293,7 @@ class CanvasScene(QGraphicsScene):
         from domain.services.link_service import (
             find_signal_destination_device_id,
             rename_signal_texts,
+            set_signal_nature,
             update_signal_destination,
         )
         bay = self.project.bays[self.bay_id]
@@ -257,33 +327,34 @@ class CanvasScene(QGraphicsScene):
         if dlg.exec_() != dlg.Accepted:
             return
         new_name, new_nature, new_tb, new_dest_id = dlg.get_data()
-        rename_signal_texts(bay, chip.signal_id, new_name)  # actualiza IN y OUT
-        bay.signals[chip.signal_id].nature = new_nature
-
-        # Persistir BP en el extremo OUT (si aplica)
-        if chip.direction == "OUT":
-            dev = bay.devices.get(chip.owner_device_id)
-            if dev:
-                end = next((e for e in dev.outputs if e.signal_id == chip.signal_id), None)
-                if end:
-                    end.test_block = bool(new_tb)
-
-        if new_dest_id != current_dest_id:
-            update_signal_destination(
-                bay,
-                chip.signal_id,
-                new_dest_id,
-                origin_device_id=chip.owner_device_id if chip.direction == "OUT" else None,
-            )
+        with self.project.batch([self.bay_id]):
+            rename_signal_texts(bay, chip.signal_id, new_name, project=self.project)  # actualiza IN y OUT
+            set_signal_nature(bay, chip.signal_id, new_nature, project=self.project)
+
+            # Persistir BP en el extremo OUT (si aplica)
+            if chip.direction == "OUT":
+                dev = bay.devices.get(chip.owner_device_id)
+                if dev:
+                    end = next((e for e in dev.outputs if e.signal_id == chip.signal_id), None)
+                    if end and end.test_block != bool(new_tb):
+                        end.test_block = bool(new_tb)
+                        touch_devices(bay, [dev.device_id])
+                        emit(self.project, EndpointChanged(self.bay_id, dev.device_id, chip.signal_id, "OUT"))
+
+            if new_dest_id != current_dest_id:
+                update_signal_destination(
+                    bay,
+                    chip.signal_id,
+                    new_dest_id,
+                    origin_device_id=chip.owner_device_id if chip.direction == "OUT" else None,
+                    project=self.project,
+                )
 
-        self.build_from_model()
-        if callable(self._on_project_mutated):
-            self._on_project_mutated({self.bay_id})
         QMessageBox.information(None, "OK", "Señal actualizada en ambos extremos.")
 
     def edit_decorations_from_chip(self, chip: SignalChipItem):
         from ui.dialogs.signal_decorations_dialog import SignalDecorationsDialog
-        from domain.models import InterlockItem, InterlockSpec
+        from domain.services.interlock_service import interlock_tags, normalize_interlocks, validate_interlocks
 
         bay = self.project.bays[self.bay_id]
 
@@ -315,8 +386,8 @@ class CanvasScene(QGraphicsScene):
             spec = normalize_interlocks(tags)
             validate_interlocks(spec)
             end.interlocks = spec
-
-        self.build_from_model()
+        touch_devices(bay, [dev.device_id])
+        emit(self.project, EndpointChanged(self.bay_id, dev.device_id, chip.signal_id, chip.direction))
 
     def validate_signal_from_chip(self, chip: SignalChipItem):
         from domain.services.validation_service import validate_signal
@@ -340,9 +411,7 @@ class CanvasScene(QGraphicsScene):
                 return
 
         from domain.services.link_service import remove_link_project
-        bay = self.project.bays[self.bay_id]
         remove_link_project(self.project, chip.signal_id)
-        self.build_from_model()
 
     def delete_signals_bulk(self, chips: list[SignalChipItem], *, confirm: bool = False):
         if not chips:
@@ -357,11 +426,9 @@ class CanvasScene(QGraphicsScene):
             )
             if btn != QMessageBox.Yes:
                 return
-        from domain.services.link_service import remove_link_project
-        bay = self.project.bays[self.bay_id]
-        for sid in signal_ids:
-            remove_link_project(self.project, sid)
-        self.build_from_model()
+        from domain.services.link_service import remove_links_project
+        with self.project.batch():
+            remove_links_project(self.project, signal_ids)
 
     # ---------------- Rename ----------------
     def rename_device(self, device_id: str) -> None:
@@ -392,9 +459,6 @@ class CanvasScene(QGraphicsScene):
         except Exception as e:
             QMessageBox.critical(None, "Equipo", str(e))
             return
-        self.build_from_model()
-        if callable(self._on_project_mutated):
-            self._on_project_mutated({self.bay_id})
 
     # ---------------- Copy/paste/duplicate ----------------
     def copy_device(self, device_id: str):
@@ -431,26 +495,26 @@ class CanvasScene(QGraphicsScene):
             QMessageBox.warning(None, "Duplicar", "Ese ID ya existe.")
             return
         new_dev = Device(device_id=new_id, bay_id=self.bay_id, name=data["name"], dev_type=src.dev_type)
-        bay.devices[new_id] = new_dev
-
-        if data["copy_signals"]:
-            for e in src.inputs:
-                if e.signal_id not in bay.signals:
-                    bay.signals[e.signal_id] = Signal(signal_id=e.signal_id, name=e.signal_id)
-                new_dev.inputs.append(SignalEnd(signal_id=e.signal_id, direction="IN",
-                                               text=self._normalize_pending_text(e.text, "desde"), status="PENDING"))
-            for e in src.outputs:
-                if e.signal_id not in bay.signals:
-                    bay.signals[e.signal_id] = Signal(signal_id=e.signal_id, name=e.signal_id)
-                new_dev.outputs.append(SignalEnd(signal_id=e.signal_id, direction="OUT",
-                                                text=self._normalize_pending_text(e.text, "hacia"), status="PENDING"))
-
-        from domain.models import CanvasLayout
-        if self.bay_id not in self.project.canvases:
-            self.project.canvases[self.bay_id] = CanvasLayout(bay_id=self.bay_id)
-        self.project.canvases[self.bay_id].device_positions[new_id] = {"x": float(scene_pos.x()), "y": float(scene_pos.y())}
-
-        self.build_from_model()
+        with self.project.batch([self.bay_id]):
+            bay.devices[new_id] = new_dev
+            emit(self.project, DeviceAdded(self.bay_id, new_id))
+
+            if data["copy_signals"]:
+                for direction, src_ends, dst_ends, word in (("IN", src.inputs, new_dev.inputs, "desde"),
+                                                            ("OUT", src.outputs, new_dev.outputs, "hacia")):
+                    for e in src_ends:
+                        if e.signal_id not in bay.signals:
+                            bay.signals[e.signal_id] = Signal(signal_id=e.signal_id, name=e.signal_id)
+                            emit(self.project, SignalChanged(self.bay_id, e.signal_id))
+                        dst_ends.append(SignalEnd(signal_id=e.signal_id, direction=direction,
+                                                  text=self._normalize_pending_text(e.text, word), status="PENDING"))
+                        emit(self.project, EndpointAdded(self.bay_id, new_id, e.signal_id, direction))
+                touch_devices(bay, [new_id])
+
+            from domain.models import CanvasLayout
+            if self.bay_id not in self.project.canvases:
+                self.project.canvases[self.bay_id] = CanvasLayout(bay_id=self.bay_id)
+            self.project.canvases[self.bay_id].device_positions[new_id] = {"x": float(scene_pos.x()), "y": float(scene_pos.y())}
 
     def _generate_device_id(self, base_id: str, bay):
         if base_id not in bay.devices:
@@ -482,70 +546,92 @@ class CanvasScene(QGraphicsScene):
             txt += f"\n... ({len(issues) - 250} más)"
         QMessageBox.warning(None, "Validación bahía", txt)
 
-def select_device_item(self, device_id: str):
-    """Selecciona un equipo (nodo) en el canvas y retorna el item para centrar."""
-    item = self.device_items.get(device_id)
-    if not item:
-        return None
-    # limpiar selección previa
-    for it in self.selectedItems():
-        it.setSelected(False)
-    item.setSelected(True)
-    return item
-
-def export_canvas_png(self, path: str, *, include_header: bool = True):
-    """Exporta una imagen PNG del canvas. Si include_header=True agrega cabecera con metadatos."""
-    rect = self.itemsBoundingRect().adjusted(-40, -40, 40, 40)
-    if rect.width() < 10 or rect.height() < 10:
-        rect = QRectF(0, 0, 1200, 800)
-
-    header_h = 70 if include_header else 0
-    img = QImage(int(rect.width()), int(rect.height()) + header_h, QImage.Format_ARGB32)
-    img.fill(0xFFFFFFFF)
-    painter = QPainter(img)
-
-    # Header
-    if include_header:
-        from datetime import datetime
-        painter.save()
-        painter.setPen(0xFF334155)      # slate
-        painter.setBrush(0xFFF1F5F9)    # light header
-        painter.drawRect(0, 0, int(rect.width()), header_h)
-
-        try:
-            project_name = getattr(self.project, "name", "") or "Proyecto"
-        except Exception:
-            project_name = "Proyecto"
+    def select_device_item(self, device_id: str):
+        """Selecciona un equipo (nodo) en el canvas y retorna el item para centrar."""
+        item = self.device_items.get(device_id)
+        if not item:
+            return None
+        # limpiar selección previa
+        for it in self.selectedItems():
+            it.setSelected(False)
+        item.setSelected(True)
+        return item
+
+    def select_chip_item(self, device_id: str, signal_id: str, direction: str | None = None):
+        """Selecciona el chip de una señal (si está en el equipo) y retorna el item para centrar;
+        si no existe, selecciona el equipo."""
+        item = self.device_items.get(device_id)
+        if not item:
+            return None
+        chip = item.find_chip(signal_id, direction) if signal_id else None
+        if chip is None:
+            return self.select_device_item(device_id)
+        for it in self.selectedItems():
+            it.setSelected(False)
+        return item.select_chip(chip)
+
+    def selected_chips(self) -> list:
+        """Chips seleccionados (items, o filas de equipos en modo agrupado)."""
+        return [c for item in self.device_items.values() for c in item.selected_chips()]
+
+    def export_canvas_png(self, path: str, *, include_header: bool = True):
+        """Exporta una imagen PNG del canvas. Si include_header=True agrega cabecera con metadatos."""
+        rect = self.itemsBoundingRect().adjusted(-40, -40, 40, 40)
+        if rect.width() < 10 or rect.height() < 10:
+            rect = QRectF(0, 0, 1200, 800)
+
+        header_h = 70 if include_header else 0
+        img = QImage(int(rect.width()), int(rect.height()) + header_h, QImage.Format_ARGB32)
+        img.fill(0xFFFFFFFF)
+        painter = QPainter(img)
+
+        # Header
+        if include_header:
+            from datetime import datetime
+            painter.save()
+            painter.setPen(0xFF334155)      # slate
+            painter.setBrush(0xFFF1F5F9)    # light header
+            painter.drawRect(0, 0, int(rect.width()), header_h)
+
+            try:
+                project_name = getattr(self.project, "name", "") or "Proyecto"
+            except Exception:
+                project_name = "Proyecto"
+
+            bay = self.project.bays.get(self.bay_id)
+            bay_name = (bay.name if bay else self.bay_id) or self.bay_id
+
+            ver = "?"
+            try:
+                with open("VERSION", "r", encoding="utf-8") as f:
+                    ver = f.read().strip()
+            except Exception:
+                pass
+
+            painter.drawText(QRectF(12, 10, int(rect.width()) - 24, 22),
+                             Qt.AlignLeft | Qt.AlignVCenter,
+                             f"{project_name}  •  {bay_name}")
+            painter.drawText(QRectF(12, 36, int(rect.width()) - 24, 18),
+                             Qt.AlignLeft | Qt.AlignVCenter,
+                             f"Exportado: {datetime.now().strftime('%Y-%m-%d %H:%M')}   •   Signal Mapper v{ver}")
+            painter.restore()
+
+        # Render canvas debajo del header
+        target = QRectF(0, header_h, rect.width(), rect.height())
+        self.render(painter, target=target, source=rect)
+        painter.end()
+        img.save(path)
+
+    def export_canvas_png_dialog(self):
+        path, _ = QFileDialog.getSaveFileName(None, "Exportar canvas a PNG", f"{self.bay_id}.png", "PNG (*.png)")
+        if not path:
+            return
+        if not path.lower().endswith(".png"):
+            path += ".png"
+        self.export_canvas_png(path, include_header=True)
+        QMessageBox.information(None, "Exportación", "Imagen exportada.")
 
-        bay = self.project.bays.get(self.bay_id)
-        bay_name = (bay.name if bay else self.bay_id) or self.bay_id
 
-        ver = "?"
-        try:
-            with open("VERSION", "r", encoding="utf-8") as f:
-                ver = f.read().strip()
-        except Exception:
-            pass
-
-        painter.drawText(QRectF(12, 10, int(rect.width()) - 24, 22),
-                         Qt.AlignLeft | Qt.AlignVCenter,
-                         f"{project_name}  •  {bay_name}")
-        painter.drawText(QRectF(12, 36, int(rect.width()) - 24, 18),
-                         Qt.AlignLeft | Qt.AlignVCenter,
-                         f"Exportado: {datetime.now().strftime('%Y-%m-%d %H:%M')}   •   Signal Mapper v{ver}")
-        painter.restore()
-
-    # Render canvas debajo del header
-    target = QRectF(0, header_h, rect.width(), rect.height())
-    self.render(painter, target=target, source=rect)
-    painter.end()
-    img.save(path)
-
-def export_canvas_png_dialog(self):
-    path, _ = QFileDialog.getSaveFileName(None, "Exportar canvas a PNG", f"{self.bay_id}.png", "PNG (*.png)")
-    if not path:
-        return
-    if not path.lower().endswith(".png"):
-        path += ".png"
-    self.export_canvas_png(path, include_header=True)
-    QMessageBox.information(None, "Exportación", "Imagen exportada.")
+PROFILER.hook(CanvasScene, "build_from_model")
+PROFILER.hook(CanvasScene, "reconcile")
+PROFILER.hook(CanvasScene, "persist_layout_to_model")
@@ -0,0 +1,90 @@
+from __future__ import annotations
+
+from PyQt5.QtCore import QObject, QRunnable, QThreadPool, pyqtSignal
+
+from domain.services.auto_layout_service import compute_auto_layout, layout_graph
+
+
+class _ResultSink(QObject):
+    # bay_id, token, {device_id: (x, y)} | None, only_missing, mensaje de error ("" si no hubo)
+    computed = pyqtSignal(str, object, object, bool, str)
+
+
+class _AutoLayoutTask(QRunnable):
+    def __init__(self, graph, budget_s: float, token, only_missing: bool, sink: _ResultSink, is_cancelled):
+        super().__init__()
+        self._graph = graph
+        self._budget_s = budget_s
+        self._token = token
+        self._only_missing = only_missing
+        self._sink = sink
+        self._is_cancelled = is_cancelled
+
+    def run(self):
+        error = ""
+        try:
+            positions = compute_auto_layout(self._graph, budget_s=self._budget_s,
+                                            is_cancelled=self._is_cancelled)
+        except Exception as e:
+            positions = None
+            error = f"{type(e).__name__}: {e}"
+        self._sink.computed.emit(self._graph.bay_id, self._token, positions, self._only_missing, error)
+
+
+class AutoLayouter(QObject):
+    """Ubica equipos automáticamente (capas OUT -> IN con mínimo de cruces) en un hilo de trabajo.
+
+    El grafo de la bahía se arma en el hilo GUI (sólo ids y conteos) y el ordenamiento corre en
+    el pool con presupuesto de tiempo. El resultado llega por `layoutReady`; si el proyecto
+    cambió mientras tanto (`reset`) se descarta y el cálculo en curso se corta. Si el cálculo
+    falla se emite `layoutFailed`.
+    """
+
+    layoutReady = pyqtSignal(str, dict, bool)    # bay_id, {device_id: (x, y)}, only_missing
+    layoutFailed = pyqtSignal(str, str)          # bay_id, mensaje
+
+    AUTO_BUDGET_S = 0.5      # equipos sin posición, al abrir la bahía
+    MANUAL_BUDGET_S = 2.0    # "Ordenar equipos automáticamente"
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self._pool = QThreadPool(self)
+        self._pool.setMaxThreadCount(1)
+        self._sink = _ResultSink(self)
+        self._sink.computed.connect(self._on_computed)
+        self._epoch = 0
+        self._in_flight: set[tuple[str, bool]] = set()
+
+    def request(self, project, bay_id: str, *, only_missing: bool) -> bool:
+        """Encola el layout de la bahía. Retorna False si no hay nada que ubicar o ya está en curso."""
+        key = (bay_id, only_missing)
+        if key in self._in_flight or bay_id not in project.bays:
+            return False
+        graph = layout_graph(project, bay_id, only_missing=only_missing)
+        if len(graph.fixed) == len(graph.device_ids):
+            return False
+        self._in_flight.add(key)
+        budget = self.AUTO_BUDGET_S if only_missing else self.MANUAL_BUDGET_S
+        token = self._epoch
+        self._pool.start(_AutoLayoutTask(graph, budget, token, only_missing, self._sink,
+                                         is_cancelled=lambda: self._epoch != token))
+        return True
+
+    def reset(self):
+        """El proyecto cambió: los resultados en vuelo se descartan."""
+        self._epoch += 1
+        self._in_flight.clear()
+
+    def shutdown(self):
+        self.reset()
+        self._pool.clear()
+        self._pool.waitForDone()
+
+    def _on_computed(self, bay_id: str, token, positions, only_missing: bool, error: str):
+        if token != self._epoch:
+            return
+        self._in_flight.discard((bay_id, only_missing))
+        if error:
+            self.layoutFailed.emit(bay_id, error)
+        elif positions:
+            self.layoutReady.emit(bay_id, positions, only_missing)
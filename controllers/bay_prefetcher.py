@@ -0,0 +1,146 @@
+from __future__ import annotations
+
+from PyQt5.QtCore import QObject, QRunnable, QThreadPool, QTimer, pyqtSignal
+
+from canvas.layout_data import BayLayoutData, layout_data_from_snapshot, snapshot_bay_layout
+
+
+class _ResultSink(QObject):
+    computed = pyqtSignal(str, object, object)     # bay_id, token, BayLayoutData | None
+
+
+class _LayoutTask(QRunnable):
+    """Procesa una copia de la bahía tomada en el hilo GUI; no lee el modelo."""
+
+    def __init__(self, snapshot, token, sink: _ResultSink):
+        super().__init__()
+        self._snapshot = snapshot
+        self._token = token
+        self._sink = sink
+
+    def run(self):
+        try:
+            data = layout_data_from_snapshot(self._snapshot)
+        except Exception:
+            data = None
+        self._sink.computed.emit(self._snapshot.bay_id, self._token, data)
+
+
+class BayPrefetcher(QObject):
+    """Precalcula en segundo plano los datos de layout de las bahías que probablemente se
+    abran a continuación (vecinas en el navegador y visitadas recientemente).
+
+    Se dispara cuando el usuario queda inactivo `IDLE_MS` tras abrir/editar una bahía. Los
+    resultados quedan listos para `take()`; cualquier mutación de la bahía (`invalidate`)
+    descarta tanto los resultados guardados como los que estén en vuelo.
+    """
+
+    IDLE_MS = 700
+    NEIGHBOURS = 1
+    MAX_RECENT = 6
+
+    def __init__(self, *, get_project, is_built, parent=None):
+        super().__init__(parent)
+        self._get_project = get_project
+        self._is_built = is_built
+
+        self._pool = QThreadPool(self)
+        self._pool.setMaxThreadCount(1)
+        self._sink = _ResultSink(self)
+        self._sink.computed.connect(self._on_computed)
+
+        self._timer = QTimer(self)
+        self._timer.setSingleShot(True)
+        self._timer.setInterval(self.IDLE_MS)
+        self._timer.timeout.connect(self._prefetch)
+
+        self._epoch = 0
+        self._generation: dict[str, int] = {}
+        self._ready: dict[str, BayLayoutData] = {}
+        self._in_flight: set[str] = set()
+        self._recent: list[str] = []
+        self._current: str | None = None
+
+    # ---------------- API ----------------
+    def note_opened(self, bay_id: str):
+        self._current = bay_id
+        if bay_id in self._recent:
+            self._recent.remove(bay_id)
+        self._recent.insert(0, bay_id)
+        del self._recent[self.MAX_RECENT:]
+        self._timer.start()
+
+    def take(self, bay_id: str) -> BayLayoutData | None:
+        return self._ready.pop(bay_id, None)
+
+    def invalidate(self, bay_ids=None):
+        """Descarta datos de esas bahías (todas si bay_ids es None o vacío)."""
+        if not bay_ids:
+            self._epoch += 1
+            self._ready.clear()
+            self._in_flight.clear()
+        else:
+            for bay_id in bay_ids:
+                self._generation[bay_id] = self._generation.get(bay_id, 0) + 1
+                self._ready.pop(bay_id, None)
+                self._in_flight.discard(bay_id)
+        if self._current:
+            self._timer.start()
+
+    def reset(self):
+        """El proyecto cambió: olvida historial y resultados."""
+        self._timer.stop()
+        self.invalidate()
+        self._recent.clear()
+        self._current = None
+
+    def shutdown(self):
+        self._timer.stop()
+        self._epoch += 1
+        self._pool.clear()
+        self._pool.waitForDone()
+
+    # ---------------- Internos ----------------
+    def candidates(self) -> list[str]:
+        project = self._get_project()
+        if not project or not self._current:
+            return []
+        order = list(project.bays.keys())
+        out: list[str] = []
+        if self._current in order:
+            i = order.index(self._current)
+            for d in range(1, self.NEIGHBOURS + 1):
+                for j in (i + d, i - d):
+                    if 0 <= j < len(order):
+                        out.append(order[j])
+        out.extend(self._recent)
+        seen: set[str] = set()
+        result = []
+        for bay_id in out:
+            if bay_id in seen or bay_id == self._current or bay_id not in project.bays:
+                continue
+            seen.add(bay_id)
+            if bay_id in self._ready or bay_id in self._in_flight or self._is_built(bay_id):
+                continue
+            result.append(bay_id)
+        return result
+
+    def _token(self, bay_id: str):
+        return (self._epoch, self._generation.get(bay_id, 0))
+
+    def _prefetch(self):
+        project = self._get_project()
+        if not project:
+            return
+        for bay_id in self.candidates():
+            # la copia se toma aquí (hilo GUI); el hilo de trabajo sólo arma los datos
+            snapshot = snapshot_bay_layout(project, bay_id)
+            self._in_flight.add(bay_id)
+            self._pool.start(_LayoutTask(snapshot, self._token(bay_id), self._sink))
+
+    def _on_computed(self, bay_id: str, token, data):
+        if token != self._token(bay_id):
+            return      # bahía mutada (o proyecto cambiado) mientras se calculaba
+        self._in_flight.discard(bay_id)
+        if data is not None and not self._is_built(bay_id):
+            self._ready[bay_id] = data
@@ -1,25 +1,68 @@
 from __future__ import annotations
 
+from collections import OrderedDict
+
 from PyQt5.QtCore import QPointF
 from PyQt5.QtWidgets import QMessageBox
 
+from canvas.overview_scene import OverviewScene
 from canvas.scene import CanvasScene
-from ui.widgets.canvas_view import CanvasView
+from controllers.auto_layouter import AutoLayouter
+from controllers.bay_prefetcher import BayPrefetcher
+from domain.events import CONTENT_EVENTS, BayRenamed, affected_bays, has_event
+from domain.services.auto_layout_service import missing_positions
+from ui.widgets.canvas_view import DEFAULT_PROFILE, CanvasView
+from ui.widgets.overview_view import OverviewView
 
 
 class CanvasController:
-    """Gestiona la escena/vista por bahía y operaciones de selección/centrado."""
+    """Gestiona la escena/vista por bahía y operaciones de selección/centrado.
+
+    Las escenas ya construidas se guardan en un caché LRU por bahía (con presupuesto en
+    cantidad de items gráficos), así volver a una bahía no reconstruye la escena. Las
+    mutaciones del modelo llegan por el bus de eventos del proyecto (`on_model_events`) e
+    invalidan sólo las bahías afectadas.
+    """
 
-    def __init__(self, *, get_project, template_dock, canvas_host, canvas_title_label, on_project_mutated=None):
+    MAX_CACHED_BAYS = 8
+    MAX_CACHED_ITEMS = 30000
+
+    def __init__(self, *, get_project, template_dock, canvas_host, canvas_title_label, on_bay_activated=None,
+                 on_view_changed=None):
         self._get_project = get_project
+        self._on_bay_activated = on_bay_activated
+        # se llama con la vista mostrada (o None) cada vez que cambia (p. ej. para el minimapa)
+        self._on_view_changed = on_view_changed
         self._template_dock = template_dock
         self._canvas_host = canvas_host
         self._canvas_title = canvas_title_label
-        self._on_project_mutated = on_project_mutated
 
         self.bay_id: str | None = None
         self.scene: CanvasScene | None = None
         self.view: CanvasView | None = None
+        # dibujo agrupado de filas de chips (un item por equipo; para bahías densas)
+        self.batched_rows = False
+        # capa de conexiones entre equipos (se aplica a todas las escenas, también a las cacheadas)
+        self.show_links = False
+        # perfil de dibujo de las vistas de bahía (ver ui.widgets.canvas_view.PROFILES) y lectura de FPS
+        self.render_profile = DEFAULT_PROFILE
+        self.show_fps = False
+        # vista general de todas las bahías (se crea al abrirla; se conserva mientras no cambie el proyecto)
+        self._overview: tuple[OverviewScene, OverviewView] | None = None
+        self.overview_active = False
+
+        # bay_id -> (scene, view, n_items); incluye la bahía abierta (la más reciente al final)
+        self._cache: OrderedDict[str, tuple[CanvasScene, CanvasView, int]] = OrderedDict()
+        self._cache_project = None
+        self._prefetcher = BayPrefetcher(
+            get_project=get_project,
+            is_built=lambda bay_id: bay_id in self._cache,
+            parent=canvas_host,
+        )
+        # equipos sin posición: se ubican en segundo plano y se mueven al llegar el resultado
+        self._layouter = AutoLayouter(parent=canvas_host)
+        self._layouter.layoutReady.connect(self._apply_auto_layout)
+        self._layouter.layoutFailed.connect(self._on_auto_layout_failed)
 
     def persist_layout(self):
         if self.scene:
@@ -29,25 +72,250 @@ class CanvasController:
         project = self._get_project()
         if not project:
             return
+        if project is not self._cache_project:
+            self.clear_cache()
+            self._cache_project = project
 
         self.persist_layout()
 
-        lay = self._canvas_host.layout()
-        while lay.count() > 0:
-            w = lay.takeAt(0).widget()
-            if w:
-                w.setParent(None)
+        entry = self._cache.get(bay_id)
+        if entry is not None and entry[0] is self.scene:
+            # misma bahía abierta y vigente: sólo refrescar título
+            self._canvas_title.setText(f"Canvas — {project.bays[bay_id].name}")
+            return
 
+        self._detach_view()
+        self.overview_active = False
         self.bay_id = bay_id
-        self.scene = CanvasScene(project, bay_id, on_project_mutated=self._on_project_mutated)
-        self.scene.build_from_model()
-        self.view = CanvasView(self.scene)
+        if entry is None:
+            if missing_positions(project, bay_id):
+                self._layouter.request(project, bay_id, only_missing=True)
+            scene = CanvasScene(project, bay_id, batched_rows=self.batched_rows, show_links=self.show_links)
+            scene.build_from_model(self._prefetcher.take(bay_id))
+            view = CanvasView(scene, profile=self.render_profile, show_fps=self.show_fps)
+            entry = (scene, view, len(scene.items()))
+            self._cache[bay_id] = entry
+        self._cache.move_to_end(bay_id)
+        self.scene, self.view, _n = entry
+        self._evict()
 
         if hasattr(self._template_dock, "set_scene"):
             self._template_dock.set_scene(self.scene)
 
         self._canvas_title.setText(f"Canvas — {project.bays[bay_id].name}")
-        lay.addWidget(self.view, 1)
+        self._canvas_host.layout().addWidget(self.view, 1)
+        self.view.show()
+        self._prefetcher.note_opened(bay_id)
+        self._notify_view(self.view)
+
+    def open_overview(self):
+        """Muestra la vista general (todas las bahías) en lugar del canvas de la bahía abierta.
+        La escena de la bahía queda en el caché; volver a abrirla no la reconstruye."""
+        project = self._get_project()
+        if not project:
+            return
+        if project is not self._cache_project:
+            self.clear_cache()
+            self._cache_project = project
+        self.persist_layout()
+        self._detach_view()
+        self.bay_id = None
+        self.scene = None
+        self.view = None
+        if hasattr(self._template_dock, "set_scene"):
+            self._template_dock.set_scene(None)
+
+        if self._overview is None or self._overview[0].project is not project:
+            self._drop_overview()
+            scene = OverviewScene(project)
+            if self._on_bay_activated is not None:
+                scene.bayActivated.connect(self._on_bay_activated)
+            view = OverviewView(scene)
+            self._overview = (scene, view)
+            fit = True
+        else:
+            self._overview[0].refresh()
+            fit = False
+        self.overview_active = True
+        scene, view = self._overview
+        self._canvas_title.setText(f"Vista general — {len(project.bays)} bahías")
+        self._canvas_host.layout().addWidget(view, 1)
+        view.show()
+        if fit:
+            view.fit_all()
+        self._notify_view(view)
+
+    def _notify_view(self, view):
+        if self._on_view_changed is not None:
+            self._on_view_changed(view)
+
+    def _drop_overview(self):
+        if self._overview is not None:
+            self._overview[1].deleteLater()
+            self._overview = None
+        self.overview_active = False
+
+    def auto_layout_current(self) -> bool:
+        """Reubica todos los equipos de la bahía abierta (en segundo plano)."""
+        project = self._get_project()
+        if not project or not self.bay_id:
+            return False
+        self.persist_layout()
+        return self._layouter.request(project, self.bay_id, only_missing=False)
+
+    def _on_auto_layout_failed(self, bay_id: str, error: str):
+        project = self._get_project()
+        bay = project.bays.get(bay_id) if project else None
+        name = bay.name if bay else bay_id
+        QMessageBox.warning(self._canvas_host, "Ordenar equipos",
+                            f"No se pudo ubicar automáticamente los equipos de '{name}'.\n\n{error}")
+
+    def _apply_auto_layout(self, bay_id: str, positions: dict, only_missing: bool):
+        """Escribe las posiciones en `CanvasLayout.device_positions` y mueve los items de la
+        escena de esa bahía si está construida. En modo "sólo faltantes" no se tocan los
+        equipos que el usuario ya movió mientras se calculaba."""
+        from domain.models import CanvasLayout
+        project = self._get_project()
+        if not project or bay_id not in project.bays:
+            return
+        bay = project.bays[bay_id]
+        layout = project.canvases.get(bay_id)
+        if layout is None:
+            layout = project.canvases[bay_id] = CanvasLayout(bay_id=bay_id)
+        entry = self._cache.get(bay_id)
+        items = entry[0].device_items if entry else {}
+        for dev_id, (x, y) in positions.items():
+            if dev_id not in bay.devices:
+                continue
+            item = items.get(dev_id)
+            data = item.layout_data if item is not None else None
+            if only_missing and data is not None and (item.pos().x(), item.pos().y()) != tuple(data.pos):
+                continue
+            layout.device_positions[dev_id] = {"x": float(x), "y": float(y)}
+            if item is not None:
+                item.setPos(QPointF(x, y))
+                if data is not None:
+                    data.pos = (float(x), float(y))
+        self._prefetcher.invalidate({bay_id})
+
+    def set_batched_rows(self, enabled: bool):
+        """Cambia el modo de dibujo de las filas; las escenas cacheadas se descartan y la
+        bahía abierta se vuelve a abrir con el modo nuevo."""
+        if bool(enabled) == self.batched_rows:
+            return
+        self.batched_rows = bool(enabled)
+        bay_id = self.bay_id
+        if bay_id is None:      # sin bahía abierta (página de inicio): nada que reconstruir
+            return
+        self.persist_layout()
+        self.clear_cache()
+        project = self._get_project()
+        if project and bay_id in project.bays:
+            self.open_bay(bay_id)
+
+    def set_show_links(self, enabled: bool):
+        """Muestra u oculta las conexiones entre equipos; las escenas cacheadas se ajustan en
+        su lugar (sin reconstruir)."""
+        self.show_links = bool(enabled)
+        for scene, _view, _n in self._cache.values():
+            scene.set_links_visible(self.show_links)
+
+    def set_render_profile(self, key: str):
+        self.render_profile = key
+        for _scene, view, _n in self._cache.values():
+            view.set_render_profile(key)
+
+    def set_show_fps(self, enabled: bool):
+        self.show_fps = bool(enabled)
+        for _scene, view, _n in self._cache.values():
+            view.set_show_fps(self.show_fps)
+
+    def on_model_events(self, events):
+        """Reconstruye la escena abierta si fue afectada y descarta las cacheadas afectadas.
+        Renombrar una bahía sólo cambia el título."""
+        project = self._get_project()
+        bays = affected_bays(events, CONTENT_EVENTS)
+        if bays:
+            self.invalidate(bays)
+        if self.overview_active and self._overview is not None and affected_bays(events):
+            self._overview[0].refresh()
+            if project:
+                self._canvas_title.setText(f"Vista general — {len(project.bays)} bahías")
+            return
+        if project and self.bay_id in project.bays and has_event(events, BayRenamed):
+            self._canvas_title.setText(f"Canvas — {project.bays[self.bay_id].name}")
+
+    def invalidate(self, bay_ids=None) -> bool:
+        """Descarta las escenas de esas bahías (todas si bay_ids es None o vacío).
+
+        La escena abierta no se descarta: se reconcilia en su lugar (`CanvasScene.reconcile`:
+        sólo cambia los items afectados y la vista conserva zoom/scroll).
+        Retorna True si la bahía abierta estaba entre las afectadas.
+        """
+        project = self._get_project()
+        if project is None or project is not self._cache_project:
+            self.clear_cache()
+            return False
+        self._prefetcher.invalidate(bay_ids)
+        targets = set(bay_ids or ()) or set(self._cache)
+        if self.bay_id and not bay_ids:
+            targets.add(self.bay_id)
+        current_hit = False
+        for bay_id in targets:
+            if bay_id == self.bay_id and self.scene is not None:
+                current_hit = True
+                continue
+            self._drop(bay_id)
+        if current_hit and project and self.bay_id in project.bays:
+            self.scene.reconcile()
+            self._cache[self.bay_id] = (self.scene, self.view, len(self.scene.items()))
+            self._evict()
+        return current_hit
+
+    def clear_cache(self):
+        self._prefetcher.reset()
+        self._layouter.reset()
+        self._detach_view()
+        self._drop_overview()
+        for bay_id in list(self._cache):
+            self._drop(bay_id)
+        self.bay_id = None
+        self.scene = None
+        self.view = None
+        self._notify_view(None)
+
+    def shutdown(self):
+        self._prefetcher.shutdown()
+        self._layouter.shutdown()
+
+    def _detach_view(self):
+        lay = self._canvas_host.layout()
+        while lay.count() > 0:
+            w = lay.takeAt(0).widget()
+            if w:
+                w.setParent(None)
+
+    def _drop(self, bay_id: str):
+        entry = self._cache.pop(bay_id, None)
+        if entry is None:
+            return
+        _scene, view, _n = entry
+        if view is not self.view:
+            view.deleteLater()
+
+    def _evict(self):
+        total = sum(n for _s, _v, n in self._cache.values())
+        for bay_id in list(self._cache):
+            if len(self._cache) <= 1:
+                break
+            if len(self._cache) <= self.MAX_CACHED_BAYS and total <= self.MAX_CACHED_ITEMS:
+                break
+            if bay_id == self.bay_id:
+                continue
+            total -= self._cache[bay_id][2]
+            # el layout de una bahía cacheada se persistió al dejarla; aun así, no perder posiciones
+            self._cache[bay_id][0].persist_layout_to_model()
+            self._drop(bay_id)
 
     def select_device(self, device_id: str):
         if not self.scene or not self.view:
@@ -59,6 +327,14 @@ class CanvasController:
         if item:
             self.view.centerOn(item)
 
+    def select_chip(self, device_id: str, signal_id: str, direction: str | None = None):
+        """Selecciona el chip (equipo + señal + dirección); cae al equipo si el chip no existe."""
+        if not self.scene or not self.view:
+            return
+        item = self.scene.select_chip_item(device_id, signal_id, direction or None)
+        if item:
+            self.view.centerOn(item)
+
     def suggest_position_for_new_device(self) -> QPointF | None:
         if not self.scene:
             return None
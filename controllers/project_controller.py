@@ -4,12 +4,13 @@ import os
 
 from PyQt5.QtWidgets import QFileDialog, QMessageBox, QInputDialog
 
-from domain.models import Project, Bay, CanvasLayout, SignalTemplate
+from domain.models import Project, Bay, CanvasLayout
 from persistence.project_io import load_project, save_project
 from persistence.template_store import load_global_templates
 from export.excel_exporter import export_project_to_excel
 from domain.services.replication_service import replicate_bay
 from domain.services.rename_service import rename_device_in_project, rename_bay
+from domain.events import BayAdded, TemplatesChanged, emit
 
 from ui.dialogs.new_project_dialog import NewProjectDialog
 from ui.dialogs.add_bay_dialog import AddBayDialog
@@ -109,6 +110,7 @@ class ProjectController:
         bay_id = self._generate_bay_id()
         self.project.bays[bay_id] = Bay(bay_id=bay_id, name=name)
         self.project.canvases[bay_id] = CanvasLayout(bay_id=bay_id)
+        emit(self.project, BayAdded(bay_id))
         return bay_id
 
     # ---------------- Equipos ----------------
@@ -242,6 +244,7 @@ class ProjectController:
         if not self.project:
             return
         self.project.templates = load_global_templates(self._app_dir)
+        emit(self.project, TemplatesChanged(None))
         QMessageBox.information(self._w, "Plantillas", "Biblioteca global importada al proyecto.")
 
     # ---------------- Export ----------------
@@ -0,0 +1,184 @@
+from __future__ import annotations
+
+from PyQt5.QtCore import QObject, QThread, pyqtSignal
+
+from domain.events import (
+    CONTENT_EVENTS, BayAdded, BayRenamed, DeviceAdded, DeviceRemoved, DeviceRenamed, EndpointEvent,
+    SignalChanged, affected_bays, has_event,
+)
+from domain.services.validation_service import ProjectValidator, snapshot_project, validate_project
+
+
+class ProjectValidationJob(QThread):
+    """Valida el proyecto completo fuera del hilo GUI (una bahía tras otra).
+
+    Recibe las copias de las bahías tomadas en el hilo GUI; no lee el modelo vivo.
+    """
+    bayValidated = pyqtSignal(str, list)      # bay_id, list[ValidationIssue]
+
+    def __init__(self, snaps, parent=None):
+        super().__init__(parent)
+        self._snaps = snaps
+
+    def run(self):
+        validate_project(
+            self._snaps,
+            on_bay_issues=lambda bay_id, issues: self.bayValidated.emit(bay_id, issues),
+            is_cancelled=self.isInterruptionRequested,
+        )
+
+
+class ValidationController(QObject):
+    """Lanza/cancela la validación de proyecto y alimenta el ValidationDock.
+
+    En modo 'en vivo' mantiene un ProjectValidator incremental: cada lote de eventos del modelo
+    re-valida sólo los equipos/señales tocados (bahías completas sólo si son nuevas o fueron
+    reemplazadas), recalcula las observaciones de esas bahías (y de las que comparten las señales
+    tocadas, incluidos los chequeos entre bahías) y el dock se refresca en el mismo ciclo de eventos.
+    Las observaciones son las mismas que las de la validación completa.
+    """
+
+    def __init__(self, *, get_project, dock, parent=None):
+        super().__init__(parent)
+        self._get_project = get_project
+        self._dock = dock
+        self._job: ProjectValidationJob | None = None
+        self._live: ProjectValidator | None = None
+        self._live_issues: dict[str, list] = {}     # bay_id -> observaciones en vivo
+
+        dock.validateRequested.connect(self.start)
+        dock.cancelRequested.connect(self.cancel)
+        dock.liveToggled.connect(self.set_live)
+
+    # ---------------- En vivo ----------------
+    def set_live(self, enabled: bool):
+        if not enabled:
+            self._live = None
+            self._live_issues = {}
+            return
+        self.cancel(wait=True)
+        self._live = None
+        self._refresh_live()
+
+    def reset(self):
+        """El proyecto cambió (abrir/nuevo): descarta estado y job en curso."""
+        self.cancel(wait=True)
+        self._live = None
+        self._live_issues = {}
+        self._dock.set_project(self._get_project())
+        if self._dock.is_live():
+            self._refresh_live()
+
+    def on_model_events(self, events):
+        if not self._dock.is_live() or self.is_running():
+            return
+        if not affected_bays(events, CONTENT_EVENTS + (BayAdded, BayRenamed)):
+            return
+        if has_event(events, (BayAdded, BayRenamed)):
+            self._dock.refresh_bays()
+        project = self._get_project()
+        if self._live is None or self._live.project is not project:
+            self._refresh_live()
+            return
+
+        rebuild: set[str] = set()
+        renamed: set[str] = set()
+        devices: dict[str, set[str]] = {}
+        signals: dict[str, set[str]] = {}
+        for ev in events:
+            if ev.bay_id is None:
+                continue
+            if isinstance(ev, BayAdded):
+                rebuild.add(ev.bay_id)
+            elif isinstance(ev, BayRenamed):
+                renamed.add(ev.bay_id)
+            elif isinstance(ev, EndpointEvent):
+                devices.setdefault(ev.bay_id, set()).add(ev.device_id)
+                signals.setdefault(ev.bay_id, set()).add(ev.signal_id)
+            elif isinstance(ev, (DeviceAdded, DeviceRemoved, DeviceRenamed)):
+                devices.setdefault(ev.bay_id, set()).add(ev.device_id)
+            elif isinstance(ev, SignalChanged):
+                signals.setdefault(ev.bay_id, set()).add(ev.signal_id)
+
+        touched = self._live.invalidate_bays(rebuild) if rebuild else set()
+        for bay_id in (set(devices) | set(signals)) - rebuild:
+            touched |= self._live.invalidate(
+                bay_id, device_ids=devices.get(bay_id, ()), signal_ids=signals.get(bay_id, ()),
+            )
+        for bay_id in renamed:
+            # los chequeos entre bahías citan el nombre de la bahía
+            touched |= self._live.signals_of(bay_id)
+        stale = rebuild | set(devices) | set(signals) | self._live.bays_with_signals(touched)
+        for bay_id in stale:
+            self._live_issues.pop(bay_id, None)
+        self._push_live()
+
+    def _refresh_live(self):
+        project = self._get_project()
+        self._live_issues = {}
+        if not project:
+            self._live = None
+            self._dock.set_live_issues([])
+            return
+        if self._live is None or self._live.project is not project:
+            self._live = ProjectValidator(project)
+        self._push_live()
+
+    def _push_live(self):
+        """Publica las observaciones en orden de bahías; sólo calcula las que no están cacheadas."""
+        out: list = []
+        cache: dict[str, list] = {}
+        for bay_id in self._live.project.bays:
+            issues = self._live_issues.get(bay_id)
+            if issues is None:
+                issues = self._live.bay_issues(bay_id)
+            cache[bay_id] = issues
+            out.extend(issues)
+        self._live_issues = cache
+        self._dock.set_live_issues(out)
+
+    def is_running(self) -> bool:
+        return self._job is not None and self._job.isRunning()
+
+    def start(self):
+        project = self._get_project()
+        if not project:
+            return
+        self.cancel(wait=True)
+
+        job = ProjectValidationJob(snapshot_project(project), self)
+        # slots como métodos de este QObject (vive en el hilo GUI) => conexión encolada
+        job.bayValidated.connect(self._on_bay_validated)
+        job.finished.connect(self._on_finished)
+        self._job = job
+        self._dock.set_project(project)
+        self._dock.begin(len(project.bays))
+        job.start()
+
+    def cancel(self, wait: bool = False):
+        job = self._job
+        if job is None:
+            return
+        job.requestInterruption()
+        if wait:
+            job.wait()
+
+    def _on_bay_validated(self, bay_id: str, issues: list):
+        # resultados encolados de un job anterior (reemplazado) se descartan
+        if self.sender() is self._job:
+            self._dock.append_issues(bay_id, issues)
+
+    def _on_finished(self):
+        job = self.sender()
+        if job is None:
+            return
+        if job is not self._job:
+            job.deleteLater()
+            return
+        self._dock.finish(cancelled=job.isInterruptionRequested())
+        self._job = None
+        job.deleteLater()
+        if self._dock.is_live():
+            # el proyecto pudo cambiar durante la validación completa
+            self._live = None
+            self._live_issues = {}
@@ -0,0 +1,177 @@
+from __future__ import annotations
+
+import functools
+import json
+import os
+import threading
+import time
+from collections import deque
+from contextlib import contextmanager
+from typing import Callable, Dict, List, Optional, Tuple
+
+
+class Profiler:
+    """Mediciones de tiempo de la aplicación (rearmado del canvas, paint por tipo de item,
+    refrescos de docks y llamadas a servicios).
+
+    Dos formas de instrumentar:
+    - `hook(Clase, "metodo")`: el método se envuelve sólo mientras el perfilador está
+      activo; desactivado se restaura el original (costo cero en caminos calientes como
+      `paint`).
+    - `profiled(...)` / `span(...)`: para funciones y bloques de grano grueso; desactivado
+      cuesta una consulta de bandera.
+
+    Guarda estadísticas acumuladas por nombre (con los objetos tocados que informan los
+    servicios, ver `diagnostics.tracing.traced`) y los últimos `max_events` eventos, que se
+    exportan en formato Chrome trace (chrome://tracing, Perfetto).
+    """
+
+    def __init__(self, max_events: int = 200_000):
+        self._enabled = False
+        self._lock = threading.Lock()
+        self._events: deque = deque(maxlen=max_events)
+        # nombre -> [categoría, llamadas, total ns, máximo ns, tocados]
+        self._stats: Dict[str, list] = {}
+        self._hooks: List[Tuple[type, str, str, str]] = []
+        self._originals: Dict[Tuple[type, str], Callable] = {}
+        self._t0 = time.perf_counter_ns()
+
+    # ---------------- Estado ----------------
+    @property
+    def enabled(self) -> bool:
+        return self._enabled
+
+    def enable(self) -> None:
+        if self._enabled:
+            return
+        self._enabled = True
+        for owner, attr, name, cat in self._hooks:
+            self._patch(owner, attr, name, cat)
+
+    def disable(self) -> None:
+        if not self._enabled:
+            return
+        self._enabled = False
+        for (owner, attr), original in self._originals.items():
+            setattr(owner, attr, original)
+        self._originals.clear()
+
+    def set_enabled(self, enabled: bool) -> None:
+        self.enable() if enabled else self.disable()
+
+    def reset(self) -> None:
+        with self._lock:
+            self._events.clear()
+            self._stats.clear()
+
+    # ---------------- Instrumentación ----------------
+    def hook(self, owner: type, attr: str, name: Optional[str] = None, cat: str = "canvas") -> None:
+        """Registra un método a medir (definido en `owner`, no heredado)."""
+        name = name or f"{owner.__name__}.{attr}"
+        self._hooks.append((owner, attr, name, cat))
+        if self._enabled:
+            self._patch(owner, attr, name, cat)
+
+    def _patch(self, owner: type, attr: str, name: str, cat: str) -> None:
+        key = (owner, attr)
+        if key in self._originals:
+            return
+        original = owner.__dict__[attr]
+        record = self.record
+
+        @functools.wraps(original)
+        def wrapper(*args, **kwargs):
+            t0 = time.perf_counter_ns()
+            try:
+                return original(*args, **kwargs)
+            finally:
+                record(name, cat, t0, time.perf_counter_ns())
+
+        self._originals[key] = original
+        setattr(owner, attr, wrapper)
+
+    def profiled(self, name: Optional[str] = None, cat: str = "service"):
+        """Decorador para funciones de grano grueso (servicios, cálculos de layout)."""
+        def deco(fn):
+            label = name or fn.__qualname__
+
+            @functools.wraps(fn)
+            def wrapper(*args, **kwargs):
+                if not self._enabled:
+                    return fn(*args, **kwargs)
+                t0 = time.perf_counter_ns()
+                try:
+                    return fn(*args, **kwargs)
+                finally:
+                    self.record(label, cat, t0, time.perf_counter_ns())
+            return wrapper
+        return deco
+
+    @contextmanager
+    def span(self, name: str, cat: str = "app"):
+        if not self._enabled:
+            yield
+            return
+        t0 = time.perf_counter_ns()
+        try:
+            yield
+        finally:
+            self.record(name, cat, t0, time.perf_counter_ns())
+
+    def record(self, name: str, cat: str, t0: int, t1: int, *, touched: int = 0) -> None:
+        dur = t1 - t0
+        tid = threading.get_ident()
+        with self._lock:
+            self._events.append((name, cat, t0, dur, tid, touched))
+            st = self._stats.get(name)
+            if st is None:
+                self._stats[name] = [cat, 1, dur, dur, touched]
+            else:
+                st[1] += 1
+                st[2] += dur
+                if dur > st[3]:
+                    st[3] = dur
+                st[4] += touched
+
+    # ---------------- Resultados ----------------
+    def stats(self) -> List[dict]:
+        """Estadísticas por nombre (tiempos en ms), de mayor a menor tiempo total."""
+        with self._lock:
+            items = [(name, list(st)) for name, st in self._stats.items()]
+        out = [
+            {"name": name, "cat": cat, "calls": n, "total_ms": total / 1e6,
+             "mean_ms": total / n / 1e6, "max_ms": mx / 1e6, "touched": touched}
+            for name, (cat, n, total, mx, touched) in items
+        ]
+        out.sort(key=lambda s: s["total_ms"], reverse=True)
+        return out
+
+    def chrome_trace(self) -> dict:
+        with self._lock:
+            events = list(self._events)
+        pid = os.getpid()
+        names = {t.ident: t.name for t in threading.enumerate()}
+        trace = [
+            {"name": "thread_name", "ph": "M", "pid": pid, "tid": tid, "args": {"name": names.get(tid, str(tid))}}
+            for tid in {e[4] for e in events}
+        ]
+        for name, cat, t0, dur, tid, touched in events:
+            ev = {"name": name, "cat": cat, "ph": "X", "pid": pid, "tid": tid,
+                  "ts": (t0 - self._t0) / 1000.0, "dur": dur / 1000.0}
+            if touched:
+                ev["args"] = {"touched": touched}
+            trace.append(ev)
+        return {"traceEvents": trace, "displayTimeUnit": "ms",
+                "otherData": {"stats": self.stats()}}
+
+    def dump_chrome_trace(self, path: str) -> int:
+        """Escribe la traza en `path`; retorna la cantidad de eventos."""
+        data = self.chrome_trace()
+        with open(path, "w", encoding="utf-8") as f:
+            json.dump(data, f)
+        return sum(1 for e in data["traceEvents"] if e["ph"] == "X")
+
+
+PROFILER = Profiler()
+profiled = PROFILER.profiled
+span = PROFILER.span
@@ -0,0 +1,39 @@
+from __future__ import annotations
+
+import functools
+import time
+from typing import Callable, Optional
+
+from diagnostics.profiler import PROFILER
+
+# Trazas de servicios del dominio: se miden con el perfilador (categoría "service") mientras
+# está activo (Ver → Perfilador → Mostrar mediciones) y se exportan con su traza Chrome.
+# Desactivado, cada llamada cuesta una consulta de bandera.
+
+
+def traced(name: Optional[str] = None, *, touched: Optional[Callable[..., int]] = None):
+    """Decorador: mide la función con `PROFILER`.
+
+    `touched(resultado, *args, **kwargs)` retorna la cantidad de objetos que tocó la llamada
+    (equipos marcados, extremos recorridos o guardados); se acumula en las estadísticas.
+    """
+    def deco(fn):
+        label = name or f"{fn.__module__.rsplit('.', 1)[-1]}.{fn.__qualname__}"
+
+        @functools.wraps(fn)
+        def wrapper(*args, **kwargs):
+            if not PROFILER.enabled:
+                return fn(*args, **kwargs)
+            t0 = time.perf_counter_ns()
+            result = fn(*args, **kwargs)
+            t1 = time.perf_counter_ns()
+            n = 0
+            if touched is not None:
+                try:
+                    n = int(touched(result, *args, **kwargs) or 0)
+                except Exception:
+                    pass    # un contador roto no debe afectar al servicio
+            PROFILER.record(label, "service", t0, t1, touched=n)
+            return result
+        return wrapper
+    return deco
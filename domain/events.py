@@ -0,0 +1,186 @@
+from __future__ import annotations
+
+import weakref
+from contextlib import contextmanager
+from dataclasses import dataclass
+from typing import Callable, Iterable, List, Optional, Set
+
+
+# ---------------- Eventos ----------------
+@dataclass(frozen=True)
+class ChangeEvent:
+    """Base de los eventos de cambio del modelo. `bay_id` es None si el cambio no es de una bahía."""
+    bay_id: Optional[str]
+
+
+@dataclass(frozen=True)
+class BayAdded(ChangeEvent):
+    pass
+
+
+@dataclass(frozen=True)
+class BayRenamed(ChangeEvent):
+    pass
+
+
+@dataclass(frozen=True)
+class DeviceAdded(ChangeEvent):
+    device_id: str
+
+
+@dataclass(frozen=True)
+class DeviceRemoved(ChangeEvent):
+    device_id: str
+
+
+@dataclass(frozen=True)
+class DeviceRenamed(ChangeEvent):
+    device_id: str
+
+
+@dataclass(frozen=True)
+class SignalChanged(ChangeEvent):
+    """Definición de la señal (nombre/naturaleza) creada, modificada o eliminada en la bahía."""
+    signal_id: str
+
+
+@dataclass(frozen=True)
+class EndpointEvent(ChangeEvent):
+    device_id: str
+    signal_id: str
+    direction: str
+
+
+@dataclass(frozen=True)
+class EndpointAdded(EndpointEvent):
+    pass
+
+
+@dataclass(frozen=True)
+class EndpointRemoved(EndpointEvent):
+    pass
+
+
+@dataclass(frozen=True)
+class EndpointStatusChanged(EndpointEvent):
+    status: str
+
+
+@dataclass(frozen=True)
+class EndpointChanged(EndpointEvent):
+    """Texto o decoraciones (block de pruebas, enclavamientos) del extremo."""
+    pass
+
+
+@dataclass(frozen=True)
+class TemplatesChanged(ChangeEvent):
+    pass
+
+
+STRUCTURE_EVENTS = (BayAdded, BayRenamed, DeviceAdded, DeviceRemoved, DeviceRenamed)
+CONTENT_EVENTS = (DeviceAdded, DeviceRemoved, DeviceRenamed, SignalChanged, EndpointEvent)
+
+
+def affected_bays(events: Iterable[ChangeEvent], kinds=None) -> Set[str]:
+    """bay_id de los eventos (opcionalmente sólo de los tipos `kinds`)."""
+    return {e.bay_id for e in events if e.bay_id is not None and (kinds is None or isinstance(e, kinds))}
+
+
+def has_event(events: Iterable[ChangeEvent], kinds) -> bool:
+    return any(isinstance(e, kinds) for e in events)
+
+
+# ---------------- Bus ----------------
+class ChangeBus:
+    """Bus de eventos de cambio del proyecto.
+
+    - `emit()` fuera de una transacción entrega el evento de inmediato (como lote de uno).
+    - Dentro de `with bus.transaction():` los eventos se acumulan y se entregan juntos, sin
+      duplicados y en orden, al cerrar la transacción más externa.
+    - Los suscriptores reciben `list[ChangeEvent]` y se llaman por prioridad ascendente
+      (cachés derivados antes que vistas). Los métodos ligados se guardan como referencia
+      débil: suscribirse no mantiene vivo al widget.
+    """
+
+    def __init__(self) -> None:
+        self._subs: list = []        # (priority, seq, ref)
+        self._seq = 0
+        self._depth = 0
+        self._pending: List[ChangeEvent] = []
+
+    def subscribe(self, callback: Callable[[List[ChangeEvent]], None], *, priority: int = 0) -> None:
+        self.unsubscribe(callback)
+        ref = weakref.WeakMethod(callback) if hasattr(callback, "__self__") else (lambda cb=callback: cb)
+        self._seq += 1
+        self._subs.append((priority, self._seq, ref))
+        self._subs.sort(key=lambda s: (s[0], s[1]))
+
+    def unsubscribe(self, callback) -> None:
+        self._subs = [s for s in self._subs if s[2]() not in (None, callback)]
+
+    def emit(self, event: ChangeEvent) -> None:
+        self._pending.append(event)
+        if self._depth == 0:
+            self._flush()
+
+    def emit_many(self, events: Iterable[ChangeEvent]) -> None:
+        with self.transaction():
+            for e in events:
+                self.emit(e)
+
+    @contextmanager
+    def transaction(self):
+        self._depth += 1
+        try:
+            yield self
+        finally:
+            self._depth -= 1
+            if self._depth == 0:
+                self._flush()
+
+    def in_transaction(self) -> bool:
+        return self._depth > 0
+
+    def pending_count(self) -> int:
+        return len(self._pending)
+
+    def discard_pending(self, since: int = 0) -> None:
+        """Descarta eventos acumulados desde la posición `since` (ver `pending_count`),
+        p.ej. tras revertir un lote."""
+        del self._pending[since:]
+
+    def _flush(self) -> None:
+        if not self._pending:
+            return
+        batch = list(dict.fromkeys(self._pending))
+        self._pending.clear()
+        error = None
+        for _prio, _seq, ref in list(self._subs):
+            cb = ref()
+            if cb is None:
+                continue
+            try:
+                cb(batch)
+            except Exception as e:      # un suscriptor no debe impedir que el resto se entere
+                error = error or e
+        self._subs = [s for s in self._subs if s[2]() is not None]
+        if error is not None:
+            raise error
+
+
+def emit(project, event: ChangeEvent) -> None:
+    """Emite en el bus del proyecto (no hace nada si `project` es None, p.ej. servicios
+    de bahía llamados sin proyecto)."""
+    bus = getattr(project, "events", None) if project is not None else None
+    if bus is not None:
+        bus.emit(event)
+
+
+@contextmanager
+def transaction(project):
+    bus = getattr(project, "events", None) if project is not None else None
+    if bus is None:
+        yield None
+        return
+    with bus.transaction():
+        yield bus
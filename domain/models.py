@@ -1,23 +1,40 @@
 from __future__ import annotations
 
+import sys
 from dataclasses import dataclass, field
 from typing import Dict, List, Literal, Optional
 
+from domain.events import ChangeBus
+
 Nature = Literal["DIGITAL", "ANALOG"]
 Direction = Literal["IN", "OUT"]
 LinkStatus = Literal["CONFIRMED", "PENDING"]
 InterlockMode = Literal["AND", "OR"]
 
+# Clases con muchas instancias (señales, extremos, enclavamientos, equipos) usan __slots__
+# (sin __dict__ por instancia) y se internan los campos tipo enumerado y los ids: todas las
+# instancias comparten un único objeto str para "CONFIRMED", "IN", "DIGITAL", "Bloqueos", etc.
+# Los textos libres (p.ej. SignalEnd.text) no: cambian por bahía y se reasignan al editar.
+_SLOTS = {"slots": True} if sys.version_info >= (3, 10) else {}
 
-@dataclass
+
+def _intern(value):
+    return sys.intern(value) if type(value) is str else value
+
+
+@dataclass(**_SLOTS)
 class Signal:
     signal_id: str
     name: str
     nature: Nature = "DIGITAL"
     description: str = ""
 
+    def __post_init__(self):
+        self.signal_id = _intern(self.signal_id)
+        self.nature = _intern(self.nature)
 
-@dataclass
+
+@dataclass(**_SLOTS)
 class InterlockItem:
     """Un enclavamiento (bloqueo) aplicado a una entrada.
 
@@ -30,6 +47,9 @@ class InterlockItem:
     source_device_id: Optional[str] = None
     source_signal_id: Optional[str] = None
 
+    def __post_init__(self):
+        self.relay_tag = _intern(self.relay_tag)
+        self.category = _intern(self.category)
 
 @dataclass
 class InterlockSpec:
@@ -37,7 +57,7 @@ class InterlockSpec:
     items: List[InterlockItem] = field(default_factory=list)
 
 
-@dataclass
+@dataclass(**_SLOTS)
 class SignalEnd:
     signal_id: str
     direction: Direction
@@ -46,8 +66,16 @@ class SignalEnd:
     test_block: bool = False  # sólo aplica normalmente a OUT
     interlocks: Optional[InterlockSpec] = None  # sólo aplica normalmente a IN
 
+    def __post_init__(self):
+        self.signal_id = _intern(self.signal_id)
+        self.direction = _intern(self.direction)
+        self.status = _intern(self.status)
+        # enclavamientos vacíos se representan siempre con None (sin InterlockSpec por extremo)
+        if self.interlocks is not None and not self.interlocks.items:
+            self.interlocks = None
 
-@dataclass
+
+@dataclass(**_SLOTS)
 class Device:
     device_id: str
     bay_id: str
@@ -56,6 +84,10 @@ class Device:
     inputs: List[SignalEnd] = field(default_factory=list)
     outputs: List[SignalEnd] = field(default_factory=list)
 
+    def __post_init__(self):
+        self.bay_id = _intern(self.bay_id)
+        self.dev_type = _intern(self.dev_type)
+
 
 @dataclass
 class Bay:
@@ -90,3 +122,10 @@ class Project:
     bays: Dict[str, Bay] = field(default_factory=dict)
     canvases: Dict[str, CanvasLayout] = field(default_factory=dict)
     templates: List[SignalTemplate] = field(default_factory=list)
+    # eventos de cambio del modelo (ver domain/events.py); no se persiste
+    events: ChangeBus = field(default_factory=ChangeBus, compare=False, repr=False)
+
+    def batch(self, bay_ids=None):
+        """Lote transaccional de mutaciones (ver domain/services/batch_service.py)."""
+        from domain.services.batch_service import project_batch
+        return project_batch(self, bay_ids)
@@ -0,0 +1,326 @@
+from __future__ import annotations
+
+import time
+from dataclasses import dataclass, field
+from typing import Callable, Dict, List, Optional, Tuple
+
+from diagnostics.profiler import profiled
+
+# Grilla de ubicación (px de escena). Una columna alberga un equipo (340) con chips a ambos
+# lados (2 x 380) más margen; una fila, un equipo de alto máximo (320) más margen.
+COL_W = 1200.0
+ROW_H = 360.0
+ORIGIN = (160.0, 140.0)
+
+# tope de barridos de ordenamiento aunque sobre presupuesto
+MAX_SWEEPS = 60
+# barridos seguidos sin mejorar antes de cortar
+PATIENCE = 6
+
+
+@dataclass
+class LayoutGraph:
+    """Relaciones entre equipos de una bahía, sin referencias al modelo (se puede
+    entregar a un hilo de trabajo)."""
+    bay_id: str
+    device_ids: List[str] = field(default_factory=list)
+    # (equipo con el OUT, equipo con el IN) -> cantidad de señales compartidas
+    edges: Dict[Tuple[str, str], int] = field(default_factory=dict)
+    # posiciones que se conservan (modo "sólo faltantes")
+    fixed: Dict[str, Tuple[float, float]] = field(default_factory=dict)
+
+
+def layout_graph(project, bay_id: str, *, only_missing: bool = False) -> LayoutGraph:
+    """Arma el grafo de la bahía: una arista OUT -> IN por cada signal_id que comparten dos
+    equipos. Con `only_missing`, los equipos que ya tienen posición quedan fijos."""
+    bay = project.bays[bay_id]
+    graph = LayoutGraph(bay_id=bay_id, device_ids=list(bay.devices))
+    out_by_sig: Dict[str, List[str]] = {}
+    in_by_sig: Dict[str, List[str]] = {}
+    for dev in bay.devices.values():
+        for e in dev.outputs:
+            out_by_sig.setdefault(e.signal_id, []).append(dev.device_id)
+        for e in dev.inputs:
+            in_by_sig.setdefault(e.signal_id, []).append(dev.device_id)
+    for sid, srcs in out_by_sig.items():
+        for dst in in_by_sig.get(sid, ()):
+            for src in srcs:
+                if src != dst:
+                    graph.edges[(src, dst)] = graph.edges.get((src, dst), 0) + 1
+    if only_missing:
+        layout = project.canvases.get(bay_id)
+        positions = layout.device_positions if layout else {}
+        for dev_id in graph.device_ids:
+            p = positions.get(dev_id)
+            if p is not None:
+                graph.fixed[dev_id] = (float(p.get("x", 0.0)), float(p.get("y", 0.0)))
+    return graph
+
+
+def missing_positions(project, bay_id: str) -> List[str]:
+    """Equipos de la bahía sin posición guardada."""
+    bay = project.bays.get(bay_id)
+    if bay is None:
+        return []
+    layout = project.canvases.get(bay_id)
+    positions = layout.device_positions if layout else {}
+    return [dev_id for dev_id in bay.devices if dev_id not in positions]
+
+
+# ---------------- Motor ----------------
+@profiled()
+def compute_auto_layout(graph: LayoutGraph, *, budget_s: float = 0.5,
+                        is_cancelled: Optional[Callable[[], bool]] = None) -> Dict[str, Tuple[float, float]]:
+    """Posiciones (x, y) para los equipos no fijos, en capas de izquierda a derecha según
+    el sentido OUT -> IN y ordenadas dentro de cada capa para minimizar cruces.
+
+    Capas por camino más largo (los ciclos se rompen invirtiendo aristas de retroceso), nodos
+    ficticios en las aristas largas y barridos de baricentro + transposiciones hasta agotar
+    `budget_s` o dejar de mejorar; se conserva el orden con menos cruces. Los equipos sin
+    relaciones van en columnas aparte, a la derecha. Si hay equipos fijos, los nuevos se
+    ubican a la derecha de ellos.
+    """
+    deadline = time.perf_counter() + max(0.0, budget_s)
+    nodes = [d for d in graph.device_ids if d not in graph.fixed]
+    node_set = set(nodes)
+    edges = {(a, b): w for (a, b), w in graph.edges.items() if a in node_set and b in node_set}
+    linked = {n for e in edges for n in e}
+    connected = [n for n in nodes if n in linked]
+    isolated = [n for n in nodes if n not in linked]
+
+    columns: List[List[str]] = []
+    if connected:
+        layers = _assign_layers(connected, edges)
+        columns = [[n for n in col if isinstance(n, str)] for col in
+                   _order_layers(layers, edges, deadline, is_cancelled)]
+    if isolated:
+        per_col = max([len(c) for c in columns] + [int(len(isolated) ** 0.5) or 1])
+        for i in range(0, len(isolated), per_col):
+            columns.append(isolated[i:i + per_col])
+
+    x0, y0 = ORIGIN
+    if graph.fixed:
+        x0 = max(x for x, _y in graph.fixed.values()) + COL_W
+        y0 = min(y for _x, y in graph.fixed.values())
+    tallest = max((len(c) for c in columns), default=0)
+    out: Dict[str, Tuple[float, float]] = {}
+    for ci, col in enumerate(columns):
+        top = y0 + (tallest - len(col)) * ROW_H / 2     # columnas centradas verticalmente
+        for ri, dev_id in enumerate(col):
+            out[dev_id] = (x0 + ci * COL_W, top + ri * ROW_H)
+    return out
+
+
+def _assign_layers(nodes: List[str], edges: Dict[Tuple[str, str], int]) -> Dict[str, int]:
+    succ: Dict[str, List[str]] = {n: [] for n in nodes}
+    for a, b in edges:
+        succ[a].append(b)
+
+    # DFS iterativo: las aristas hacia un nodo en la pila actual cierran un ciclo -> se ignoran
+    state: Dict[str, int] = {}     # 1 = en pila, 2 = terminado
+    dag: Dict[str, List[str]] = {n: [] for n in nodes}
+    for root in nodes:
+        if root in state:
+            continue
+        stack = [(root, iter(succ[root]))]
+        state[root] = 1
+        while stack:
+            node, it = stack[-1]
+            nxt = next(it, None)
+            if nxt is None:
+                state[node] = 2
+                stack.pop()
+                continue
+            st = state.get(nxt)
+            if st == 1:
+                continue        # arista de retroceso
+            dag[node].append(nxt)
+            if st is None:
+                state[nxt] = 1
+                stack.append((nxt, iter(succ[nxt])))
+
+    # camino más largo desde las fuentes (orden topológico de Kahn)
+    indeg = {n: 0 for n in nodes}
+    for a in nodes:
+        for b in dag[a]:
+            indeg[b] += 1
+    layer = {n: 0 for n in nodes}
+    ready = [n for n in nodes if indeg[n] == 0]
+    while ready:
+        a = ready.pop()
+        for b in dag[a]:
+            layer[b] = max(layer[b], layer[a] + 1)
+            indeg[b] -= 1
+            if indeg[b] == 0:
+                ready.append(b)
+    return layer
+
+
+def _order_layers(layer: Dict[str, int], edges: Dict[Tuple[str, str], int], deadline: float,
+                  is_cancelled: Optional[Callable[[], bool]]) -> List[list]:
+    """Orden dentro de cada capa. Los nodos ficticios (tuplas) cortan las aristas largas
+    para que cada arista una capas contiguas."""
+    n_layers = max(layer.values()) + 1
+    up: Dict[object, Dict[object, int]] = {}
+    down: Dict[object, Dict[object, int]] = {}
+    layers: List[list] = [[] for _ in range(n_layers)]
+    for n in layer:
+        layers[layer[n]].append(n)
+
+    def stopped() -> bool:
+        return time.perf_counter() >= deadline or (is_cancelled is not None and is_cancelled())
+
+    def link(a, b, w):
+        d = down.get(a)
+        if d is None:
+            d = down[a] = {}
+        d[b] = d.get(b, 0) + w
+        u = up.get(b)
+        if u is None:
+            u = up[b] = {}
+        u[a] = u.get(a, 0) + w
+
+    for (a, b), w in edges.items():
+        if stopped():
+            return layers       # sin tiempo ni para las aristas largas: capas sin ordenar
+        key = (a, b)
+        la, lb = layer[a], layer[b]
+        if la > lb:             # arista invertida al romper un ciclo
+            a, b, la, lb = b, a, lb, la
+        if la == lb:
+            continue
+        prev = a
+        for k in range(la + 1, lb):
+            dummy = key + (k,)     # según la arista original: A->B y B->A no comparten ficticios
+            layers[k].append(dummy)
+            link(prev, dummy, w)
+            prev = dummy
+        link(prev, b, w)
+
+    pos: Dict[object, int] = {}
+
+    def index(col):
+        for i, n in enumerate(col):
+            pos[n] = i
+
+    for col in layers:
+        index(col)
+
+    # Cada paso revisa el presupuesto (y la cancelación) capa por capa y retorna False/None si
+    # se cortó a mitad; en ese caso se descarta el estado a medias y queda el mejor orden.
+    def crossings() -> Optional[int]:
+        total = 0
+        for li in range(n_layers - 1):
+            if stopped():
+                return None
+            pairs = sorted((pos[a], pos[b], w) for a in layers[li] for b, w in down.get(a, {}).items())
+            total += _weighted_inversions(pairs, len(layers[li + 1]))
+        return total
+
+    def barycenter_sweep(rng, nbrs) -> bool:
+        for li in rng:
+            if stopped():
+                return False
+            col = layers[li]
+            keyed = []
+            for n in col:
+                nb = nbrs.get(n)
+                if nb:
+                    tw = sum(nb.values())
+                    keyed.append((sum(pos[m] * w for m, w in nb.items()) / tw, pos[n], n))
+                else:
+                    keyed.append((float(pos[n]), pos[n], n))
+            keyed.sort(key=lambda t: (t[0], t[1]))
+            layers[li] = [n for _b, _p, n in keyed]
+            index(layers[li])
+        return True
+
+    def pair_cost(u, v) -> int:
+        """Cruces entre las aristas de u y v si u queda arriba de v."""
+        c = 0
+        for nbrs in (up, down):
+            nu, nv = nbrs.get(u, {}), nbrs.get(v, {})
+            for a, wa in nu.items():
+                for b, wb in nv.items():
+                    if pos[a] > pos[b]:
+                        c += wa * wb
+        return c
+
+    def transpose() -> bool:
+        improved = True
+        while improved:
+            improved = False
+            for col in layers:
+                if stopped():
+                    return False
+                for i in range(len(col) - 1):
+                    u, v = col[i], col[i + 1]
+                    if pair_cost(v, u) < pair_cost(u, v):
+                        col[i], col[i + 1] = v, u
+                        pos[u], pos[v] = i + 1, i
+                        improved = True
+        return True
+
+    best = [list(c) for c in layers]
+    best_c = crossings()
+    stale = 0
+    for _sweep in range(MAX_SWEEPS):
+        if best_c is None or best_c == 0 or stale >= PATIENCE:
+            break
+        if not (barycenter_sweep(range(1, n_layers), up)
+                and barycenter_sweep(range(n_layers - 2, -1, -1), down)
+                and transpose()):
+            break
+        c = crossings()
+        if c is None:
+            break
+        if c < best_c:
+            best, best_c, stale = [list(col) for col in layers], c, 0
+        else:
+            stale += 1
+    return best
+
+
+def _weighted_inversions(pairs, n_lower: int) -> int:
+    """Cruces ponderados entre capas contiguas: `pairs` = (pos arriba, pos abajo, peso)
+    ordenados; dos aristas se cruzan si su orden abajo es inverso. Árbol de Fenwick."""
+    tree = [0] * (n_lower + 1)
+    total_w = 0
+    crossings = 0
+    for _pa, pb, w in pairs:
+        # peso acumulado de aristas previas con pos abajo <= pb
+        i, le = pb + 1, 0
+        while i > 0:
+            le += tree[i]
+            i -= i & -i
+        crossings += w * (total_w - le)
+        i = pb + 1
+        while i <= n_lower:
+            tree[i] += w
+            i += i & -i
+        total_w += w
+    return crossings
+
+
+def layout_crossings(graph: LayoutGraph, positions: Dict[str, Tuple[float, float]]) -> int:
+    """Cruces entre aristas OUT -> IN para posiciones dadas (segmentos rectos entre
+    equipos); para comparar resultados."""
+    segs = [(positions[a], positions[b], w) for (a, b), w in graph.edges.items()
+            if a in positions and b in positions]
+    total = 0
+    for i in range(len(segs)):
+        p1, p2, w1 = segs[i]
+        for j in range(i + 1, len(segs)):
+            q1, q2, w2 = segs[j]
+            if _segments_cross(p1, p2, q1, q2):
+                total += w1 * w2
+    return total
+
+
+def _segments_cross(p1, p2, q1, q2) -> bool:
+    def orient(a, b, c):
+        v = (b[0] - a[0]) * (c[1] - a[1]) - (b[1] - a[1]) * (c[0] - a[0])
+        return (v > 0) - (v < 0)
+    if p1 in (q1, q2) or p2 in (q1, q2):
+        return False
+    return (orient(p1, p2, q1) * orient(p1, p2, q2) < 0) and (orient(q1, q2, p1) * orient(q1, q2, p2) < 0)
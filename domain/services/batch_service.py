@@ -0,0 +1,137 @@
+from __future__ import annotations
+
+from contextlib import contextmanager
+from typing import Iterable, Optional
+
+from domain.services.name_index_service import defer_touches, end_deferred_touches, touch_devices
+
+
+class _BaySnapshot:
+    """Copia superficial del estado editable de una bahía: diccionarios y listas se copian,
+    los extremos no (sólo sus campos mutables), así el costo es proporcional a los
+    punteros y no a una copia profunda del modelo."""
+
+    __slots__ = ("bay", "name", "devices", "signals", "signal_state", "device_state", "end_state", "positions")
+
+    def __init__(self, project, bay):
+        self.bay = bay
+        self.name = bay.name
+        self.devices = dict(bay.devices)
+        self.signals = dict(bay.signals)
+        self.signal_state = [(sig, sig.name, sig.nature) for sig in bay.signals.values()]
+        self.device_state = {
+            dev_id: (dev.name, list(dev.inputs), list(dev.outputs)) for dev_id, dev in bay.devices.items()
+        }
+        self.end_state = [
+            (e, e.text, e.status, e.test_block, e.interlocks)
+            for dev in bay.devices.values() for e in dev.inputs + dev.outputs
+        ]
+        layout = project.canvases.get(bay.bay_id)
+        self.positions = dict(layout.device_positions) if layout is not None else None
+
+    def restore(self, project) -> None:
+        bay = self.bay
+        bay.name = self.name
+        bay.devices.clear()
+        bay.devices.update(self.devices)
+        bay.signals.clear()
+        bay.signals.update(self.signals)
+        for sig, name, nature in self.signal_state:
+            sig.name, sig.nature = name, nature
+        for dev_id, (name, inputs, outputs) in self.device_state.items():
+            dev = self.devices[dev_id]
+            dev.name = name
+            dev.inputs[:] = inputs
+            dev.outputs[:] = outputs
+        for e, text, status, test_block, interlocks in self.end_state:
+            e.text, e.status, e.test_block, e.interlocks = text, status, test_block, interlocks
+        layout = project.canvases.get(bay.bay_id)
+        if layout is not None and self.positions is not None:
+            layout.device_positions.clear()
+            layout.device_positions.update(self.positions)
+        # índices y cachés derivados quedan inválidos
+        bay._name_index = None
+        bay._endpoint_segment = None
+        touch_devices(bay, list(bay.devices))
+
+
+class _BatchState:
+    """Copias de las bahías tomadas durante un lote (cada bahía la primera vez que se modifica)."""
+
+    __slots__ = ("project", "snapshots")
+
+    def __init__(self, project):
+        self.project = project
+        self.snapshots = {}
+
+    def record(self, bay) -> None:
+        if bay.bay_id not in self.snapshots:
+            self.snapshots[bay.bay_id] = _BaySnapshot(self.project, bay)
+
+
+def record_bay(bay) -> None:
+    """Los servicios la llaman antes de modificar una bahía: dentro de un lote guarda su
+    estado (una vez por bahía) para poder revertirlo; fuera de un lote no hace nada."""
+    state = getattr(bay, "_batch_state", None)
+    if state is not None:
+        state.record(bay)
+
+
+@contextmanager
+def project_batch(project, bay_ids: Optional[Iterable[str]] = None):
+    """Lote de mutaciones sobre el proyecto (usar como `with project.batch():`).
+
+    - Los eventos de cambio se entregan juntos al confirmar (una sola actualización de
+      navegador, docks y canvas).
+    - `touch_devices` se acumula por bahía: índices y segmentos se recalculan una vez
+      (o antes, si algo consulta la bahía dentro del lote).
+    - Si el bloque lanza una excepción se restaura el estado de las bahías modificadas, se
+      eliminan las bahías creadas y se descartan sus eventos. Las bahías en `bay_ids` se copian
+      al empezar; las demás, la primera vez que un servicio las modifica (`record_bay`), así
+      el costo del lote es proporcional a lo que toca y no al tamaño del proyecto.
+
+    Un lote anidado se une al externo (la reversión la hace el lote más externo).
+    """
+    if getattr(project, "_batch_active", False):
+        yield project
+        return
+
+    bus = project.events
+    mark = bus.pending_count()
+    state = _BatchState(project)
+    for b in bay_ids or ():
+        if b in project.bays:
+            state.record(project.bays[b])
+    bays_before = dict(project.bays)
+    canvases_before = dict(project.canvases)
+    templates_before = list(project.templates)
+    deferred = list(project.bays.values())
+
+    project._batch_active = True
+    for bay in deferred:
+        defer_touches(bay)
+        bay._batch_state = state
+    try:
+        with bus.transaction():
+            try:
+                yield project
+            except BaseException:
+                for bay in deferred:
+                    end_deferred_touches(bay)
+                deferred = []
+                project.bays.clear()
+                project.bays.update(bays_before)
+                project.canvases.clear()
+                project.canvases.update(canvases_before)
+                project.templates[:] = templates_before
+                for snap in state.snapshots.values():
+                    snap.restore(project)
+                bus.discard_pending(mark)
+                raise
+            finally:
+                for bay in deferred:
+                    end_deferred_touches(bay)
+    finally:
+        project._batch_active = False
+        for bay in bays_before.values():
+            bay._batch_state = None
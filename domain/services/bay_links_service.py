@@ -0,0 +1,51 @@
+from __future__ import annotations
+
+from typing import Dict, List, Tuple
+
+from diagnostics.profiler import profiled
+from domain.services.endpoint_store import DIR_IN, DIR_OUT, segment_for
+
+# (equipo con el OUT, equipo con el IN) -> [(fila OUT, fila IN, signal_id), ...]
+BayLinks = Dict[Tuple[str, str], List[Tuple[int, int, str]]]
+
+
+class _LinkCache:
+    __slots__ = ("segment", "links")
+
+    def __init__(self, segment, links: BayLinks):
+        self.segment = segment
+        self.links = links
+
+
+@profiled()
+def bay_links(bay) -> BayLinks:
+    """Conexiones dentro de la bahía: un OUT y un IN de equipos distintos con el mismo
+    signal_id, agrupadas por par de equipos. La fila es la posición del extremo en
+    dev.outputs/dev.inputs (la misma que su chip en el canvas).
+
+    Se arma desde el segmento de extremos y se reusa mientras el segmento sea el mismo.
+    """
+    seg = segment_for(bay)
+    cache = getattr(bay, "_link_cache", None)
+    if cache is not None and cache.segment is seg:
+        return cache.links
+
+    outs: Dict[int, List[Tuple[int, int]]] = {}
+    ins: Dict[int, List[Tuple[int, int]]] = {}
+    for direction, target in ((DIR_OUT, outs), (DIR_IN, ins)):
+        for i in seg.rows(seg.mask(direction=direction)):
+            target.setdefault(int(seg.sig[i]), []).append((int(seg.dev[i]), int(seg.slot[i])))
+
+    links: BayLinks = {}
+    for code, srcs in outs.items():
+        dsts = ins.get(code)
+        if not dsts:
+            continue
+        sid = seg.signal_ids[code]
+        for d_out, s_out in srcs:
+            for d_in, s_in in dsts:
+                if d_out != d_in:
+                    key = (seg.device_ids[d_out], seg.device_ids[d_in])
+                    links.setdefault(key, []).append((s_out, s_in, sid))
+    bay._link_cache = _LinkCache(seg, links)
+    return links
@@ -0,0 +1,91 @@
+from __future__ import annotations
+
+from dataclasses import dataclass, field
+from typing import Dict, List, Optional, Tuple
+
+from domain.services.link_service import recognize_pending_link_cross
+from domain.services.name_index_service import KEYWORD_OUT, referenced_name
+from domain.services.pending_service import iter_pending
+
+EXTERNAL_NAMES = {"EXTERNO"}
+
+
+@dataclass
+class RecognitionMatch:
+    """Propuesta de reconocimiento de un OUT pendiente según su texto ('... hacia <equipo>')."""
+    origin_bay_id: str
+    origin_device_id: str
+    signal_id: str
+    text: str
+    target_name: Optional[str]
+    # candidatos (bay_id, device_id) con ese nombre; la propuesta es `dest` si hay uno solo
+    candidates: List[Tuple[str, str]] = field(default_factory=list)
+    dest: Optional[Tuple[str, str]] = None
+    reason: str = ""
+
+    @property
+    def ok(self) -> bool:
+        return self.dest is not None
+
+
+def _norm(name: str) -> str:
+    return " ".join((name or "").split()).upper()
+
+
+def device_name_index(project) -> Dict[str, List[Tuple[str, str]]]:
+    """Nombre normalizado de equipo -> [(bay_id, device_id)] en todo el proyecto."""
+    idx: Dict[str, List[Tuple[str, str]]] = {}
+    for bay_id, bay in project.bays.items():
+        for dev in bay.devices.values():
+            idx.setdefault(_norm(dev.name), []).append((bay_id, dev.device_id))
+    return idx
+
+
+def match_pending_outputs(project, *, bay_id: Optional[str] = None) -> List[RecognitionMatch]:
+    """Propone destinos para los OUT pendientes (de una bahía o de todo el proyecto).
+
+    Regla: el nombre tras 'hacia' debe coincidir (sin distinguir mayúsculas/espacios) con
+    un equipo. Si hay varios equipos con ese nombre se prefiere el de la misma bahía; si
+    aun así hay más de uno, la propuesta queda como ambigua y no se aplica.
+    """
+    idx = device_name_index(project)
+    out: List[RecognitionMatch] = []
+    for bay, dev, _direction, e in iter_pending(project, bay_id=bay_id, only_out=True):
+        name = referenced_name(e.text, KEYWORD_OUT)
+        m = RecognitionMatch(bay.bay_id, dev.device_id, e.signal_id, e.text or "", name)
+        out.append(m)
+        if not name:
+            m.reason = "Texto sin destino"
+            continue
+        if _norm(name) in EXTERNAL_NAMES:
+            m.reason = "Destino externo"
+            continue
+        cands = [c for c in idx.get(_norm(name), []) if c != (bay.bay_id, dev.device_id)]
+        m.candidates = cands
+        if not cands:
+            m.reason = "Equipo no encontrado"
+            continue
+        local = [c for c in cands if c[0] == bay.bay_id]
+        pick = local if local else cands
+        if len(pick) == 1:
+            m.dest = pick[0]
+            m.reason = "Misma bahía" if local else "Otra bahía"
+        else:
+            m.reason = f"Ambiguo ({len(pick)} equipos)"
+    return out
+
+
+def apply_matches(project, matches) -> int:
+    """Reconoce las propuestas con destino en un solo lote (se revierte completo si falla).
+    Retorna la cantidad aplicada."""
+    n = 0
+    with project.batch():
+        for m in matches:
+            if m.dest is None:
+                continue
+            dest_bay_id, dest_device_id = m.dest
+            recognize_pending_link_cross(
+                project, m.origin_bay_id, m.origin_device_id, m.signal_id, dest_bay_id, dest_device_id
+            )
+            n += 1
+    return n
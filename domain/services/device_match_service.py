@@ -0,0 +1,154 @@
+from __future__ import annotations
+
+from difflib import SequenceMatcher
+from typing import Dict, List, Optional, Set, Tuple
+
+from domain.events import STRUCTURE_EVENTS, has_event
+from domain.services.name_index_service import KEYWORD_OUT, referenced_name
+
+# candidatos que pasan del filtro por trigramas al re-ranking por similitud de texto
+RERANK_POOL = 50
+# Dice mínimo entre la consulta y el nombre de una bahía para sumar sus equipos como candidatos
+BAY_MIN_DICE = 0.5
+
+
+def _norm(text: str) -> str:
+    return " ".join((text or "").split()).upper()
+
+
+def _trigrams(text: str) -> Set[str]:
+    t = f"  {text} "
+    return {t[i:i + 3] for i in range(len(t) - 2)}
+
+
+class DeviceNameMatcher:
+    """Índice de trigramas sobre los nombres de equipo y de bahía del proyecto.
+
+    `suggest()` filtra candidatos por trigramas compartidos (índice invertido, sin recorrer
+    todos los equipos) y re-ordena los mejores por similitud de texto. Los nombres de bahía
+    van en un índice aparte: una consulta 'equipo bahía' suma los trigramas de ambos, y una
+    bahía que se parece lo suficiente a la consulta aporta sus equipos como candidatos. El índice se arma una
+    vez y se marca obsoleto con los eventos estructurales del proyecto (equipos/bahías
+    agregados, eliminados o renombrados); ver `matcher_for`.
+    """
+
+    def __init__(self, project):
+        self._entries: List[Tuple[str, str, str, str]] = []      # (bay_id, device_id, NOMBRE, BAHÍA)
+        self._grams: Dict[str, List[int]] = {}
+        self._n_grams: List[int] = []
+        self._bay_grams: Dict[str, List[str]] = {}
+        self._bay_n_grams: Dict[str, int] = {}
+        self._bay_entries: Dict[str, List[int]] = {}
+        self.stale = False
+        for bay_id, bay in project.bays.items():
+            bay_name = _norm(bay.name)
+            grams = _trigrams(bay_name) if bay_name else set()
+            self._bay_n_grams[bay_id] = len(grams)
+            for g in grams:
+                self._bay_grams.setdefault(g, []).append(bay_id)
+            rows = self._bay_entries[bay_id] = []
+            for dev in bay.devices.values():
+                name = _norm(dev.name)
+                i = len(self._entries)
+                rows.append(i)
+                self._entries.append((bay_id, dev.device_id, name, bay_name))
+                grams = _trigrams(name)
+                self._n_grams.append(len(grams))
+                for g in grams:
+                    self._grams.setdefault(g, []).append(i)
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def iter_matching(self, text: str = ""):
+        """Itera (bay_id, device_id) cuyos 'equipo bahía' contienen todas las palabras de
+        `text` (todos si está vacío), en orden del proyecto. Es perezoso: quien consume
+        decide cuántos traer."""
+        words = _norm(text).split()
+        for bay_id, dev_id, name, bay_name in self._entries:
+            hay = f"{name} {bay_name}"
+            if all(w in hay for w in words):
+                yield bay_id, dev_id
+
+    def _on_events(self, events) -> None:
+        if has_event(events, STRUCTURE_EVENTS):
+            self.stale = True
+
+    def suggest(self, query: str, *, k: int = 5, prefer_bay_id: Optional[str] = None,
+                exclude: Optional[Tuple[str, str]] = None) -> List[Tuple[float, str, str]]:
+        """Top-k (score 0..1, bay_id, device_id) para `query` (nombre de equipo, o
+        'equipo bahía'). Los equipos de `prefer_bay_id` reciben un pequeño bono."""
+        q = _norm(query)
+        if not q or not self._entries:
+            return []
+        q_grams = _trigrams(q)
+        nq = len(q_grams)
+        hits: Dict[int, int] = {}
+        bay_hits: Dict[str, int] = {}
+        for g in q_grams:
+            for i in self._grams.get(g, ()):
+                hits[i] = hits.get(i, 0) + 1
+            for b in self._bay_grams.get(g, ()):
+                bay_hits[b] = bay_hits.get(b, 0) + 1
+        named_bays = {b for b, h in bay_hits.items() if 2.0 * h / (nq + self._bay_n_grams[b]) >= BAY_MIN_DICE}
+        for b in named_bays:
+            for i in self._bay_entries[b]:
+                hits.setdefault(i, 0)
+
+        # Dice sobre trigramas como filtro grueso: contra el nombre del equipo o contra 'equipo bahía'
+        def coarse(i: int) -> float:
+            n = self._n_grams[i]
+            d = 2.0 * hits[i] / (nq + n)
+            bh = bay_hits.get(self._entries[i][0])
+            if bh:
+                b = self._bay_n_grams[self._entries[i][0]]
+                d = max(d, 2.0 * min(nq, hits[i] + bh) / (nq + n + b))
+            return d
+
+        pool = sorted(hits, key=lambda i: -coarse(i))[:RERANK_POOL]
+
+        ranked = []
+        for i in pool:
+            bay_id, dev_id, name, bay_name = self._entries[i]
+            if exclude == (bay_id, dev_id):
+                continue
+            score = SequenceMatcher(None, q, name, autojunk=False).ratio()
+            if bay_name and (bay_name in q or bay_id in named_bays):
+                score = max(score, SequenceMatcher(None, q, f"{name} {bay_name}", autojunk=False).ratio())
+            if name == q:
+                score = 1.0
+            if prefer_bay_id and bay_id == prefer_bay_id:
+                score = min(1.0, score + 0.05)
+            ranked.append((score, bay_id, dev_id))
+        ranked.sort(key=lambda r: -r[0])
+        return ranked[:k]
+
+    def suggest_for_text(self, text: str, **kw) -> List[Tuple[float, str, str]]:
+        """Sugerencias a partir del texto de un extremo OUT ('X hacia <equipo>[ (pendiente)]')."""
+        name = referenced_name(text, KEYWORD_OUT)
+        return self.suggest(name, **kw) if name else []
+
+
+def matcher_for(project) -> DeviceNameMatcher:
+    """Matcher del proyecto, reconstruido sólo si cambió la estructura (equipos/bahías)."""
+    m = getattr(project, "_device_matcher", None)
+    if m is None or m.stale:
+        m = DeviceNameMatcher(project)
+        project._device_matcher = m
+        project.events.subscribe(m._on_events, priority=-10)
+    return m
+
+
+def suggest_destinations(project, origin_bay_id: str, origin_device_id: str, signal_id: str,
+                         *, k: int = 5) -> List[Tuple[float, str, str]]:
+    """Destinos probables del OUT `signal_id` del equipo origen, según su texto."""
+    bay = project.bays.get(origin_bay_id)
+    dev = bay.devices.get(origin_device_id) if bay else None
+    if dev is None:
+        return []
+    end = next((e for e in dev.outputs if e.signal_id == signal_id), None)
+    if end is None:
+        return []
+    return matcher_for(project).suggest_for_text(
+        end.text, k=k, prefer_bay_id=origin_bay_id, exclude=(origin_bay_id, origin_device_id)
+    )
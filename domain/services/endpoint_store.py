@@ -0,0 +1,256 @@
+from __future__ import annotations
+
+from array import array
+from typing import Dict, Iterable, Iterator, List, Optional, Tuple
+
+from domain.services.name_index_service import bay_revision
+
+try:  # opcional: con NumPy las consultas por fila son vectorizadas; los conteos no lo necesitan
+    import numpy as np
+except ImportError:  # pragma: no cover - depende del entorno
+    np = None
+
+DIR_IN, DIR_OUT = 0, 1
+ST_CONFIRMED, ST_PENDING = 0, 1
+NAT_DIGITAL, NAT_ANALOG = 0, 1
+
+
+def _status_code(e) -> int:
+    return ST_PENDING if (e.status or "").upper() == "PENDING" else ST_CONFIRMED
+
+
+class DeviceRows:
+    """Extremos de un equipo (IN y luego OUT) dentro del segmento.
+
+    Los conteos por dirección/estado se calculan al crearlo (una pasada por los estados);
+    las columnas por fila, recién cuando alguna consulta las pide. Un equipo no tocado
+    conserva su DeviceRows de un segmento al siguiente.
+    """
+
+    __slots__ = ("device", "inputs", "outputs", "counts", "_cols")
+
+    def __init__(self, dev):
+        self.device = dev
+        self.inputs = tuple(dev.inputs)
+        self.outputs = tuple(dev.outputs)
+        in_p = out_p = 0
+        for e in self.inputs:
+            if (e.status or "").upper() == "PENDING":
+                in_p += 1
+        for e in self.outputs:
+            if (e.status or "").upper() == "PENDING":
+                out_p += 1
+        # counts[dirección][estado]
+        self.counts = ((len(self.inputs) - in_p, in_p), (len(self.outputs) - out_p, out_p))
+        self._cols = None
+
+    def __len__(self) -> int:
+        return len(self.inputs) + len(self.outputs)
+
+    def count(self, direction: Optional[int] = None, status: Optional[int] = None) -> int:
+        dirs = self.counts if direction is None else (self.counts[direction],)
+        if status is None:
+            return sum(c[0] + c[1] for c in dirs)
+        return sum(c[status] for c in dirs)
+
+    def ends(self, direction: int):
+        return self.inputs if direction == DIR_IN else self.outputs
+
+    def columns(self, natures: Dict[str, int]) -> tuple:
+        """(direction, status, nature, test_block, signal_id, slot), una entrada por fila."""
+        if self._cols is None:
+            direction, status, nature, test_block, sids, slot = [], [], [], [], [], []
+            for d, ends in ((DIR_IN, self.inputs), (DIR_OUT, self.outputs)):
+                for i, e in enumerate(ends):
+                    direction.append(d)
+                    status.append(_status_code(e))
+                    nature.append(natures.get(e.signal_id, NAT_DIGITAL))
+                    test_block.append(1 if getattr(e, "test_block", False) else 0)
+                    sids.append(e.signal_id)
+                    slot.append(i)
+            self._cols = (direction, status, nature, test_block, sids, slot)
+        return self._cols
+
+
+_COLUMNS = ("dev", "direction", "status", "nature", "test_block", "sig", "slot")
+
+
+class BaySegment:
+    """Vista de los extremos (SignalEnd) de una bahía, un bloque (`DeviceRows`) por equipo.
+
+    - Conteos por dirección/estado (`count`, `count_by_device`) salen de los bloques: no
+      recorren extremos.
+    - Las consultas por fila usan columnas paralelas de códigos enteros: dev (índice en
+      `device_ids`), direction, status, nature, test_block, sig (índice en `signal_ids`) y
+      slot (posición en dev.inputs/dev.outputs). Se arman recién al pedirlas (NumPy si está
+      instalado).
+    - Con cada revisión de la bahía (`touch_devices`) el segmento nuevo reusa los bloques de
+      los equipos no tocados.
+    """
+
+    __slots__ = ("bay_id", "revision", "device_ids", "blocks", "_bay", "_n", "_cols", "_signal_ids")
+
+    def __init__(self, bay, revision: int, blocks: List[DeviceRows]):
+        self.bay_id = bay.bay_id
+        self.revision = revision
+        self.blocks = blocks
+        self.device_ids: List[str] = [b.device.device_id for b in blocks]
+        self._bay = bay
+        self._n = sum(len(b) for b in blocks)
+        self._cols = None
+        self._signal_ids: List[str] = []
+
+    @classmethod
+    def build(cls, bay, previous: Optional["BaySegment"] = None, touched: Iterable[str] = ()) -> "BaySegment":
+        """Segmento de la bahía; con `previous` reusa los bloques de los equipos que no están
+        en `touched` (y siguen siendo el mismo objeto)."""
+        reuse: Dict[str, DeviceRows] = {}
+        if previous is not None:
+            touched = set(touched)
+            reuse = {b.device.device_id: b for b in previous.blocks if b.device.device_id not in touched}
+        blocks = []
+        for dev in list(bay.devices.values()):
+            block = reuse.get(dev.device_id)
+            if block is None or block.device is not dev:
+                block = DeviceRows(dev)
+            blocks.append(block)
+        return cls(bay, bay_revision(bay), blocks)
+
+    def __len__(self) -> int:
+        return self._n
+
+    # ---------------- Conteos ----------------
+    def count(self, *, direction: Optional[int] = None, status: Optional[int] = None, **filters) -> int:
+        if filters:
+            m = self.mask(direction=direction, status=status, **filters)
+            return int(m.sum()) if np is not None else len(m)
+        return sum(b.count(direction, status) for b in self.blocks)
+
+    def count_by_device(self, *, direction: Optional[int] = None, status: Optional[int] = None,
+                        **filters) -> List[int]:
+        """Conteo por equipo (alineado con `device_ids`)."""
+        if not filters:
+            return [b.count(direction, status) for b in self.blocks]
+        n = len(self.device_ids)
+        m = self.mask(direction=direction, status=status, **filters)
+        if np is not None:
+            return np.bincount(self.dev[m], minlength=n).tolist()
+        out = [0] * n
+        dev = self.dev
+        for i in m:
+            out[dev[i]] += 1
+        return out
+
+    def signal_set(self, direction: int) -> frozenset:
+        """SignalIDs con algún extremo en esa dirección."""
+        return frozenset(e.signal_id for b in self.blocks for e in b.ends(direction))
+
+    # ---------------- Columnas ----------------
+    def _columns(self) -> tuple:
+        if self._cols is None:
+            natures = {sid: (NAT_ANALOG if (s.nature or "").upper() == "ANALOG" else NAT_DIGITAL)
+                       for sid, s in list(self._bay.signals.items())}
+            codes: Dict[str, int] = {}
+            signal_ids = self._signal_ids
+            dev_c, dir_c, st_c, nat_c, tb_c, sig_c, slot_c = (array("i") for _ in range(7))
+            for d_code, block in enumerate(self.blocks):
+                direction, status, nature, test_block, sids, slot = block.columns(natures)
+                dev_c.extend([d_code] * len(direction))
+                dir_c.extend(direction)
+                st_c.extend(status)
+                nat_c.extend(nature)
+                tb_c.extend(test_block)
+                slot_c.extend(slot)
+                for sid in sids:
+                    code = codes.get(sid)
+                    if code is None:
+                        code = codes[sid] = len(signal_ids)
+                        signal_ids.append(sid)
+                    sig_c.append(code)
+            cols = (dev_c, dir_c, st_c, nat_c, tb_c, sig_c, slot_c)
+            if np is not None:
+                cols = tuple(np.frombuffer(c, dtype=np.int32) if len(c) else np.zeros(0, dtype=np.int32) for c in cols)
+            self._cols = dict(zip(_COLUMNS, cols))
+        return self._cols
+
+    dev = property(lambda self: self._columns()["dev"])
+    direction = property(lambda self: self._columns()["direction"])
+    status = property(lambda self: self._columns()["status"])
+    nature = property(lambda self: self._columns()["nature"])
+    test_block = property(lambda self: self._columns()["test_block"])
+    sig = property(lambda self: self._columns()["sig"])
+    slot = property(lambda self: self._columns()["slot"])
+
+    @property
+    def signal_ids(self) -> List[str]:
+        self._columns()
+        return self._signal_ids
+
+    def mask(self, *, direction: Optional[int] = None, status: Optional[int] = None,
+             nature: Optional[int] = None, test_block: Optional[bool] = None):
+        """Filas que cumplen los filtros (array booleano con NumPy, lista de índices sin él)."""
+        cols = self._columns()
+        conds = [(cols[name], val) for name, val in (
+            ("direction", direction), ("status", status), ("nature", nature),
+            ("test_block", None if test_block is None else int(bool(test_block))),
+        ) if val is not None]
+        if np is not None:
+            m = np.ones(len(self), dtype=bool)
+            for col, val in conds:
+                m &= col == val
+            return m
+        rows = range(len(self))
+        for col, val in conds:
+            rows = [i for i in rows if col[i] == val]
+        return list(rows)
+
+    def rows(self, m) -> Iterable[int]:
+        if np is not None:
+            return np.flatnonzero(m).tolist()
+        return m
+
+
+def segment_for(bay) -> BaySegment:
+    """Retorna el segmento de la bahía. Si la bahía cambió (`touch_devices`, o equipos
+    agregados/eliminados) se arma uno nuevo que sólo vuelve a leer los equipos tocados."""
+    seg = getattr(bay, "_endpoint_segment", None)
+    if seg is not None and seg.bay_id == bay.bay_id and seg.revision == bay_revision(bay) \
+            and len(seg.device_ids) == len(bay.devices):
+        return seg
+    touched = getattr(bay, "_segment_touches", None)
+    if seg is None or seg.bay_id != bay.bay_id or touched is None:
+        seg = BaySegment.build(bay)
+    else:
+        seg = BaySegment.build(bay, seg, touched)
+    bay._endpoint_segment = seg
+    bay._segment_touches = set()
+    return seg
+
+
+def invalidate_bays(project, bay_ids: Optional[Iterable[str]] = None) -> None:
+    """Descarta segmentos (todas las bahías si bay_ids es None o vacío). Los cambios del modelo
+    pasan por `touch_devices`; esto es para quien reemplaza bahías completas."""
+    ids = set(bay_ids or ()) or set(project.bays)
+    for bay_id in ids:
+        bay = project.bays.get(bay_id)
+        if bay is not None:
+            bay._endpoint_segment = None
+
+
+def iter_endpoints(project, *, bay_id: Optional[str] = None, direction: Optional[int] = None,
+                   status: Optional[int] = None) -> Iterator[Tuple[object, object, str, object]]:
+    """Itera (bay, device, "IN"/"OUT", SignalEnd) de los extremos que cumplen los filtros,
+    en el orden del modelo (bahía, equipo, IN antes que OUT). Los equipos sin extremos que
+    cumplan los filtros se saltan por sus conteos."""
+    bays = [project.bays[bay_id]] if bay_id else list(project.bays.values())
+    dirs = (DIR_IN, DIR_OUT) if direction is None else (direction,)
+    for bay in bays:
+        for block in segment_for(bay).blocks:
+            dev = block.device
+            for d in dirs:
+                if not block.count(d, status):
+                    continue
+                label = "IN" if d == DIR_IN else "OUT"
+                for e in block.ends(d):
+                    if status is None or _status_code(e) == status:
+                        yield bay, dev, label, e
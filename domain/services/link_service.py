@@ -1,14 +1,58 @@
 from __future__ import annotations
+from diagnostics.tracing import traced
+from domain.events import (
+    EndpointAdded, EndpointChanged, EndpointRemoved, EndpointStatusChanged, SignalChanged, emit, transaction,
+)
 from domain.models import SignalEnd
+from domain.services.batch_service import record_bay
+from domain.services.name_index_service import touch_devices
 
-def remove_link(bay, signal_id: str) -> None:
+
+def _set_end(project, bay, dev, e, *, text: str | None = None, status: str | None = None) -> None:
+    """Actualiza texto/estado de un extremo y emite los eventos correspondientes."""
+    if text is not None and text != e.text:
+        e.text = text
+        emit(project, EndpointChanged(bay.bay_id, dev.device_id, e.signal_id, e.direction))
+    if status is not None and status != e.status:
+        e.status = status
+        emit(project, EndpointStatusChanged(bay.bay_id, dev.device_id, e.signal_id, e.direction, status))
+
+
+def _add_end(project, bay, dev, end: SignalEnd) -> None:
+    (dev.inputs if end.direction == "IN" else dev.outputs).append(end)
+    emit(project, EndpointAdded(bay.bay_id, dev.device_id, end.signal_id, end.direction))
+
+
+def _strip_signal(bay, signal_id: str, project=None) -> None:
+    record_bay(bay)
+    touched = []
     for dev in bay.devices.values():
+        removed = [e for e in dev.inputs + dev.outputs if e.signal_id == signal_id]
+        if not removed:
+            continue
         dev.inputs[:] = [e for e in dev.inputs if e.signal_id != signal_id]
         dev.outputs[:] = [e for e in dev.outputs if e.signal_id != signal_id]
-    if signal_id in bay.signals:
-        del bay.signals[signal_id]
+        touched.append(dev.device_id)
+        for e in removed:
+            emit(project, EndpointRemoved(bay.bay_id, dev.device_id, signal_id, e.direction))
+    touch_devices(bay, touched)
+
+
+@traced()
+def remove_link(bay, signal_id: str, *, project=None) -> None:
+    with transaction(project):
+        _strip_signal(bay, signal_id, project)
+        if signal_id in bay.signals:
+            del bay.signals[signal_id]
+            emit(project, SignalChanged(bay.bay_id, signal_id))
 
-def recognize_pending_link(bay, origin_device_id: str, signal_id: str, dest_device_id: str) -> None:
+@traced()
+def recognize_pending_link(bay, origin_device_id: str, signal_id: str, dest_device_id: str, *, project=None) -> None:
+    with transaction(project):
+        _recognize_pending_link(project, bay, origin_device_id, signal_id, dest_device_id)
+
+def _recognize_pending_link(project, bay, origin_device_id: str, signal_id: str, dest_device_id: str) -> None:
+    record_bay(bay)
     origin = bay.devices[origin_device_id]
     dest = bay.devices[dest_device_id]
     sig = bay.signals.get(signal_id)
@@ -20,23 +64,31 @@ def recognize_pending_link(bay, origin_device_id: str, signal_id: str, dest_devi
             if " hacia " in e.text:
                 left, _ = e.text.split(" hacia ", 1)
                 left = left.strip()
-            e.text = f"{left} hacia {dest.name}"
-            e.status = "CONFIRMED"
+            _set_end(project, bay, origin, e, text=f"{left} hacia {dest.name}", status="CONFIRMED")
+
+    touch_devices(bay, [origin_device_id, dest_device_id])
 
     for e in dest.inputs:
         if e.signal_id == signal_id:
             return
 
-    dest.inputs.append(SignalEnd(
+    _add_end(project, bay, dest, SignalEnd(
         signal_id=signal_id,
         direction="IN",
         text=f"{sig_name} desde {origin.name}",
         status="CONFIRMED"
     ))
 
-def rename_signal_texts(bay, signal_id: str, new_name: str) -> None:
+@traced()
+def rename_signal_texts(bay, signal_id: str, new_name: str, *, project=None) -> None:
+    with transaction(project):
+        _rename_signal_texts(project, bay, signal_id, new_name)
+
+def _rename_signal_texts(project, bay, signal_id: str, new_name: str) -> None:
+    record_bay(bay)
     if signal_id in bay.signals:
         bay.signals[signal_id].name = new_name
+        emit(project, SignalChanged(bay.bay_id, signal_id))
 
     for dev in bay.devices.values():
         for e in dev.outputs:
@@ -44,20 +96,40 @@ def rename_signal_texts(bay, signal_id: str, new_name: str) -> None:
                 continue
             if " hacia " in e.text:
                 _, suffix = e.text.split(" hacia ", 1)
-                e.text = f"{new_name} hacia {suffix.strip()}"
+                _set_end(project, bay, dev, e, text=f"{new_name} hacia {suffix.strip()}")
             else:
-                e.text = new_name
+                _set_end(project, bay, dev, e, text=new_name)
 
         for e in dev.inputs:
             if e.signal_id != signal_id:
                 continue
             if " desde " in e.text:
                 _, suffix = e.text.split(" desde ", 1)
-                e.text = f"{new_name} desde {suffix.strip()}"
+                _set_end(project, bay, dev, e, text=f"{new_name} desde {suffix.strip()}")
             else:
-                e.text = new_name
+                _set_end(project, bay, dev, e, text=new_name)
+
+    # Normalmente el equipo referenciado no cambia, pero un texto sin 'hacia/desde' sí puede pasar a tenerlo.
+    touch_devices(bay, list(bay.devices.keys()))
+
+
+@traced()
+def set_signal_nature(bay, signal_id: str, nature: str, *, project=None) -> None:
+    sig = bay.signals.get(signal_id)
+    if sig is None or sig.nature == nature:
+        return
+    with transaction(project):
+        record_bay(bay)
+        sig.nature = nature
+        emit(project, SignalChanged(bay.bay_id, signal_id))
+        # la naturaleza se copia a cada extremo del segmento: se marcan los equipos que la usan
+        touch_devices(bay, [
+            dev.device_id for dev in bay.devices.values()
+            if any(e.signal_id == signal_id for e in dev.inputs + dev.outputs)
+        ])
 
 
+@traced()
 def find_signal_destination_device_id(bay, signal_id: str) -> str | None:
     for dev in bay.devices.values():
         for e in dev.inputs:
@@ -83,13 +155,20 @@ def _infer_origin_name(bay, signal_id: str, origin_device_id: str | None) -> str
     return None
 
 
+@traced()
 def update_signal_destination(
     bay,
     signal_id: str,
     dest_device_id: str | None,
     *,
     origin_device_id: str | None = None,
+    project=None,
 ) -> None:
+    with transaction(project):
+        _update_signal_destination(project, bay, signal_id, dest_device_id, origin_device_id)
+
+def _update_signal_destination(project, bay, signal_id: str, dest_device_id: str | None, origin_device_id: str | None) -> None:
+    record_bay(bay)
     sig = bay.signals.get(signal_id)
     sig_name = sig.name if sig else signal_id
     origin_name = _infer_origin_name(bay, signal_id, origin_device_id)
@@ -110,25 +189,30 @@ def update_signal_destination(
             if e.signal_id != signal_id:
                 continue
             if dest_device_id is None:
-                e.status = "PENDING"
-                e.text = f"{sig_name} hacia {dest_name} (pendiente)"
+                _set_end(project, bay, dev, e, text=f"{sig_name} hacia {dest_name} (pendiente)", status="PENDING")
             else:
-                e.status = "CONFIRMED"
-                e.text = f"{sig_name} hacia {dest_name}"
+                _set_end(project, bay, dev, e, text=f"{sig_name} hacia {dest_name}", status="CONFIRMED")
 
     # Update inputs (single destination per bay).
+    touched = [origin_device_id] if origin_device_id else [d.device_id for d in bay.devices.values()]
     for dev in bay.devices.values():
         if dest_device_id is None or dev.device_id != dest_device_id:
+            n_in = len(dev.inputs)
             dev.inputs[:] = [e for e in dev.inputs if e.signal_id != signal_id]
+            if len(dev.inputs) != n_in:
+                touched.append(dev.device_id)
+                emit(project, EndpointRemoved(bay.bay_id, dev.device_id, signal_id, "IN"))
             continue
 
+        touched.append(dev.device_id)
+
         end = next((e for e in dev.inputs if e.signal_id == signal_id), None)
         text = f"{sig_name} desde {origin_name}" if origin_name else sig_name
         if end:
-            end.status = "CONFIRMED"
-            end.text = text
+            _set_end(project, bay, dev, end, text=text, status="CONFIRMED")
         else:
-            dev.inputs.append(
+            _add_end(
+                project, bay, dev,
                 SignalEnd(
                     signal_id=signal_id,
                     direction="IN",
@@ -136,12 +220,20 @@ def update_signal_destination(
                     status="CONFIRMED",
                 )
             )
+    touch_devices(bay, touched)
 
+@traced()
 def recognize_pending_link_cross(project, origin_bay_id: str, origin_device_id: str, signal_id: str, dest_bay_id: str, dest_device_id: str) -> None:
+    with transaction(project):
+        _recognize_pending_link_cross(project, origin_bay_id, origin_device_id, signal_id, dest_bay_id, dest_device_id)
+
+def _recognize_pending_link_cross(project, origin_bay_id: str, origin_device_id: str, signal_id: str, dest_bay_id: str, dest_device_id: str) -> None:
     origin_bay = project.bays[origin_bay_id]
     dest_bay = project.bays[dest_bay_id]
     origin = origin_bay.devices[origin_device_id]
     dest = dest_bay.devices[dest_device_id]
+    record_bay(origin_bay)
+    record_bay(dest_bay)
 
     sig = origin_bay.signals.get(signal_id) or dest_bay.signals.get(signal_id)
     sig_name = sig.name if sig else signal_id
@@ -151,9 +243,11 @@ def recognize_pending_link_cross(project, origin_bay_id: str, origin_device_id:
     if signal_id not in origin_bay.signals:
         from domain.models import Signal
         origin_bay.signals[signal_id] = Signal(signal_id=signal_id, name=sig_name, nature=sig_nature)
+        emit(project, SignalChanged(origin_bay_id, signal_id))
     if signal_id not in dest_bay.signals:
         from domain.models import Signal
         dest_bay.signals[signal_id] = Signal(signal_id=signal_id, name=sig_name, nature=sig_nature)
+        emit(project, SignalChanged(dest_bay_id, signal_id))
 
     # update origin output text/status
     for e in origin.outputs:
@@ -162,10 +256,12 @@ def recognize_pending_link_cross(project, origin_bay_id: str, origin_device_id:
             if " hacia " in e.text:
                 left, _ = e.text.split(" hacia ", 1)
                 left = left.strip()
-            e.text = f"{left} hacia {dest.name}"
-            e.status = "CONFIRMED"
+            _set_end(project, origin_bay, origin, e, text=f"{left} hacia {dest.name}", status="CONFIRMED")
             break
 
+    touch_devices(origin_bay, [origin_device_id])
+    touch_devices(dest_bay, [dest_device_id])
+
     # Ensure destination IN exists AND is confirmed.
     # If the IN already exists (possibly pending), update it rather than returning.
     for e in dest.inputs:
@@ -174,12 +270,11 @@ def recognize_pending_link_cross(project, origin_bay_id: str, origin_device_id:
             if " desde " in e.text:
                 left, _ = e.text.split(" desde ", 1)
                 left = left.strip()
-            e.text = f"{left} desde {origin.name}"
-            e.status = "CONFIRMED"
+            _set_end(project, dest_bay, dest, e, text=f"{left} desde {origin.name}", status="CONFIRMED")
             return
 
-    from domain.models import SignalEnd
-    dest.inputs.append(
+    _add_end(
+        project, dest_bay, dest,
         SignalEnd(
             signal_id=signal_id,
             direction="IN",
@@ -188,10 +283,33 @@ def recognize_pending_link_cross(project, origin_bay_id: str, origin_device_id:
         )
     )
 
+@traced()
 def remove_link_project(project, signal_id: str) -> None:
     # remove endpoints in all bays/devices, and remove signal entry from each bay
-    for bay in project.bays.values():
-        for dev in bay.devices.values():
-            dev.inputs[:] = [e for e in dev.inputs if e.signal_id != signal_id]
-            dev.outputs[:] = [e for e in dev.outputs if e.signal_id != signal_id]
-        bay.signals.pop(signal_id, None)
+    remove_links_project(project, [signal_id])
+
+@traced()
+def remove_links_project(project, signal_ids) -> None:
+    """Elimina varias señales (extremos IN/OUT y definición) de todo el proyecto en una
+    sola pasada por bahía, en vez de una pasada completa por señal."""
+    sids = set(signal_ids)
+    if not sids:
+        return
+    with transaction(project):
+        for bay in project.bays.values():
+            touched = []
+            for dev in bay.devices.values():
+                removed = [e for e in dev.inputs + dev.outputs if e.signal_id in sids]
+                if not removed:
+                    continue
+                record_bay(bay)
+                dev.inputs[:] = [e for e in dev.inputs if e.signal_id not in sids]
+                dev.outputs[:] = [e for e in dev.outputs if e.signal_id not in sids]
+                touched.append(dev.device_id)
+                for e in removed:
+                    emit(project, EndpointRemoved(bay.bay_id, dev.device_id, e.signal_id, e.direction))
+            touch_devices(bay, touched)
+            for sid in sorted(sids & bay.signals.keys()):
+                record_bay(bay)
+                del bay.signals[sid]
+                emit(project, SignalChanged(bay.bay_id, sid))
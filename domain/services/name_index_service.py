@@ -0,0 +1,170 @@
+from __future__ import annotations
+
+from typing import Dict, Iterable, List, Optional, Set
+
+from diagnostics.tracing import traced
+
+KEYWORD_OUT = " hacia "
+KEYWORD_IN = " desde "
+
+
+def referenced_name(text: str, keyword: str) -> Optional[str]:
+    """Extrae el nombre de equipo referenciado en '... <keyword> <equipo>[ (pendiente)]'."""
+    if not text or keyword not in text:
+        return None
+    _, suffix = text.split(keyword, 1)
+    name = suffix.replace("(pendiente)", "").strip()
+    return name or None
+
+
+class NameRefIndex:
+    """Índice inverso por bahía: nombre de equipo -> equipos cuyos textos lo referencian.
+
+    El índice vive en la bahía (no en el proyecto) para que los servicios que sólo
+    reciben `bay` puedan mantenerlo. Las actualizaciones son perezosas: `touch()`
+    marca el equipo como sucio y se reindexa recién en la siguiente consulta.
+    """
+
+    def __init__(self) -> None:
+        self._refs: Dict[str, Set[str]] = {}
+        self._names_by_device: Dict[str, Set[str]] = {}
+        self._dirty: Set[str] = set()
+
+    @classmethod
+    def build(cls, bay) -> "NameRefIndex":
+        idx = cls()
+        for dev in bay.devices.values():
+            idx._index_device(dev)
+        return idx
+
+    def touch(self, device_id: str) -> None:
+        self._dirty.add(device_id)
+
+    def peers(self, bay, name: str) -> List[str]:
+        """Equipos que referencian `name` (o un nombre que empieza con `name`, igual que
+        `_replace_after_keyword`, que reemplaza por prefijo)."""
+        self._flush(bay)
+        out: Set[str] = set()
+        for ref, devs in self._refs.items():
+            if ref.startswith(name):
+                out.update(devs)
+        return list(out)
+
+    def _flush(self, bay) -> None:
+        if not self._dirty:
+            return
+        dirty, self._dirty = self._dirty, set()
+        for dev_id in dirty:
+            self._unindex_device(dev_id)
+            dev = bay.devices.get(dev_id)
+            if dev is not None:
+                self._index_device(dev)
+
+    def _index_device(self, dev) -> None:
+        names: Set[str] = set()
+        for e in dev.outputs:
+            n = referenced_name(e.text, KEYWORD_OUT)
+            if n:
+                names.add(n)
+        for e in dev.inputs:
+            n = referenced_name(e.text, KEYWORD_IN)
+            if n:
+                names.add(n)
+        if not names:
+            return
+        self._names_by_device[dev.device_id] = names
+        for n in names:
+            self._refs.setdefault(n, set()).add(dev.device_id)
+
+    def _unindex_device(self, device_id: str) -> None:
+        for n in self._names_by_device.pop(device_id, ()):
+            devs = self._refs.get(n)
+            if devs is None:
+                continue
+            devs.discard(device_id)
+            if not devs:
+                del self._refs[n]
+
+
+def name_index_for(bay) -> NameRefIndex:
+    """Retorna (construyendo si hace falta) el índice de referencias de la bahía."""
+    flush_deferred_touches(bay)
+    idx = getattr(bay, "_name_index", None)
+    if idx is None:
+        idx = NameRefIndex.build(bay)
+        bay._name_index = idx
+    return idx
+
+
+# equipos tocados: se suman a la llamada trazada que los contiene (servicios de enlaces, renombre...)
+@traced(touched=lambda _r, _bay, device_ids: len(device_ids))
+def touch_devices(bay, device_ids: Iterable[str]) -> None:
+    """Notifica que los extremos de esos equipos cambiaron (textos/estado, o equipos
+    creados/eliminados).
+
+    Incrementa la revisión de la bahía (ver `bay_revision`) y marca los equipos en el índice;
+    si el índice aún no existe se construirá completo en la primera consulta.
+    Dentro de `project.batch()` sólo se acumulan (ver `defer_touches`).
+    """
+    device_ids = list(device_ids)
+    if not device_ids:
+        return
+    deferred = getattr(bay, "_deferred_touches", None)
+    if deferred is not None:
+        deferred.update(device_ids)
+        return
+    _apply_touches(bay, device_ids)
+
+
+def _apply_touches(bay, device_ids) -> None:
+    bay._revision = getattr(bay, "_revision", 0) + 1
+    # el EndpointStore sólo vuelve a leer estos equipos (el set lo crea `segment_for`)
+    seg_touches = getattr(bay, "_segment_touches", None)
+    if seg_touches is not None:
+        seg_touches.update(device_ids)
+    idx = getattr(bay, "_name_index", None)
+    if idx is None:
+        return
+    for dev_id in device_ids:
+        idx.touch(dev_id)
+
+
+def bay_revision(bay) -> int:
+    """Contador de cambios de la bahía; los cachés derivados (p.ej. el EndpointStore) lo
+    comparan para saber si siguen vigentes."""
+    flush_deferred_touches(bay)
+    return getattr(bay, "_revision", 0)
+
+
+def defer_touches(bay) -> None:
+    """Empieza a acumular `touch_devices` de la bahía: muchas mutaciones seguidas cuentan
+    como una sola revisión. Se aplican al consultar la bahía o en `end_deferred_touches`."""
+    if getattr(bay, "_deferred_touches", None) is None:
+        bay._deferred_touches = set()
+
+
+def flush_deferred_touches(bay) -> None:
+    deferred = getattr(bay, "_deferred_touches", None)
+    if deferred:
+        _apply_touches(bay, list(deferred))
+        deferred.clear()
+
+
+def end_deferred_touches(bay) -> None:
+    flush_deferred_touches(bay)
+    bay._deferred_touches = None
+
+
+def touch_bay(bay) -> None:
+    touch_devices(bay, list(bay.devices.keys()))
+
+
+def find_referencing_devices(project, name: str):
+    """Retorna [(bay, device)] cuyos textos 'hacia/desde' referencian `name`."""
+    out = []
+    for bay in project.bays.values():
+        for dev_id in name_index_for(bay).peers(bay, name):
+            dev = bay.devices.get(dev_id)
+            if dev is not None:
+                out.append((bay, dev))
+    return out
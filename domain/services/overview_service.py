@@ -0,0 +1,106 @@
+from __future__ import annotations
+
+from dataclasses import dataclass, field
+from typing import Dict, FrozenSet, List, Optional, Tuple
+
+from diagnostics.profiler import profiled
+from domain.services.endpoint_store import DIR_IN, DIR_OUT, ST_PENDING, segment_for
+
+
+@dataclass
+class DeviceSummary:
+    device_id: str
+    name: str
+    n_in: int
+    n_out: int
+    pending: int
+
+
+@dataclass
+class BaySummary:
+    bay_id: str
+    name: str
+    devices: List[DeviceSummary] = field(default_factory=list)
+    n_in: int = 0
+    n_out: int = 0
+    pending: int = 0
+
+
+@dataclass
+class ProjectOverview:
+    bays: List[BaySummary] = field(default_factory=list)
+    # (bahía con el OUT, bahía con el IN) -> cantidad de señales que las unen
+    bundles: Dict[Tuple[str, str], int] = field(default_factory=dict)
+
+
+class _BayCounts:
+    """Conteos y señales IN/OUT de una bahía, derivados de su segmento de extremos.
+    Se guardan en la bahía y se reusan mientras el segmento sea el mismo."""
+
+    __slots__ = ("segment", "n_in", "n_out", "pending", "in_signals", "out_signals")
+
+    def __init__(self, seg):
+        self.segment = seg
+        self.n_in = seg.count_by_device(direction=DIR_IN)
+        self.n_out = seg.count_by_device(direction=DIR_OUT)
+        self.pending = seg.count_by_device(status=ST_PENDING)
+        self.in_signals: FrozenSet[str] = seg.signal_set(DIR_IN)
+        self.out_signals: FrozenSet[str] = seg.signal_set(DIR_OUT)
+
+
+def _bay_counts(bay) -> _BayCounts:
+    seg = segment_for(bay)
+    counts = getattr(bay, "_overview_counts", None)
+    if counts is None or counts.segment is not seg:
+        counts = _BayCounts(seg)
+        bay._overview_counts = counts
+    return counts
+
+
+def bay_summary(bay) -> BaySummary:
+    counts = _bay_counts(bay)
+    seg = counts.segment
+    out = BaySummary(bay_id=bay.bay_id, name=bay.name)
+    for i, dev_id in enumerate(seg.device_ids):
+        dev = bay.devices.get(dev_id)
+        if dev is None:
+            continue
+        out.devices.append(DeviceSummary(dev_id, dev.name, counts.n_in[i], counts.n_out[i], counts.pending[i]))
+    out.n_in = sum(counts.n_in)
+    out.n_out = sum(counts.n_out)
+    out.pending = sum(counts.pending)
+    return out
+
+
+@profiled()
+def compute_project_overview(project, bay_ids: Optional[List[str]] = None) -> ProjectOverview:
+    """Resumen de todas las bahías (equipos con sus conteos) y los haces de enlaces entre
+    bahías: una señal une la bahía A con la B si tiene un OUT en A y un IN en B.
+
+    Los conteos por bahía se recalculan sólo si su segmento de extremos cambió; los haces
+    se arman con una pasada por señal, sin recorrer extremos.
+    """
+    ids = list(bay_ids) if bay_ids is not None else list(project.bays)
+    data = ProjectOverview()
+    out_bays: Dict[str, List[str]] = {}
+    in_bays: Dict[str, List[str]] = {}
+    for bay_id in ids:
+        bay = project.bays.get(bay_id)
+        if bay is None:
+            continue
+        data.bays.append(bay_summary(bay))
+        counts = _bay_counts(bay)
+        for sid in counts.out_signals:
+            out_bays.setdefault(sid, []).append(bay_id)
+        for sid in counts.in_signals:
+            in_bays.setdefault(sid, []).append(bay_id)
+
+    for sid, dst in in_bays.items():
+        src = out_bays.get(sid)
+        if not src:
+            continue
+        for a in src:
+            for b in dst:
+                if a != b:
+                    data.bundles[(a, b)] = data.bundles.get((a, b), 0) + 1
+    return data
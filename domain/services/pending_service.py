@@ -1,21 +1,52 @@
 from __future__ import annotations
 
+from diagnostics.tracing import traced
+from domain.services.endpoint_store import DIR_IN, DIR_OUT, ST_PENDING, iter_endpoints, segment_for
+
+
+@traced(touched=lambda _r, bay: len(segment_for(bay)))
 def count_pending_for_bay(bay) -> dict:
     """Retorna conteos de pendientes para una bahía.
     Keys: in_pending, out_pending, total_pending
     """
-    in_p = 0
-    out_p = 0
-    for dev in bay.devices.values():
-        for e in dev.inputs:
-            if (e.status or "").upper() == "PENDING":
-                in_p += 1
-        for e in dev.outputs:
-            if (e.status or "").upper() == "PENDING":
-                out_p += 1
+    seg = segment_for(bay)
+    in_p = seg.count(direction=DIR_IN, status=ST_PENDING)
+    out_p = seg.count(direction=DIR_OUT, status=ST_PENDING)
     return {"in_pending": in_p, "out_pending": out_p, "total_pending": in_p + out_p}
 
+@traced(touched=lambda _r, dev: len(dev.inputs) + len(dev.outputs))
 def count_pending_for_device(dev) -> dict:
     in_p = sum(1 for e in dev.inputs if (e.status or "").upper() == "PENDING")
     out_p = sum(1 for e in dev.outputs if (e.status or "").upper() == "PENDING")
     return {"in_pending": in_p, "out_pending": out_p, "total_pending": in_p + out_p}
+
+@traced(touched=lambda counts, _bay: len(counts))
+def count_pending_by_device(bay) -> dict:
+    """Conteos de todos los equipos de la bahía en una pasada.
+    Retorna {device_id: {in_pending, out_pending, total_pending, total_in, total_out}}.
+    """
+    seg = segment_for(bay)
+    in_p = seg.count_by_device(direction=DIR_IN, status=ST_PENDING)
+    out_p = seg.count_by_device(direction=DIR_OUT, status=ST_PENDING)
+    tot_in = seg.count_by_device(direction=DIR_IN)
+    tot_out = seg.count_by_device(direction=DIR_OUT)
+    out = {}
+    for i, dev_id in enumerate(seg.device_ids):
+        out[dev_id] = {
+            "in_pending": in_p[i],
+            "out_pending": out_p[i],
+            "total_pending": in_p[i] + out_p[i],
+            "total_in": tot_in[i],
+            "total_out": tot_out[i],
+        }
+    return out
+
+# extremos recorridos: los suman las llamadas por bahía
+@traced()
+def count_pending_for_project(project) -> dict:
+    """{bay_id: conteos de count_pending_for_bay}."""
+    return {bay_id: count_pending_for_bay(bay) for bay_id, bay in project.bays.items()}
+
+def iter_pending(project, *, bay_id: str | None = None, only_out: bool = False):
+    """Itera (bay, device, "IN"/"OUT", SignalEnd) de los extremos pendientes."""
+    return iter_endpoints(project, bay_id=bay_id, direction=DIR_OUT if only_out else None, status=ST_PENDING)
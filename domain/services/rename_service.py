@@ -1,6 +1,10 @@
 from __future__ import annotations
 
-from typing import Optional
+from typing import Set
+
+from diagnostics.tracing import traced
+from domain.events import BayRenamed, DeviceRenamed, EndpointChanged, emit, transaction
+from domain.services.name_index_service import find_referencing_devices, touch_devices
 
 
 def _replace_after_keyword(text: str, keyword: str, old: str, new: str) -> str:
@@ -22,10 +26,12 @@ def _replace_after_keyword(text: str, keyword: str, old: str, new: str) -> str:
     return text
 
 
-def rename_device_in_project(project, *, bay_id: str, device_id: str, new_name: str) -> None:
+@traced()
+def rename_device_in_project(project, *, bay_id: str, device_id: str, new_name: str) -> Set[str]:
     """Renombra un equipo y actualiza referencias visibles ('desde/hacia <equipo>').
 
     NOTA: IDs NO cambian. Sólo se actualiza Device.name y textos de SignalEnd.
+    Retorna los bay_id cuyos textos cambiaron (incluye siempre `bay_id`).
     """
     bay = project.bays.get(bay_id)
     if not bay or device_id not in bay.devices:
@@ -38,20 +44,42 @@ def rename_device_in_project(project, *, bay_id: str, device_id: str, new_name:
         raise ValueError("Nombre de equipo vacío.")
 
     if new_name == old_name:
-        return
+        return {bay_id}
+
+    with transaction(project):
+        return _rename_device(project, bay, dev, old_name, new_name)
+
 
+def _rename_device(project, bay, dev, old_name: str, new_name: str) -> Set[str]:
+    bay_id = bay.bay_id
     # 1) renombra el equipo
     dev.name = new_name
+    emit(project, DeviceRenamed(bay_id, dev.device_id))
 
-    # 2) actualiza referencias en TODO el proyecto (otros equipos pueden referenciar por nombre)
-    for b in project.bays.values():
-        for d in b.devices.values():
-            for e in d.outputs:
-                e.text = _replace_after_keyword(e.text, " hacia ", old_name, new_name)
-            for e in d.inputs:
-                e.text = _replace_after_keyword(e.text, " desde ", old_name, new_name)
+    # 2) actualiza referencias en TODO el proyecto (otros equipos pueden referenciar por nombre).
+    # El índice inverso por bahía limita el recorrido a los equipos que realmente lo nombran.
+    affected = {bay_id}
+    for b, d in find_referencing_devices(project, old_name):
+        changed = False
+        for e in d.outputs:
+            t = _replace_after_keyword(e.text, " hacia ", old_name, new_name)
+            if t != e.text:
+                e.text = t
+                changed = True
+                emit(project, EndpointChanged(b.bay_id, d.device_id, e.signal_id, e.direction))
+        for e in d.inputs:
+            t = _replace_after_keyword(e.text, " desde ", old_name, new_name)
+            if t != e.text:
+                e.text = t
+                changed = True
+                emit(project, EndpointChanged(b.bay_id, d.device_id, e.signal_id, e.direction))
+        if changed:
+            touch_devices(b, [d.device_id])
+            affected.add(b.bay_id)
+    return affected
 
 
+@traced(touched=lambda *_a, **_k: 1)
 def rename_bay(project, *, bay_id: str, new_name: str) -> None:
     bay = project.bays.get(bay_id)
     if not bay:
@@ -59,4 +87,6 @@ def rename_bay(project, *, bay_id: str, new_name: str) -> None:
     new_name = (new_name or "").strip()
     if not new_name:
         raise ValueError("Nombre de bahía vacío.")
-    bay.name = new_name
+    if new_name != bay.name:
+        bay.name = new_name
+        emit(project, BayRenamed(bay_id))
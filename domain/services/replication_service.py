@@ -1,7 +1,10 @@
 from __future__ import annotations
 from copy import deepcopy
 import re
+from diagnostics.tracing import traced
+from domain.events import BayAdded, emit
 from domain.models import Bay, Device, Signal, SignalEnd, CanvasLayout
+from domain.services.name_index_service import name_index_for
 
 def _unique_bay_id(project, base: str) -> str:
     if base not in project.bays:
@@ -40,6 +43,7 @@ def _replace_token(text: str, src_token: str, dst_token: str) -> str:
     # replace case-insensitive, preserving dst token exactly as typed
     return re.sub(re.escape(src_token), dst_token, text, flags=re.IGNORECASE)
 
+@traced(touched=lambda new_bay_id, project, *_a, **_k: len(project.bays[new_bay_id].devices))
 def replicate_bay(
     project,
     src_bay_id: str,
@@ -93,12 +97,21 @@ def replicate_bay(
         if src_layout and dev.device_id in src_layout.device_positions:
             p = src_layout.device_positions[dev.device_id]
             project.canvases[new_bay_id].device_positions[new_id] = {"x": float(p.get("x", 200.0)+dx), "y": float(p.get("y", 200.0)+dy)}
-        else:
-            project.canvases[new_bay_id].device_positions[new_id] = {"x": 240.0, "y": 220.0}
+        # sin posición en el origen: queda sin posición y la ubica el layout automático al abrir
 
-    if not copy_signals:
-        return new_bay_id
+    if copy_signals:
+        _copy_signals(
+            project, src, dst, id_map, name_map,
+            src_token=src_token, dst_token=dst_token, apply_to_external=apply_to_external,
+        )
+
+    # índice de referencias 'hacia/desde' de la bahía nueva (para renombres posteriores)
+    name_index_for(dst)
+    emit(project, BayAdded(new_bay_id))
+    return new_bay_id
 
+def _copy_signals(project, src, dst, id_map, name_map, *, src_token: str, dst_token: str, apply_to_external: bool) -> None:
+    """Copia señales y extremos de `src` a los equipos ya replicados en `dst`."""
     def rewrite_endpoint(text: str) -> tuple[str, str|None]:
         """Reescribe el texto del chip para la bahía replicada.
 
@@ -150,7 +163,7 @@ def replicate_bay(
         if old_signal_id in signal_id_map:
             return signal_id_map[old_signal_id]
 
-        sid = generate_unique_signal_id(project, new_bay_id)
+        sid = generate_unique_signal_id(project, dst.bay_id)
         signal_id_map[old_signal_id] = sid
 
         old_sig = src.signals.get(old_signal_id)
@@ -193,8 +206,6 @@ def replicate_bay(
                 )
             )
 
-    return new_bay_id
-
 def _infer_name_from_text(text: str) -> str:
     if " hacia " in text:
         return text.split(" hacia ", 1)[0].strip()
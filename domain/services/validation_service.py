@@ -1,39 +1,583 @@
 from __future__ import annotations
 
-def validate_signal(bay, signal_id: str):
-    ins, outs = [], []
-    for dev in bay.devices.values():
-        ins += [e for e in dev.inputs if e.signal_id == signal_id]
-        outs += [e for e in dev.outputs if e.signal_id == signal_id]
+from dataclasses import dataclass, field
+from typing import Callable, Dict, Iterable, List, Optional, Set, Tuple
+
+from diagnostics.tracing import traced
+from domain.services.name_index_service import KEYWORD_IN, KEYWORD_OUT, referenced_name
+
+# (direction, status, text, orden) por extremo; orden = posición dentro de la lista del equipo
+_End = Tuple[str, str, str, int]
+
+
+@dataclass(frozen=True)
+class ValidationIssue:
+    """Observación de validación estructurada.
+
+    kind: PENDING | NO_IN | NO_OUT | DUP_IN | DUP_OUT
+          | CROSS_MULTI_OUT | CROSS_OUT_TEXT | CROSS_IN_TEXT | CROSS_IN_PENDING | CROSS_SIGNAL
+    message: texto listo para mostrar (mismo formato que validate_bay).
+    """
+
+    level: str
+    kind: str
+    message: str
+    bay_id: str
+    signal_id: str
+    device_id: Optional[str] = None
+    direction: Optional[str] = None
+    text: str = ""
+
+    def as_tuple(self) -> Tuple[str, str]:
+        return (self.level, self.message)
+
+
+def _signal_issues(
+    bay_id: str,
+    signal_id: str,
+    ends_by_device: Dict[str, List[_End]],
+    device_names: Dict[str, str],
+    *,
+    prefix: bool = True,
+    ext_ins: int = 0,
+    ext_outs: int = 0,
+) -> Tuple[List[Tuple[str, int, ValidationIssue]], List[ValidationIssue]]:
+    """Calcula (pendientes, observaciones de señal) para un SignalID.
+
+    ends_by_device: device_id -> extremos de ESTA señal en ese equipo.
+    ext_ins/ext_outs: extremos de la misma señal en OTRAS bahías (validación de proyecto).
+    Los pendientes se retornan como (device_id, orden, issue) para poder ordenarlos.
+    """
+    pending: List[Tuple[str, int, ValidationIssue]] = []
+    ins = 0
+    outs: List[str] = []
+    dups: List[ValidationIssue] = []
+    tag = f"{signal_id}: " if prefix else ""
+
+    for dev_id, ends in ends_by_device.items():
+        dev_name = device_names.get(dev_id, dev_id)
+        n_in = 0
+        n_out = 0
+        for direction, status, text, order in ends:
+            if direction == "IN":
+                n_in += 1
+            else:
+                n_out += 1
+                outs.append(status)
+            if status == "PENDING":
+                pending.append((dev_id, order, ValidationIssue(
+                    "WARNING", "PENDING", f"Pendiente: {dev_name} ({direction}) -> {text}",
+                    bay_id, signal_id, dev_id, direction, text,
+                )))
+        ins += n_in
+        if n_in > 1:
+            dups.append(ValidationIssue(
+                "ERROR", "DUP_IN", f"{tag}Duplicado en entradas de {dev_name}", bay_id, signal_id, dev_id, "IN",
+            ))
+        if n_out > 1:
+            dups.append(ValidationIssue(
+                "ERROR", "DUP_OUT", f"{tag}Duplicado en salidas de {dev_name}", bay_id, signal_id, dev_id, "OUT",
+            ))
+
+    issues: List[ValidationIssue] = []
+    if outs and not ins and not ext_ins:
+        if all(s == "PENDING" for s in outs):
+            msg = "Salida pendiente sin entrada espejo (aún no reconocida)"
+        else:
+            msg = "Salida sin entrada asociada"
+        issues.append(ValidationIssue("WARNING", "NO_IN", f"{tag}{msg}", bay_id, signal_id, direction="OUT"))
+    if ins and not outs and not ext_outs:
+        issues.append(ValidationIssue(
+            "ERROR", "NO_OUT", f"{tag}Entrada sin salida asociada (inconsistencia)", bay_id, signal_id, direction="IN",
+        ))
+    issues.extend(dups)
+    return pending, issues
+
+
+def _scan_device(dev) -> Dict[str, List[_End]]:
+    ends: Dict[str, List[_End]] = {}
+    for i, e in enumerate(dev.inputs):
+        ends.setdefault(e.signal_id, []).append(("IN", getattr(e, "status", "CONFIRMED"), e.text, i))
+    base = len(dev.inputs)
+    for i, e in enumerate(dev.outputs):
+        ends.setdefault(e.signal_id, []).append(("OUT", getattr(e, "status", "CONFIRMED"), e.text, base + i))
+    return ends
+
+
+class BayValidator:
+    """Motor de validación incremental para una bahía.
 
-    issues = []
-    if outs and not ins:
-        if all(getattr(o, "status", "CONFIRMED") == "PENDING" for o in outs):
-            issues.append(("WARNING", "Salida pendiente sin entrada espejo (aún no reconocida)"))
+    - `rebuild()` recorre los extremos UNA vez y agrupa por SignalID.
+    - Los resultados se guardan por señal; `invalidate()` re-escanea sólo los equipos
+      indicados (o los que contienen las señales indicadas) y re-valida sólo las señales
+      afectadas.
+    """
+
+    def __init__(self, bay):
+        self.bay = bay
+        self._ends: Dict[str, Dict[str, List[_End]]] = {}      # device_id -> signal_id -> extremos
+        self._devs_by_signal: Dict[str, Set[str]] = {}          # signal_id -> device_ids
+        self._dev_names: Dict[str, str] = {}
+        self._dev_order: Dict[str, int] = {}
+        self._pending: Dict[str, List[Tuple[str, int, ValidationIssue]]] = {}
+        self._issues: Dict[str, List[ValidationIssue]] = {}
+        self._dirty: Set[str] = set()
+        self.rebuild()
+
+    # ---------------- Mantención ----------------
+    @traced(touched=lambda _r, v: len(v.bay.devices))
+    def rebuild(self) -> None:
+        self._ends.clear()
+        self._devs_by_signal.clear()
+        self._dev_names.clear()
+        self._dev_order.clear()
+        self._pending.clear()
+        self._issues.clear()
+        for dev in self.bay.devices.values():
+            self._add_device(dev)
+        self._dirty = set(self._devs_by_signal.keys())
+
+    @traced(touched=lambda dirty, *_a, **_k: len(dirty))
+    def invalidate(self, *, signal_ids: Iterable[str] = (), device_ids: Iterable[str] = ()) -> Set[str]:
+        """Marca cambios del modelo. Retorna las señales que quedarán re-validadas."""
+        devs = set(device_ids)
+        sids = set(signal_ids)
+        for sid in sids:
+            devs.update(self._devs_by_signal.get(sid, ()))
+        for dev_id in devs:
+            sids.update(self._remove_device(dev_id))
+            dev = self.bay.devices.get(dev_id)
+            if dev is not None:
+                sids.update(self._add_device(dev))
+        self._dirty.update(sids)
+        return sids
+
+    def _add_device(self, dev) -> Set[str]:
+        ends = _scan_device(dev)
+        self._ends[dev.device_id] = ends
+        self._dev_names[dev.device_id] = dev.name
+        if dev.device_id not in self._dev_order:
+            self._dev_order[dev.device_id] = len(self._dev_order)
+        for sid in ends:
+            self._devs_by_signal.setdefault(sid, set()).add(dev.device_id)
+        return set(ends.keys())
+
+    def _remove_device(self, dev_id: str) -> Set[str]:
+        ends = self._ends.pop(dev_id, {})
+        self._dev_names.pop(dev_id, None)
+        for sid in ends:
+            devs = self._devs_by_signal.get(sid)
+            if devs is not None:
+                devs.discard(dev_id)
+                if not devs:
+                    del self._devs_by_signal[sid]
+        return set(ends.keys())
+
+    def _flush(self) -> None:
+        if not self._dirty:
+            return
+        dirty, self._dirty = self._dirty, set()
+        for sid in dirty:
+            devs = self._devs_by_signal.get(sid)
+            if not devs:
+                self._pending.pop(sid, None)
+                self._issues.pop(sid, None)
+                continue
+            ends_by_device = {d: self._ends[d][sid] for d in sorted(devs, key=self._dev_order.__getitem__)}
+            pending, issues = _signal_issues(self.bay.bay_id, sid, ends_by_device, self._dev_names)
+            self._pending[sid] = pending
+            self._issues[sid] = issues
+
+    # ---------------- Consultas ----------------
+    def signal_issues(self, signal_id: str) -> List[ValidationIssue]:
+        self._flush()
+        return [i for _d, _o, i in self._pending.get(signal_id, [])] + self._issues.get(signal_id, [])
+
+    def issues(self, extra: Optional[Callable[[str], List[ValidationIssue]]] = None) -> List[ValidationIssue]:
+        """Todas las observaciones: pendientes (orden de equipos) y luego por SignalID.
+        `extra(signal_id)` agrega las de otra fuente tras las de cada señal (chequeos entre bahías)."""
+        self._flush()
+        pending = [p for lst in self._pending.values() for p in lst]
+        pending.sort(key=lambda p: (self._dev_order.get(p[0], 0), p[1]))
+        out = [i for _d, _o, i in pending]
+        for sid in sorted(self._issues):
+            out.extend(self._issues[sid])
+            if extra is not None:
+                out.extend(extra(sid))
+        return out
+
+    def signal_ids(self):
+        """SignalIDs con extremos en la bahía (vista, sin copiar)."""
+        return self._devs_by_signal.keys()
+
+    def signal_ends(self, signal_id: str) -> List[Tuple[str, str, str, str, str]]:
+        """(device_id, nombre, dirección, estado, texto) de los extremos de la señal, en orden de equipos."""
+        devs = sorted(self._devs_by_signal.get(signal_id, ()), key=self._dev_order.__getitem__)
+        return [
+            (dev_id, self._dev_names.get(dev_id, dev_id), direction, status, text)
+            for dev_id in devs for direction, status, text, _o in self._ends[dev_id][signal_id]
+        ]
+
+    def direction_counts(self, signal_id: str) -> Tuple[int, int]:
+        """(#IN, #OUT) de la señal en esta bahía."""
+        n_in = n_out = 0
+        for dev_id in self._devs_by_signal.get(signal_id, ()):
+            for direction, _s, _t, _o in self._ends[dev_id][signal_id]:
+                if direction == "IN":
+                    n_in += 1
+                else:
+                    n_out += 1
+        return n_in, n_out
+
+
+class ProjectValidator:
+    """Validación en vivo del proyecto: un BayValidator por bahía.
+
+    Las observaciones 'sin entrada/salida asociada' se descartan cuando el extremo faltante
+    existe en otra bahía (enlace reconocido entre bahías); para esas señales se agregan los
+    mismos chequeos entre bahías que `validate_project` (textos 'hacia/desde', entrada espejo
+    pendiente, definición distinta). Un índice señal -> bahías se mantiene con cada invalidación.
+    """
+
+    def __init__(self, project):
+        self.project = project
+        self._bays: Dict[str, BayValidator] = {
+            bay_id: BayValidator(bay) for bay_id, bay in project.bays.items()
+        }
+        self._signal_bays: Dict[str, Set[str]] = {}
+        for bay_id, v in self._bays.items():
+            self._reindex(bay_id, v.signal_ids())
+
+    def invalidate(self, bay_id: str, *, signal_ids: Iterable[str] = (), device_ids: Iterable[str] = ()) -> Set[str]:
+        """Re-valida sólo lo indicado de la bahía (completa si la bahía es nueva o fue
+        reemplazada). Retorna las señales re-validadas."""
+        v = self._bays.get(bay_id)
+        if v is None or v.bay is not self.project.bays.get(bay_id):
+            sids = set(v.signal_ids()) if v is not None else set()
+            v = self._sync_bay(bay_id)
+            if v is not None:
+                sids.update(v.signal_ids())
         else:
-            issues.append(("WARNING", "Salida sin entrada asociada"))
-    if ins and not outs:
-        issues.append(("ERROR", "Entrada sin salida asociada (inconsistencia)"))
+            sids = v.invalidate(signal_ids=signal_ids, device_ids=device_ids)
+        self._reindex(bay_id, sids)
+        return sids
+
+    def invalidate_bays(self, bay_ids: Optional[Iterable[str]] = None) -> Set[str]:
+        """Re-escanea bahías completas (todas si bay_ids es None o vacío). Retorna sus señales."""
+        bay_ids = set(bay_ids or ()) or set(self.project.bays) | set(self._bays)
+        sids: Set[str] = set()
+        for bay_id in bay_ids:
+            old = self._bays.get(bay_id)
+            bay_sids = set(old.signal_ids()) if old is not None else set()
+            v = self._sync_bay(bay_id)
+            if v is not None:
+                v.rebuild()
+                bay_sids.update(v.signal_ids())
+            self._reindex(bay_id, bay_sids)
+            sids |= bay_sids
+        return sids
+
+    def _sync_bay(self, bay_id: str) -> Optional[BayValidator]:
+        bay = self.project.bays.get(bay_id)
+        if bay is None:
+            self._bays.pop(bay_id, None)
+            return None
+        v = self._bays.get(bay_id)
+        if v is None or v.bay is not bay:
+            v = self._bays[bay_id] = BayValidator(bay)
+        return v
+
+    def _reindex(self, bay_id: str, signal_ids: Iterable[str]) -> None:
+        """Actualiza el índice señal -> bahías para esas señales de la bahía."""
+        v = self._bays.get(bay_id)
+        present = v.signal_ids() if v is not None else ()
+        for sid in signal_ids:
+            if sid in present:
+                self._signal_bays.setdefault(sid, set()).add(bay_id)
+                continue
+            bays = self._signal_bays.get(sid)
+            if bays is not None:
+                bays.discard(bay_id)
+                if not bays:
+                    del self._signal_bays[sid]
 
+    @traced()
+    def bay_issues(self, bay_id: str) -> List[ValidationIssue]:
+        v = self._bays.get(bay_id)
+        if v is None:
+            return []
+        order = {b: i for i, b in enumerate(self.project.bays)}
+        out = []
+        for issue in v.issues(extra=lambda sid: self._cross_issues(bay_id, sid, order)):
+            if issue.kind in ("NO_IN", "NO_OUT") and self._linked_elsewhere(bay_id, issue):
+                continue
+            out.append(issue)
+        return out
+
+    def issues(self) -> List[ValidationIssue]:
+        out: List[ValidationIssue] = []
+        for bay_id in self.project.bays:
+            out.extend(self.bay_issues(bay_id))
+        return out
+
+    def signals_of(self, bay_id: str) -> Set[str]:
+        v = self._bays.get(bay_id)
+        return set(v.signal_ids()) if v is not None else set()
+
+    def bays_with_signals(self, signal_ids: Iterable[str]) -> Set[str]:
+        """Bahías que tienen extremos de alguna de las señales (sus observaciones 'sin
+        entrada/salida' y entre bahías dependen de los extremos de esas señales en las demás)."""
+        out: Set[str] = set()
+        for sid in signal_ids:
+            out.update(self._signal_bays.get(sid, ()))
+        return out
+
+    def _linked_elsewhere(self, bay_id: str, issue: ValidationIssue) -> bool:
+        want = 0 if issue.kind == "NO_IN" else 1
+        for other_id in self._signal_bays.get(issue.signal_id, ()):
+            if other_id != bay_id and self._bays[other_id].direction_counts(issue.signal_id)[want] > 0:
+                return True
+        return False
+
+    def _cross_issues(self, bay_id: str, sid: str, order: Dict[str, int]) -> List[ValidationIssue]:
+        owners = self._signal_bays.get(sid, ())
+        if len(owners) < 2:
+            return []
+        outs_by_bay: Dict[str, List[_CrossEnd]] = {}
+        ins_by_bay: Dict[str, List[_CrossEnd]] = {}
+        defs: Dict[str, Tuple[str, str]] = {}
+        # orden del proyecto, igual que la validación completa
+        for other_id in sorted(owners, key=order.__getitem__):
+            v = self._bays[other_id]
+            sig = v.bay.signals.get(sid)
+            if sig is not None:
+                defs[other_id] = (sig.name, sig.nature)
+            for dev_id, dev_name, direction, status, text in v.signal_ends(sid):
+                target = ins_by_bay if direction == "IN" else outs_by_bay
+                target.setdefault(other_id, []).append((other_id, dev_id, dev_name, status, text))
+        if bay_id not in outs_by_bay:
+            return []
+        bay_names = {b: self._bays[b].bay.name for b in owners}
+        return _cross_bay_issues(bay_id, sid, defs.get(bay_id), outs_by_bay, ins_by_bay, defs, bay_names)
+
+
+@traced(touched=lambda *_a, **_k: 1)
+def validate_signal(bay, signal_id: str):
+    ends_by_device: Dict[str, List[_End]] = {}
+    names: Dict[str, str] = {}
     for dev in bay.devices.values():
-        di = [e.signal_id for e in dev.inputs]
-        do = [e.signal_id for e in dev.outputs]
-        if len(di) != len(set(di)):
-            issues.append(("ERROR", f"Duplicado en entradas de {dev.name}"))
-        if len(do) != len(set(do)):
-            issues.append(("ERROR", f"Duplicado en salidas de {dev.name}"))
-    return issues
+        ends = [("IN", getattr(e, "status", "CONFIRMED"), e.text, i)
+                for i, e in enumerate(dev.inputs) if e.signal_id == signal_id]
+        ends += [("OUT", getattr(e, "status", "CONFIRMED"), e.text, len(dev.inputs) + i)
+                 for i, e in enumerate(dev.outputs) if e.signal_id == signal_id]
+        if ends:
+            ends_by_device[dev.device_id] = ends
+            names[dev.device_id] = dev.name
+    _pending, issues = _signal_issues(bay.bay_id, signal_id, ends_by_device, names, prefix=False)
+    return [i.as_tuple() for i in issues]
+
 
+@traced()
 def validate_bay(bay):
-    issues = []
-    for dev in bay.devices.values():
-        for e in dev.inputs + dev.outputs:
-            if getattr(e, "status", "CONFIRMED") == "PENDING":
-                issues.append(("WARNING", f"Pendiente: {dev.name} ({e.direction}) -> {e.text}"))
-    signal_ids=set()
+    return [i.as_tuple() for i in BayValidator(bay).issues()]
+
+
+# ---------------- Validación de proyecto (multi-bahía) ----------------
+@dataclass
+class BaySnapshot:
+    """Copia inmutable (strings/tuplas) de una bahía, apta para procesarse fuera del hilo GUI."""
+
+    bay_id: str
+    name: str
+    signals: Dict[str, Tuple[str, str]] = field(default_factory=dict)   # signal_id -> (name, nature)
+    device_names: Dict[str, str] = field(default_factory=dict)
+    ends: Dict[str, Dict[str, List[_End]]] = field(default_factory=dict)  # device_id -> signal_id -> extremos
+
+
+@traced(touched=lambda _r, bay: len(bay.devices))
+def snapshot_bay(bay) -> BaySnapshot:
+    """Copia de la bahía. Debe tomarse en el hilo que modifica el modelo (hilo GUI)."""
+    snap = BaySnapshot(bay_id=bay.bay_id, name=bay.name)
+    for sid, sig in bay.signals.items():
+        snap.signals[sid] = (sig.name, sig.nature)
     for dev in bay.devices.values():
-        for e in dev.inputs + dev.outputs:
-            signal_ids.add(e.signal_id)
-    for sid in sorted(signal_ids):
-        issues.extend([(lvl, f"{sid}: {msg}") for (lvl,msg) in validate_signal(bay, sid)])
+        snap.device_names[dev.device_id] = dev.name
+        snap.ends[dev.device_id] = _scan_device(dev)
+    return snap
+
+
+def snapshot_project(project) -> List[BaySnapshot]:
+    """Copias de todas las bahías, en el orden del proyecto (entrada de `validate_project`)."""
+    return [snapshot_bay(bay) for bay in project.bays.values()]
+
+
+# (bay_id, device_id, device_name, status, text)
+_CrossEnd = Tuple[str, str, str, str, str]
+
+
+def _cross_bay_issues(
+    bay_id: str,
+    sid: str,
+    mine: Optional[Tuple[str, str]],
+    outs_by_bay: Dict[str, List[_CrossEnd]],
+    ins_by_bay: Dict[str, List[_CrossEnd]],
+    signal_defs: Dict[str, Tuple[str, str]],
+    bay_names: Dict[str, str],
+) -> List[ValidationIssue]:
+    """Consistencia IN/OUT de una señal que cruza bahías, evaluada desde la bahía de la salida.
+
+    Los nombres referenciados se comparan por prefijo (igual que el renombre de equipos),
+    de modo que 'hacia 52H1 (CB1)' se considera coherente con el equipo '52H1'.
+    """
+    issues: List[ValidationIssue] = []
+    my_outs = outs_by_bay.get(bay_id, [])
+    other_ins = [x for b, lst in ins_by_bay.items() if b != bay_id for x in lst]
+
+    out_bays = sorted(outs_by_bay)
+    if len(out_bays) > 1 and out_bays[0] == bay_id:
+        issues.append(ValidationIssue(
+            "ERROR", "CROSS_MULTI_OUT",
+            f"{sid}: Salida presente en varias bahías ({', '.join(bay_names.get(b, b) for b in out_bays)})",
+            bay_id, sid, direction="OUT",
+        ))
+
+    in_names = {x[2] for lst in ins_by_bay.values() for x in lst}
+    out_names = {x[2] for lst in outs_by_bay.values() for x in lst}
+    for _b, dev_id, dev_name, status, text in my_outs:
+        if status == "PENDING" or not other_ins:
+            continue
+        ref = referenced_name(text, KEYWORD_OUT)
+        if ref and not any(ref.startswith(n) for n in in_names):
+            issues.append(ValidationIssue(
+                "WARNING", "CROSS_OUT_TEXT",
+                f"{sid}: Salida de {dev_name} indica 'hacia {ref}' pero la entrada está en {', '.join(sorted(in_names))}",
+                bay_id, sid, dev_id, "OUT", text,
+            ))
+
+    confirmed_out = any(x[3] != "PENDING" for x in my_outs)
+    for in_bay, dev_id, dev_name, status, text in other_ins:
+        if status == "PENDING" and confirmed_out:
+            issues.append(ValidationIssue(
+                "WARNING", "CROSS_IN_PENDING",
+                f"{sid}: Entrada en {dev_name} ({bay_names.get(in_bay, in_bay)}) sigue pendiente aunque la salida está confirmada",
+                bay_id, sid, dev_id, "IN", text,
+            ))
+        ref = referenced_name(text, KEYWORD_IN)
+        if ref and not any(ref.startswith(n) for n in out_names):
+            issues.append(ValidationIssue(
+                "WARNING", "CROSS_IN_TEXT",
+                f"{sid}: Entrada en {dev_name} ({bay_names.get(in_bay, in_bay)}) indica 'desde {ref}' "
+                f"pero la salida está en {', '.join(sorted(out_names))}",
+                bay_id, sid, dev_id, "IN", text,
+            ))
+
+    for other_bay, other in signal_defs.items():
+        if other_bay == bay_id or mine is None or other == mine:
+            continue
+        issues.append(ValidationIssue(
+            "WARNING", "CROSS_SIGNAL",
+            f"{sid}: Definición distinta en {bay_names.get(other_bay, other_bay)} "
+            f"(nombre/naturaleza: {other[0]}/{other[1]} vs {mine[0]}/{mine[1]})",
+            bay_id, sid,
+        ))
     return issues
+
+
+def _validate_bay_snapshot(
+    snap: BaySnapshot,
+    cross: Dict[str, Tuple[Dict[str, List[_CrossEnd]], Dict[str, List[_CrossEnd]], Dict[str, Tuple[str, str]]]],
+    bay_names: Dict[str, str],
+    is_cancelled: Callable[[], bool],
+) -> List[ValidationIssue]:
+    by_signal: Dict[str, Dict[str, List[_End]]] = {}
+    for dev_id, ends in snap.ends.items():
+        for sid, lst in ends.items():
+            by_signal.setdefault(sid, {})[dev_id] = lst
+
+    pending_all: List[Tuple[int, int, ValidationIssue]] = []
+    issues: List[ValidationIssue] = []
+    dev_order = {d: i for i, d in enumerate(snap.ends)}
+    for n, sid in enumerate(sorted(by_signal)):
+        if n % 256 == 0 and is_cancelled():
+            return []
+        ext_ins = ext_outs = 0
+        info = cross.get(sid)
+        if info is not None:
+            outs_by_bay, ins_by_bay, _defs = info
+            ext_ins = sum(len(v) for b, v in ins_by_bay.items() if b != snap.bay_id)
+            ext_outs = sum(len(v) for b, v in outs_by_bay.items() if b != snap.bay_id)
+        pending, sig_issues = _signal_issues(
+            snap.bay_id, sid, by_signal[sid], snap.device_names, ext_ins=ext_ins, ext_outs=ext_outs,
+        )
+        pending_all.extend((dev_order[d], o, i) for d, o, i in pending)
+        issues.extend(sig_issues)
+        if info is not None and snap.bay_id in info[0]:
+            issues.extend(_cross_bay_issues(snap.bay_id, sid, snap.signals.get(sid), *info, bay_names))
+    pending_all.sort(key=lambda p: (p[0], p[1]))
+    return [i for _d, _o, i in pending_all] + issues
+
+
+def _cross_index(snaps: Iterable[BaySnapshot]) -> Dict[str, tuple]:
+    """signal_id -> (salidas por bahía, entradas por bahía, definiciones por bahía), sólo para
+    las señales con extremos en más de una bahía."""
+    bays_by_signal: Dict[str, List[BaySnapshot]] = {}
+    for snap in snaps:
+        sids: Set[str] = set()
+        for ends in snap.ends.values():
+            sids.update(ends.keys())
+        for sid in sids:
+            bays_by_signal.setdefault(sid, []).append(snap)
+
+    cross = {}
+    for sid, owners in bays_by_signal.items():
+        if len(owners) < 2:
+            continue
+        outs_by_bay: Dict[str, List[_CrossEnd]] = {}
+        ins_by_bay: Dict[str, List[_CrossEnd]] = {}
+        defs: Dict[str, Tuple[str, str]] = {}
+        for snap in owners:
+            if sid in snap.signals:
+                defs[snap.bay_id] = snap.signals[sid]
+            for dev_id, ends in snap.ends.items():
+                for direction, status, text, _o in ends.get(sid, ()):
+                    target = ins_by_bay if direction == "IN" else outs_by_bay
+                    target.setdefault(snap.bay_id, []).append(
+                        (snap.bay_id, dev_id, snap.device_names.get(dev_id, dev_id), status, text)
+                    )
+        cross[sid] = (outs_by_bay, ins_by_bay, defs)
+    return cross
+
+
+@traced(touched=lambda _r, snaps, **_k: len(snaps))
+def validate_project(
+    snaps: List[BaySnapshot],
+    *,
+    on_bay_issues: Optional[Callable[[str, List[ValidationIssue]], None]] = None,
+    is_cancelled: Optional[Callable[[], bool]] = None,
+) -> List[ValidationIssue]:
+    """Valida todas las bahías del proyecto, incluyendo consistencia IN/OUT entre bahías.
+
+    Recibe las copias de `snapshot_project` (tomadas en el hilo GUI) y no lee el modelo, por lo
+    que puede ejecutarse en un hilo de trabajo. Las bahías se validan una tras otra: el trabajo
+    es Python puro y un pool de hilos sólo competiría por el GIL (también con el hilo GUI).
+    - `on_bay_issues(bay_id, issues)` se llama a medida que cada bahía termina;
+    - `is_cancelled()` se consulta periódicamente; si retorna True se corta y se retorna lo acumulado.
+
+    Una señal que sale de una bahía y entra en otra (reconocimiento entre bahías) NO se reporta
+    como "sin entrada/salida asociada"; en su lugar se verifican los textos 'hacia/desde', el estado
+    de la entrada espejo y que la definición de la señal coincida en ambas bahías.
+    """
+    is_cancelled = is_cancelled or (lambda: False)
+    results: List[ValidationIssue] = []
+    cross = _cross_index(snaps)
+    bay_names = {snap.bay_id: snap.name for snap in snaps}
+    for snap in snaps:
+        if is_cancelled():
+            return results
+        issues = _validate_bay_snapshot(snap, cross, bay_names, is_cancelled)
+        if is_cancelled():
+            return results
+        results.extend(issues)
+        if on_bay_issues:
+            on_bay_issues(snap.bay_id, issues)
+    return results
@@ -3,7 +3,7 @@ from __future__ import annotations
 from openpyxl import Workbook
 from openpyxl.styles import Font, Alignment
 
-from domain.services.pending_service import count_pending_for_bay, count_pending_for_device
+from domain.services.pending_service import count_pending_by_device, count_pending_for_project
 from domain.services.interlock_service import interlock_tags
 
 
@@ -107,8 +107,9 @@ def _build_summary_sheet(ws, project) -> None:
     for c in range(1, 6):
         ws.cell(row=ws.max_row, column=c).font = Font(bold=True)
 
+    by_bay = count_pending_for_project(project)
     for bay_id, bay in project.bays.items():
-        counts = count_pending_for_bay(bay)
+        counts = by_bay[bay_id]
         ws.append([bay.name or bay_id, counts["total_pending"], counts["out_pending"], counts["in_pending"], len(bay.devices)])
 
     ws.append([])
@@ -118,8 +119,9 @@ def _build_summary_sheet(ws, project) -> None:
         ws.cell(row=ws.max_row, column=c).font = Font(bold=True)
 
     for bay_id, bay in project.bays.items():
+        by_dev = count_pending_by_device(bay)
         for dev in bay.devices.values():
-            pc = count_pending_for_device(dev)
+            pc = by_dev[dev.device_id]
             ws.append(
                 [
                     bay.name or bay_id,
@@ -128,8 +130,8 @@ def _build_summary_sheet(ws, project) -> None:
                     pc["total_pending"],
                     pc["out_pending"],
                     pc["in_pending"],
-                    len(dev.inputs),
-                    len(dev.outputs),
+                    pc["total_in"],
+                    pc["total_out"],
                 ]
             )
 
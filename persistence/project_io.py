@@ -2,10 +2,16 @@ from __future__ import annotations
 
 import json
 
+from diagnostics.tracing import traced
 from domain.models import Project, Bay, Device, Signal, SignalEnd, CanvasLayout, SignalTemplate
 from domain.services.interlock_service import normalize_interlocks, serialize_interlocks
 
 
+def _endpoint_count(project) -> int:
+    return sum(len(d.inputs) + len(d.outputs) for b in project.bays.values() for d in b.devices.values())
+
+
+@traced(touched=lambda project, *_a, **_k: _endpoint_count(project))
 def load_project(path: str) -> Project:
     with open(path, "r", encoding="utf-8") as f:
         data = json.load(f)
@@ -94,6 +100,7 @@ def load_project(path: str) -> Project:
     return project
 
 
+@traced(touched=lambda _r, project, *_a, **_k: _endpoint_count(project))
 def save_project(project: Project, path: str) -> None:
     out = {
         "meta": {"schema_version": project.schema_version, "name": project.name},
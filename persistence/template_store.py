@@ -1,13 +1,31 @@
 from __future__ import annotations
 
+import atexit
 import json
 import os
-from dataclasses import asdict
+import tempfile
+import threading
+import time
+import uuid
+from dataclasses import asdict, replace
 
 from domain.models import SignalTemplate
 
 FILENAME = "template_library.json"
 
+# Caché de proceso: path -> (mtime_ns, size, plantillas). Se relee sólo si el archivo cambió
+# (p.ej. lo guardó otra instancia de la app).
+_cache: dict[str, tuple[int, int, tuple[SignalTemplate, ...]]] = {}
+_cache_lock = threading.Lock()
+
+# Guardados agrupados: path -> plantillas sin escribir. Quien agrupa decide cuándo escribirlas
+# (`flush_pending_saves`, p. ej. desde un QTimer del hilo GUI) y así recibe los errores.
+SAVE_DELAY_S = 0.5
+_pending_saves: dict[str, list[SignalTemplate]] = {}
+
+LOCK_TIMEOUT_S = 5.0
+LOCK_STALE_S = 30.0
+
 
 def _path(app_dir: str) -> str:
     return os.path.join(app_dir, FILENAME)
@@ -25,8 +43,40 @@ def _default_templates() -> list[SignalTemplate]:
     ]
 
 
+def _stat_key(path: str):
+    try:
+        st = os.stat(path)
+    except OSError:
+        return None
+    return st.st_mtime_ns, st.st_size
+
+
+def _copies(templates) -> list[SignalTemplate]:
+    # quien llama puede modificar la lista (dock, proyecto): nunca se entrega la del caché
+    return [replace(t) for t in templates]
+
+
 def load_global_templates(app_dir: str) -> list[SignalTemplate]:
     path = _path(app_dir)
+    with _cache_lock:
+        pending = _pending_saves.get(path)
+        if pending is not None:
+            # hay un guardado agrupado sin escribir: es la versión más nueva
+            return _copies(pending)
+        key = _stat_key(path)
+        cached = _cache.get(path)
+        if key is not None and cached is not None and cached[:2] == key:
+            return _copies(cached[2])
+
+    templates = _read_templates(app_dir, path)
+    key = _stat_key(path)
+    if key is not None:
+        with _cache_lock:
+            _cache[path] = (key[0], key[1], tuple(_copies(templates)))
+    return templates
+
+
+def _read_templates(app_dir: str, path: str) -> list[SignalTemplate]:
     if not os.path.exists(path):
         templates = _default_templates()
         save_global_templates(app_dir, templates)
@@ -59,8 +109,145 @@ def load_global_templates(app_dir: str) -> list[SignalTemplate]:
         return templates
 
 
-def save_global_templates(app_dir: str, templates: list[SignalTemplate]) -> None:
+def save_global_templates(app_dir: str, templates: list[SignalTemplate], *, coalesce: bool = False) -> None:
+    """Guarda la biblioteca global.
+
+    Con `coalesce=True` sólo se registra como pendiente (reemplaza al pendiente anterior):
+    varias ediciones seguidas = una escritura al llamar `flush_pending_saves()`, que quien
+    agrupa llama en su hilo (p. ej. el dock, `SAVE_DELAY_S` después de la última edición).
+    Los pendientes que queden se escriben al salir del proceso.
+    """
     path = _path(app_dir)
+    snapshot = _copies(templates)
+    with _cache_lock:
+        _pending_saves.pop(path, None)
+        if coalesce:
+            _pending_saves[path] = snapshot
+            return
+    _write_templates(path, snapshot)
+
+
+def flush_pending_saves() -> None:
+    """Escribe los guardados agrupados. Si una escritura falla, ese guardado sigue pendiente
+    (se reintenta en el próximo flush) y el primer error se relanza al terminar."""
+    error = None
+    for path in list(_pending_saves):
+        try:
+            _flush_one(path)
+        except OSError as e:
+            error = error or e
+    if error is not None:
+        raise error
+
+
+def _flush_one(path: str) -> None:
+    with _cache_lock:
+        pending = _pending_saves.pop(path, None)
+    if pending is None:
+        return
+    try:
+        _write_templates(path, pending)
+    except BaseException:
+        with _cache_lock:
+            # una edición posterior ya registró una versión más nueva: ésa gana
+            _pending_saves.setdefault(path, pending)
+        raise
+
+
+def _write_templates(path: str, templates: list[SignalTemplate]) -> None:
+    """Escritura atómica (archivo temporal en el mismo directorio + os.replace) bajo un
+    lock de archivo, para que varias instancias que comparten la biblioteca no la corrompan."""
     payload = {"templates": [asdict(t) for t in templates]}
-    with open(path, "w", encoding="utf-8") as f:
-        json.dump(payload, f, ensure_ascii=False, indent=2)
+    directory = os.path.dirname(os.path.abspath(path))
+    with _file_lock(path + ".lock"):
+        fd, tmp = tempfile.mkstemp(prefix=".template_library.", suffix=".tmp", dir=directory)
+        try:
+            with os.fdopen(fd, "w", encoding="utf-8") as f:
+                json.dump(payload, f, ensure_ascii=False, indent=2)
+                f.flush()
+                os.fsync(f.fileno())
+            os.replace(tmp, path)
+        except BaseException:
+            try:
+                os.unlink(tmp)
+            except OSError:
+                pass
+            raise
+        key = _stat_key(path)
+    if key is not None:
+        with _cache_lock:
+            _cache[path] = (key[0], key[1], tuple(templates))
+
+
+def _read_token(path: str) -> str | None:
+    try:
+        with open(path, "r", encoding="ascii", errors="replace") as f:
+            return f.read()
+    except OSError:
+        return None
+
+
+def _unlink(path: str) -> None:
+    try:
+        os.unlink(path)
+    except OSError:
+        pass
+
+
+class _file_lock:
+    """Lock entre procesos con un archivo creado en forma exclusiva (O_EXCL) que guarda el
+    token del dueño (pid + aleatorio). Un lock más antiguo que LOCK_STALE_S se considera
+    abandonado (proceso caído): se aparta con un rename atómico y sólo se descarta si es el
+    mismo lock que se vio viejo; si en medio otro proceso ya lo había reemplazado, el lock
+    apartado se devuelve a su lugar. Al salir se borra sólo si sigue siendo el propio."""
+
+    def __init__(self, lock_path: str):
+        self.lock_path = lock_path
+        self.token = f"{os.getpid()}.{uuid.uuid4().hex}"
+
+    def __enter__(self):
+        deadline = time.monotonic() + LOCK_TIMEOUT_S
+        while True:
+            try:
+                fd = os.open(self.lock_path, os.O_CREAT | os.O_EXCL | os.O_WRONLY)
+            except FileExistsError:
+                if self._break_stale():
+                    continue
+                if time.monotonic() > deadline:
+                    raise TimeoutError(f"No se pudo bloquear {self.lock_path} (¿otra instancia guardando?).")
+                time.sleep(0.05)
+                continue
+            with os.fdopen(fd, "w", encoding="ascii") as f:
+                f.write(self.token)
+            return self
+
+    def _break_stale(self) -> bool:
+        """True si el lock ya no está o se descartó por abandonado (conviene reintentar)."""
+        seen = _read_token(self.lock_path)
+        try:
+            if time.time() - os.path.getmtime(self.lock_path) <= LOCK_STALE_S:
+                return False
+        except OSError:
+            return True
+        aside = f"{self.lock_path}.{self.token}.stale"
+        try:
+            os.replace(self.lock_path, aside)
+        except OSError:
+            return True     # otro proceso lo apartó antes
+        if _read_token(aside) != seen:
+            # se apartó un lock nuevo (el viejo ya lo había roto otro): se devuelve si el lugar
+            # sigue libre
+            try:
+                os.link(aside, self.lock_path)
+            except OSError:
+                pass
+        _unlink(aside)
+        return True
+
+    def __exit__(self, *exc):
+        if _read_token(self.lock_path) == self.token:
+            _unlink(self.lock_path)
+        return False
+
+
+atexit.register(flush_pending_saves)
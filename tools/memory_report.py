@@ -0,0 +1,101 @@
+from __future__ import annotations
+import argparse
+import gc
+import sys
+import tracemalloc
+
+# uso: python -m tools.memory_report proyecto.json [--replicas N]
+# Carga el proyecto y replica cada bahía N veces (como "Replicar bahía": equipos renombrados,
+# textos reescritos, señales nuevas) para simular un proyecto más grande; reporta memoria
+# total y bytes por extremo (SignalEnd).
+
+
+def _instance_size(obj) -> int:
+    size = sys.getsizeof(obj)
+    d = getattr(obj, "__dict__", None)
+    if d is not None:
+        size += sys.getsizeof(d)
+    return size
+
+
+def _replicate(project, replicas: int) -> None:
+    from domain.services.replication_service import replicate_bay
+
+    for bay_id, bay in list(project.bays.items()):
+        for k in range(1, replicas + 1):
+            replicate_bay(project, bay_id, f"{bay_id}-R{k}", f"{bay.name} R{k}")
+    # índices derivados (nombres 'hacia/desde'): no son parte del modelo
+    for bay in project.bays.values():
+        bay.__dict__.pop("_name_index", None)
+
+
+def _count(project) -> dict:
+    c = {"bays": 0, "devices": 0, "endpoints": 0, "signals": 0}
+    for bay in project.bays.values():
+        c["bays"] += 1
+        c["signals"] += len(bay.signals)
+        for dev in bay.devices.values():
+            c["devices"] += 1
+            c["endpoints"] += len(dev.inputs) + len(dev.outputs)
+    return c
+
+
+def _distinct_strings(project) -> dict:
+    ids = {"status": set(), "direction": set(), "text": set()}
+    texts = set()
+    for bay in project.bays.values():
+        for dev in bay.devices.values():
+            for e in dev.inputs + dev.outputs:
+                ids["status"].add(id(e.status))
+                ids["direction"].add(id(e.direction))
+                ids["text"].add(id(e.text))
+                texts.add(e.text)
+    out = {k: len(v) for k, v in ids.items()}
+    out["text_values"] = len(texts)
+    return out
+
+
+def main(argv=None) -> int:
+    from domain.models import Device, InterlockItem, Signal, SignalEnd
+    from persistence.project_io import load_project
+
+    ap = argparse.ArgumentParser(description="Reporte de memoria del modelo de dominio.")
+    ap.add_argument("project", help="Proyecto JSON")
+    ap.add_argument("--replicas", type=int, default=0, help="Réplicas de cada bahía")
+    args = ap.parse_args(argv)
+
+    gc.collect()
+    tracemalloc.start()
+    base = tracemalloc.get_traced_memory()[0]
+    project = load_project(args.project)
+    _replicate(project, max(0, args.replicas))
+    gc.collect()
+    used = tracemalloc.get_traced_memory()[0] - base
+    tracemalloc.stop()
+
+    counts = _count(project)
+    n_end = max(1, counts["endpoints"])
+    print(f"Proyecto: {args.project}  (+{max(0, args.replicas)} réplicas por bahía)")
+    print("  bahías={bays}  equipos={devices}  señales={signals}  extremos={endpoints}".format(**counts))
+    print(f"  memoria modelo: {used / 1024 / 1024:.2f} MiB  ({used / n_end:.0f} B/extremo)")
+
+    print("Tamaño por instancia (sin contenido referenciado):")
+    samples = {
+        "Signal": Signal(signal_id="S", name="S"),
+        "SignalEnd": SignalEnd(signal_id="S", direction="IN", text="S desde X"),
+        "InterlockItem": InterlockItem(relay_tag="86T"),
+        "Device": Device(device_id="D", bay_id="B", name="D"),
+    }
+    for name, obj in samples.items():
+        slotted = "slots" if not hasattr(obj, "__dict__") else "__dict__"
+        print(f"  {name:<14} {_instance_size(obj):>4} B  ({slotted})")
+
+    d = _distinct_strings(project)
+    print("Objetos str distintos en extremos:")
+    print(f"  status={d['status']}  direction={d['direction']}  "
+          f"text={d['text']} (valores distintos: {d['text_values']})")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,55 @@
+from __future__ import annotations
+import argparse
+import json
+
+# uso: python -m tools.trace_report traza1.json [traza2.json ...] [--cat service] [--sort total|calls|max|touched] [--top N]
+# Agrega las estadísticas de una o más trazas guardadas con Ver → Perfilador → Guardar traza
+# (formato Chrome trace; ver diagnostics/profiler.py) y muestra la tabla por nombre.
+
+_SORT = {"total": "total_ms", "calls": "calls", "max": "max_ms", "touched": "touched"}
+
+
+def merge_stats(traces, cat: str | None = None) -> list[dict]:
+    merged: dict[str, dict] = {}
+    for data in traces:
+        for row in data.get("otherData", {}).get("stats", []):
+            if cat and row.get("cat") != cat:
+                continue
+            m = merged.get(row["name"])
+            if m is None:
+                merged[row["name"]] = dict(row, touched=row.get("touched", 0))
+                continue
+            for key in ("calls", "total_ms"):
+                m[key] += row[key]
+            m["touched"] += row.get("touched", 0)
+            m["max_ms"] = max(m["max_ms"], row["max_ms"])
+    for m in merged.values():
+        m["mean_ms"] = m["total_ms"] / max(1, m["calls"])
+    return list(merged.values())
+
+
+def main(argv=None) -> int:
+    ap = argparse.ArgumentParser(description="Resumen de trazas del perfilador.")
+    ap.add_argument("files", nargs="+", help="Trazas JSON guardadas")
+    ap.add_argument("--cat", default=None, help="Sólo una categoría (p. ej. service)")
+    ap.add_argument("--sort", choices=sorted(_SORT), default="total")
+    ap.add_argument("--top", type=int, default=40)
+    args = ap.parse_args(argv)
+
+    traces = []
+    for path in args.files:
+        with open(path, "r", encoding="utf-8") as f:
+            traces.append(json.load(f))
+    rows = merge_stats(traces, args.cat)
+    rows.sort(key=lambda r: r[_SORT[args.sort]], reverse=True)
+
+    print(f"Trazas: {len(traces)}")
+    print(f"{'nombre':<48}{'cat':>9}{'llamadas':>9}{'total ms':>11}{'prom ms':>9}{'máx ms':>9}{'tocados':>9}")
+    for r in rows[:args.top]:
+        print(f"{r['name'][:47]:<48}{r['cat'][:8]:>9}{r['calls']:>9}{r['total_ms']:>11.1f}"
+              f"{r['mean_ms']:>9.2f}{r['max_ms']:>9.1f}{r['touched']:>9}")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,106 @@
+from __future__ import annotations
+
+from PyQt5.QtCore import Qt
+from PyQt5.QtWidgets import (
+    QDialog, QVBoxLayout, QHBoxLayout, QLabel, QPushButton, QCheckBox,
+    QTableWidget, QTableWidgetItem, QAbstractItemView
+)
+
+
+class BulkRecognizeDialog(QDialog):
+    """Vista previa del reconocimiento por regla: una fila por OUT pendiente con el destino
+    propuesto. Sólo las filas marcadas (con destino único) se aplican."""
+
+    COLUMNS = ["", "Bahía", "Equipo", "SignalID", "Texto", "Destino", "Regla"]
+
+    def __init__(self, project, matches, parent=None):
+        super().__init__(parent)
+        self.setWindowTitle("Reconocer pendientes por regla")
+        self.resize(980, 560)
+        self._project = project
+        self._matches = list(matches)
+
+        lay = QVBoxLayout(self)
+        n_ok = sum(1 for m in self._matches if m.ok)
+        lay.addWidget(QLabel(
+            f"{n_ok} de {len(self._matches)} salidas pendientes tienen un destino único según su texto "
+            "(\"… hacia <equipo>\")."
+        ))
+
+        self.chk_all = QCheckBox("Mostrar también las que no tienen propuesta")
+        self.chk_all.stateChanged.connect(self._apply_row_filter)
+        lay.addWidget(self.chk_all)
+
+        self.tbl = QTableWidget(0, len(self.COLUMNS))
+        self.tbl.setHorizontalHeaderLabels(self.COLUMNS)
+        self.tbl.setSelectionBehavior(QAbstractItemView.SelectRows)
+        self.tbl.setEditTriggers(QAbstractItemView.NoEditTriggers)
+        self.tbl.setAlternatingRowColors(True)
+        lay.addWidget(self.tbl, 1)
+        self._fill()
+
+        btns = QHBoxLayout()
+        b_all = QPushButton("Marcar todas"); b_none = QPushButton("Desmarcar todas")
+        b_all.clicked.connect(lambda: self._set_all(True))
+        b_none.clicked.connect(lambda: self._set_all(False))
+        btns.addWidget(b_all); btns.addWidget(b_none)
+        btns.addStretch(1)
+        ok = QPushButton("Reconocer marcadas"); cancel = QPushButton("Cancelar")
+        ok.clicked.connect(self.accept); cancel.clicked.connect(self.reject)
+        ok.setEnabled(n_ok > 0)
+        btns.addWidget(ok); btns.addWidget(cancel)
+        lay.addLayout(btns)
+
+    def _label(self, bay_id, device_id=None) -> str:
+        bay = self._project.bays.get(bay_id)
+        if bay is None:
+            return bay_id
+        if device_id is None:
+            return bay.name
+        dev = bay.devices.get(device_id)
+        return dev.name if dev else device_id
+
+    def _fill(self):
+        self.tbl.setUpdatesEnabled(False)
+        try:
+            self.tbl.setRowCount(len(self._matches))
+            for row, m in enumerate(self._matches):
+                chk = QTableWidgetItem()
+                if m.ok:
+                    chk.setFlags(Qt.ItemIsUserCheckable | Qt.ItemIsEnabled | Qt.ItemIsSelectable)
+                    chk.setCheckState(Qt.Checked)
+                else:
+                    chk.setFlags(Qt.ItemIsSelectable)
+                chk.setData(Qt.UserRole, row)
+                dest = (f"{self._label(m.dest[0])} / {self._label(*m.dest)}" if m.dest else (m.target_name or ""))
+                values = [
+                    self._label(m.origin_bay_id), self._label(m.origin_bay_id, m.origin_device_id),
+                    m.signal_id, m.text, dest, m.reason,
+                ]
+                self.tbl.setItem(row, 0, chk)
+                for c, v in enumerate(values, start=1):
+                    it = QTableWidgetItem(str(v))
+                    if not m.ok:
+                        it.setForeground(Qt.gray)
+                    self.tbl.setItem(row, c, it)
+            self.tbl.resizeColumnsToContents()
+        finally:
+            self.tbl.setUpdatesEnabled(True)
+        self._apply_row_filter()
+
+    def _apply_row_filter(self):
+        show_all = self.chk_all.isChecked()
+        for row, m in enumerate(self._matches):
+            self.tbl.setRowHidden(row, not (m.ok or show_all))
+
+    def _set_all(self, checked: bool):
+        state = Qt.Checked if checked else Qt.Unchecked
+        for row, m in enumerate(self._matches):
+            if m.ok and not self.tbl.isRowHidden(row):
+                self.tbl.item(row, 0).setCheckState(state)
+
+    def get_selected(self):
+        return [
+            m for row, m in enumerate(self._matches)
+            if m.ok and self.tbl.item(row, 0).checkState() == Qt.Checked
+        ]
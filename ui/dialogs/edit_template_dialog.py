@@ -5,7 +5,9 @@ class EditTemplateDialog(QDialog):
     def __init__(self, template=None, existing_codes=None, parent=None):
         super().__init__(parent)
         self.setWindowTitle("Plantilla de señal")
-        existing_codes = set(existing_codes or [])
+        # basta con soportar `in` (p.ej. TemplateIndex.codes); listas se convierten a set
+        if not hasattr(existing_codes, "isdisjoint"):
+            existing_codes = set(existing_codes or [])
         self._existing_codes = existing_codes
         self._editing_code = template.code if template else None
 
@@ -1,14 +1,96 @@
 from __future__ import annotations
-from PyQt5.QtWidgets import QDialog, QVBoxLayout, QHBoxLayout, QLabel, QComboBox, QPushButton
+from PyQt5.QtCore import Qt, QAbstractListModel, QModelIndex
+from PyQt5.QtWidgets import QDialog, QVBoxLayout, QHBoxLayout, QLabel, QComboBox, QPushButton, QLineEdit, QCompleter
+
+from domain.services.device_match_service import matcher_for, suggest_destinations
+
+
+class _DestinationModel(QAbstractListModel):
+    """Lista 'bahía / equipo' filtrada y perezosa: consume el iterador del índice de
+    equipos de a `BATCH` filas (canFetchMore/fetchMore), así ni construir el diálogo ni
+    filtrar recorren todo el proyecto."""
+
+    BATCH = 200
+
+    def __init__(self, project, parent=None):
+        super().__init__(parent)
+        self._project = project
+        self._matcher = matcher_for(project)
+        self._rows = []
+        self._it = None
+        self.set_filter("")
+
+    def set_filter(self, text: str):
+        self.beginResetModel()
+        self._rows = []
+        self._it = self._matcher.iter_matching(text)
+        self.endResetModel()
+        if self.canFetchMore(QModelIndex()):
+            self.fetchMore(QModelIndex())
+
+    def label(self, key) -> str:
+        bay = self._project.bays.get(key[0])
+        dev = bay.devices.get(key[1]) if bay else None
+        return f"{bay.name} / {dev.name}" if dev else ""
+
+    def rowCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else len(self._rows)
+
+    def canFetchMore(self, parent=QModelIndex()):
+        return not parent.isValid() and self._it is not None
+
+    def fetchMore(self, parent=QModelIndex()):
+        batch = []
+        for key in self._it:
+            batch.append(key)
+            if len(batch) >= self.BATCH:
+                break
+        else:
+            self._it = None
+        if not batch:
+            return
+        first = len(self._rows)
+        self.beginInsertRows(QModelIndex(), first, first + len(batch) - 1)
+        self._rows.extend(batch)
+        self.endInsertRows()
+
+    def data(self, index, role=Qt.DisplayRole):
+        if not index.isValid() or index.row() >= len(self._rows):
+            return None
+        key = self._rows[index.row()]
+        if role in (Qt.DisplayRole, Qt.EditRole):
+            return self.label(key)
+        if role == Qt.UserRole:
+            return key
+        return None
+
 
 class RecognizeSignalDialog(QDialog):
-    def __init__(self, project, origin_bay_id: str, origin_device_id: str, parent=None):
+    def __init__(self, project, origin_bay_id: str, origin_device_id: str, parent=None, *, signal_id: str | None = None):
         super().__init__(parent)
         self.setWindowTitle("Reconocer señal (resolver pendiente)")
         lay = QVBoxLayout(self)
 
         lay.addWidget(QLabel("Seleccione bahía y equipo destino (se creará la entrada espejo):"))
 
+        # búsqueda en todo el proyecto (parte del nombre del equipo o de la bahía)
+        row0 = QHBoxLayout()
+        row0.addWidget(QLabel("Buscar:"))
+        self.dest_model = _DestinationModel(project, self)
+        self.search_edit = QLineEdit()
+        self.search_edit.setPlaceholderText("equipo o bahía…")
+        self.completer = QCompleter(self.dest_model, self)
+        # el modelo ya filtra; el completer sólo muestra el popup
+        self.completer.setCompletionMode(QCompleter.UnfilteredPopupCompletion)
+        self.completer.setMaxVisibleItems(15)
+        self.search_edit.setCompleter(self.completer)
+        self.search_edit.textEdited.connect(self._on_search_edited)
+        self.completer.activated[QModelIndex].connect(self._on_search_activated)
+        # el popup no siempre pide más filas al modelo: cargar al llegar al final del scroll
+        self.completer.popup().verticalScrollBar().valueChanged.connect(self._on_popup_scrolled)
+        row0.addWidget(self.search_edit, 1)
+        lay.addLayout(row0)
+
         row1 = QHBoxLayout()
         row1.addWidget(QLabel("Bahía:"))
         self.bay_combo = QComboBox()
@@ -30,6 +112,13 @@ class RecognizeSignalDialog(QDialog):
 
         self._reload_devices(project, origin_bay_id, origin_device_id)
 
+        # Pre-selección: destino más probable según el texto del OUT ("… hacia <equipo>")
+        self.lbl_suggest = QLabel("")
+        self.lbl_suggest.setStyleSheet("color:#555;")
+        lay.addWidget(self.lbl_suggest)
+        if signal_id:
+            self._preselect(project, suggest_destinations(project, origin_bay_id, origin_device_id, signal_id))
+
         btns = QHBoxLayout()
         ok = QPushButton("Reconocer"); cancel = QPushButton("Cancelar")
         ok.clicked.connect(self.accept); cancel.clicked.connect(self.reject)
@@ -48,5 +137,39 @@ class RecognizeSignalDialog(QDialog):
                 continue
             self.dev_combo.addItem(dev.name, dev.device_id)
 
+    def _on_search_edited(self, text: str):
+        self.dest_model.set_filter(text)
+        self.completer.complete()
+
+    def _on_search_activated(self, index):
+        # el índice es del modelo interno del completer; UserRole se delega a _DestinationModel
+        key = index.data(Qt.UserRole)
+        if key:
+            self._select(*key)
+
+    def _on_popup_scrolled(self, value: int):
+        bar = self.completer.popup().verticalScrollBar()
+        if value >= bar.maximum() and self.dest_model.canFetchMore():
+            self.dest_model.fetchMore()
+
+    def _select(self, bay_id: str, dev_id: str):
+        idx = self.bay_combo.findData(bay_id)
+        if idx >= 0:
+            self.bay_combo.setCurrentIndex(idx)
+        idx = self.dev_combo.findData(dev_id)
+        if idx >= 0:
+            self.dev_combo.setCurrentIndex(idx)
+
+    def _preselect(self, project, suggestions):
+        if not suggestions:
+            return
+        _score, bay_id, dev_id = suggestions[0]
+        self._select(bay_id, dev_id)
+        names = [
+            f"{project.bays[b].devices[d].name} ({project.bays[b].name}, {score:.0%})"
+            for score, b, d in suggestions[:3]
+        ]
+        self.lbl_suggest.setText("Sugerencias: " + " · ".join(names))
+
     def get_selection(self):
         return (self.bay_combo.currentData(), self.dev_combo.currentData())
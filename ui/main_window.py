@@ -5,17 +5,23 @@ import os
 from PyQt5.QtCore import Qt
 from PyQt5.QtWidgets import (
     QMainWindow, QWidget, QVBoxLayout, QLabel, QSplitter,
-    QAction, QMessageBox, QInputDialog
+    QAction, QActionGroup, QMessageBox, QFileDialog
 )
 
 from ui.widgets.start_page import StartPage
 from ui.widgets.template_library_dock import TemplateLibraryDock
 from ui.widgets.canvas_host import CanvasHost
+from ui.widgets.canvas_view import PROFILES
 from widgets.navigator_widget import NavigatorWidget
+from widgets.minimap_dock import MiniMapDock
+from widgets.profiler_overlay import ProfilerOverlay
 from widgets.pending_signals_dock import PendingSignalsDock
+from widgets.validation_dock import ValidationDock
 
 from controllers.canvas_controller import CanvasController
 from controllers.project_controller import ProjectController
+from controllers.validation_controller import ValidationController
+from diagnostics.profiler import PROFILER
 
 
 class MainWindow(QMainWindow):
@@ -24,7 +30,8 @@ class MainWindow(QMainWindow):
     Nota de arquitectura:
     - ProjectController maneja proyecto/I/O/diálogos.
     - CanvasController maneja escena/vista/layout por bahía.
-    - MainWindow sólo coordina.
+    - MainWindow sólo coordina: escucha el bus de eventos del proyecto (`project.events`) y
+      reparte cada lote a navegador, docks, canvas y validación.
     """
 
     def __init__(self):
@@ -34,6 +41,7 @@ class MainWindow(QMainWindow):
 
         self.proj_ctrl = ProjectController(self, app_dir=os.getcwd())
         self.canvas_ctrl: CanvasController | None = None
+        self._bound_project = None
 
         self._build_ui()
         self._build_menu()
@@ -62,6 +70,7 @@ class MainWindow(QMainWindow):
 
         self.canvas_host = CanvasHost(self)
         rlay.addWidget(self.canvas_host, 1)
+        self.profiler_overlay = ProfilerOverlay(self.canvas_host)
         splitter.addWidget(right)
         splitter.setStretchFactor(1, 1)
 
@@ -72,16 +81,30 @@ class MainWindow(QMainWindow):
         self.pending_dock = PendingSignalsDock(self)
         self.addDockWidget(Qt.RightDockWidgetArea, self.pending_dock)
         self.pending_dock.jumpRequested.connect(self._on_device_selected)
-        self.pending_dock.projectMutated.connect(self._on_project_mutated)
         self.pending_dock.setVisible(False)
 
+        self.validation_dock = ValidationDock(self)
+        self.addDockWidget(Qt.BottomDockWidgetArea, self.validation_dock)
+        self.validation_dock.issueActivated.connect(self._on_issue_activated)
+        self.validation_dock.setVisible(False)
+        self.minimap_dock = MiniMapDock(self)
+        self.addDockWidget(Qt.RightDockWidgetArea, self.minimap_dock)
+        self.minimap_dock.setVisible(False)
+
+        self.validation_ctrl = ValidationController(
+            get_project=lambda: self.proj_ctrl.project,
+            dock=self.validation_dock,
+            parent=self,
+        )
+
         # Canvas controller
         self.canvas_ctrl = CanvasController(
             get_project=lambda: self.proj_ctrl.project,
             template_dock=self.lib_dock,
             canvas_host=self.canvas_host,
             canvas_title_label=self.lbl_canvas,
-            on_project_mutated=self._on_project_mutated,
+            on_bay_activated=self._on_bay_selected,
+            on_view_changed=self.minimap_dock.set_view,
         )
 
     def _build_menu(self):
@@ -97,6 +120,10 @@ class MainWindow(QMainWindow):
         act_add_bay = QAction("Nueva bahía…", self); act_add_bay.triggered.connect(self.add_bay); mproj.addAction(act_add_bay)
         act_add_dev = QAction("Nuevo equipo…", self); act_add_dev.triggered.connect(self.add_device); mproj.addAction(act_add_dev)
         act_rep_bay = QAction("Replicar bahía…", self); act_rep_bay.triggered.connect(self.replicate_bay); mproj.addAction(act_rep_bay)
+        act_auto_layout = QAction("Ordenar equipos automáticamente", self); act_auto_layout.triggered.connect(self.auto_layout_bay); mproj.addAction(act_auto_layout)
+
+        mproj.addSeparator()
+        act_validate = QAction("Validar proyecto", self); act_validate.triggered.connect(self.validate_project); mproj.addAction(act_validate)
 
         mexp = mb.addMenu("Exportar")
         act_xls = QAction("Excel (por bahía)…", self); act_xls.triggered.connect(self.export_excel); mexp.addAction(act_xls)
@@ -113,6 +140,41 @@ class MainWindow(QMainWindow):
         act_pending = QAction("Pendientes", self); act_pending.setCheckable(True); act_pending.setChecked(False)
         act_pending.toggled.connect(self.pending_dock.setVisible); mview.addAction(act_pending)
 
+        self.act_validation = QAction("Validación", self); self.act_validation.setCheckable(True); self.act_validation.setChecked(False)
+        self.act_validation.toggled.connect(self.validation_dock.setVisible); mview.addAction(self.act_validation)
+
+        act_minimap = QAction("Minimapa", self); act_minimap.setCheckable(True); act_minimap.setChecked(False)
+        act_minimap.toggled.connect(self.minimap_dock.setVisible); mview.addAction(act_minimap)
+
+        mview.addSeparator()
+        act_overview = QAction("Vista general (todas las bahías)", self); act_overview.triggered.connect(self.open_overview)
+        mview.addAction(act_overview)
+        act_batched = QAction("Canvas: filas agrupadas (bahías densas)", self); act_batched.setCheckable(True)
+        act_batched.setChecked(self.canvas_ctrl.batched_rows)
+        act_batched.toggled.connect(self.canvas_ctrl.set_batched_rows); mview.addAction(act_batched)
+        act_links = QAction("Canvas: conexiones entre equipos", self); act_links.setCheckable(True)
+        act_links.setChecked(self.canvas_ctrl.show_links)
+        act_links.toggled.connect(self.canvas_ctrl.set_show_links); mview.addAction(act_links)
+
+        mrender = mview.addMenu("Canvas: perfil de dibujo")
+        group = QActionGroup(self); group.setExclusive(True)
+        for key, profile in PROFILES.items():
+            act = QAction(profile.label, self); act.setCheckable(True)
+            act.setChecked(key == self.canvas_ctrl.render_profile)
+            act.triggered.connect(lambda _checked=False, k=key: self.canvas_ctrl.set_render_profile(k))
+            group.addAction(act); mrender.addAction(act)
+        act_fps = QAction("Canvas: mostrar FPS", self); act_fps.setCheckable(True)
+        act_fps.setChecked(self.canvas_ctrl.show_fps)
+        act_fps.toggled.connect(self.canvas_ctrl.set_show_fps); mview.addAction(act_fps)
+
+        mprof = mview.addMenu("Perfilador")
+        act_prof = QAction("Mostrar mediciones", self); act_prof.setCheckable(True); act_prof.setChecked(False)
+        act_prof.toggled.connect(self.profiler_overlay.set_active); mprof.addAction(act_prof)
+        act_prof_reset = QAction("Reiniciar mediciones", self); act_prof_reset.triggered.connect(PROFILER.reset)
+        mprof.addAction(act_prof_reset)
+        act_prof_dump = QAction("Guardar traza (Chrome)…", self); act_prof_dump.triggered.connect(self.dump_profiler_trace)
+        mprof.addAction(act_prof_dump)
+
     # ---------------- Actions ----------------
     def new_project(self):
         self.canvas_ctrl.persist_layout()
@@ -138,7 +200,7 @@ class MainWindow(QMainWindow):
             return
         bay_id = self.proj_ctrl.add_bay()
         if bay_id:
-            self._after_project_changed(open_bay_id=bay_id)
+            self._on_bay_selected(bay_id)
 
     def add_device(self):
         if not self.proj_ctrl.project:
@@ -161,7 +223,6 @@ class MainWindow(QMainWindow):
 
         pos = self.canvas_ctrl.suggest_position_for_new_device()
         self.canvas_ctrl.scene.add_device(device_id=device_id, name=data["name"], dev_type=data["dev_type"], pos=pos)
-        self._after_project_changed(open_bay_id=bay_id)
 
     def replicate_bay(self):
         if not self.proj_ctrl.project:
@@ -169,7 +230,26 @@ class MainWindow(QMainWindow):
             return
         new_id = self.proj_ctrl.replicate_bay()
         if new_id:
-            self._after_project_changed(open_bay_id=new_id)
+            self._on_bay_selected(new_id)
+
+    def validate_project(self):
+        if not self.proj_ctrl.project:
+            QMessageBox.information(self, "Validación", "Abra o cree un proyecto primero.")
+            return
+        self.act_validation.setChecked(True)
+        self.validation_ctrl.start()
+
+    def auto_layout_bay(self):
+        if not self.proj_ctrl.project or not self.canvas_ctrl.bay_id:
+            QMessageBox.information(self, "Ordenar equipos", "Abra un proyecto y seleccione una bahía primero.")
+            return
+        self.canvas_ctrl.auto_layout_current()
+
+    def open_overview(self):
+        if not self.proj_ctrl.project:
+            QMessageBox.information(self, "Vista general", "Abra o cree un proyecto primero.")
+            return
+        self.canvas_ctrl.open_overview()
 
     def export_excel(self):
         if not self.proj_ctrl.project:
@@ -184,6 +264,18 @@ class MainWindow(QMainWindow):
             return
         self.canvas_ctrl.scene.export_canvas_png_dialog()
 
+    def dump_profiler_trace(self):
+        path, _ = QFileDialog.getSaveFileName(self, "Guardar traza", "signal_mapper_trace.json", "Chrome trace (*.json)")
+        if not path:
+            return
+        try:
+            n = PROFILER.dump_chrome_trace(path)
+        except OSError as e:
+            QMessageBox.warning(self, "Perfilador", f"No se pudo guardar la traza:\n{e}")
+            return
+        note = "" if PROFILER.enabled or n else "\n(El perfilador está desactivado: Ver → Perfilador → Mostrar mediciones.)"
+        QMessageBox.information(self, "Perfilador", f"Traza guardada ({n} eventos).\nAbrir en chrome://tracing o Perfetto.{note}")
+
     def open_global_library(self):
         self.proj_ctrl.open_global_library()
 
@@ -192,7 +284,6 @@ class MainWindow(QMainWindow):
             QMessageBox.information(self, "Plantillas", "Abra o cree un proyecto primero.")
             return
         self.proj_ctrl.import_global_to_project()
-        self._after_project_changed(open_bay_id=self.canvas_ctrl.bay_id)
 
     # ---------------- Navigation handlers ----------------
     def _on_bay_selected(self, bay_id: str):
@@ -209,32 +300,51 @@ class MainWindow(QMainWindow):
             self.nav.select_bay(bay_id)
         self.canvas_ctrl.select_device(device_id)
 
+    def _on_issue_activated(self, bay_id: str, device_id: str, direction: str, signal_id: str):
+        if not self.proj_ctrl.project or bay_id not in self.proj_ctrl.project.bays:
+            return
+        if self.canvas_ctrl.bay_id != bay_id:
+            self.canvas_ctrl.open_bay(bay_id)
+            self.nav.select_bay(bay_id)
+        self.canvas_ctrl.select_chip(device_id, signal_id, direction)
+
     def _on_bay_rename_requested(self, bay_id: str):
         if not self.proj_ctrl.project:
             return
-        changed = self.proj_ctrl.rename_bay(bay_id)
-        if changed:
-            # refrescar navegador, docks, título del canvas
-            self._on_project_mutated({bay_id})
+        # navegador, docks y título se actualizan por los eventos del modelo
+        self.proj_ctrl.rename_bay(bay_id)
 
     def _on_device_rename_requested(self, bay_id: str, device_id: str):
         if not self.proj_ctrl.project:
             return
-        changed = self.proj_ctrl.rename_device(bay_id, device_id)
-        if changed:
-            self._on_project_mutated({bay_id})
+        self.proj_ctrl.rename_device(bay_id, device_id)
 
-    def _on_project_mutated(self, bay_ids: set):
-        self._refresh_navigation()
-        self.lib_dock.set_project(self.proj_ctrl.project)
-        current = self.canvas_ctrl.bay_id
-        if current and (not bay_ids or current in bay_ids):
-            self.canvas_ctrl.open_bay(current)
+    # ---------------- Model events ----------------
+    def _bind_project_events(self):
+        project = self.proj_ctrl.project
+        if project is self._bound_project:
+            return
+        if self._bound_project is not None:
+            self._bound_project.events.unsubscribe(self._on_model_events)
+        self._bound_project = project
+        if project is not None:
+            project.events.subscribe(self._on_model_events)
+
+    def _on_model_events(self, events):
+        self.nav.on_model_events(events)
+        self.pending_dock.on_model_events(events)
+        self.lib_dock.on_model_events(events)
+        self.canvas_ctrl.on_model_events(events)
+        self.validation_ctrl.on_model_events(events)
 
     # ---------------- Helpers ----------------
     def _after_project_changed(self, open_bay_id: str | None = None):
+        self._bind_project_events()
         self._refresh_navigation()
+        self.lib_dock.set_project(self.proj_ctrl.project)
         self.pending_dock.set_project(self.proj_ctrl.project)
+        self.validation_ctrl.reset()
+        self.canvas_ctrl.invalidate({open_bay_id} if open_bay_id else None)
 
         if self.proj_ctrl.project and self.proj_ctrl.project.bays:
             bay_id = open_bay_id or self.canvas_ctrl.bay_id or next(iter(self.proj_ctrl.project.bays.keys()))
@@ -243,6 +353,12 @@ class MainWindow(QMainWindow):
         else:
             self._show_start_page()
 
+    def closeEvent(self, event):
+        self.lib_dock.flush_saves()
+        self.validation_ctrl.cancel(wait=True)
+        self.canvas_ctrl.shutdown()
+        super().closeEvent(event)
+
     def _refresh_navigation(self):
         self.nav.set_project(self.proj_ctrl.project)
 
@@ -1,25 +1,169 @@
 from __future__ import annotations
+import time
+from dataclasses import dataclass
+
 from PyQt5.QtWidgets import QGraphicsView, QMenu
-from PyQt5.QtCore import Qt
-from PyQt5.QtGui import QPainter
+from PyQt5.QtCore import QRect, Qt, QTimer
+from PyQt5.QtGui import QColor, QFont, QPainter
 
 from canvas.items.signal_chip_item import SignalChipItem
+from diagnostics.profiler import PROFILER
+
+
+@dataclass(frozen=True)
+class RenderProfile:
+    """Ajustes de dibujo de la vista del canvas."""
+    key: str
+    label: str
+    update_mode: int
+    cache_background: bool
+    # QGraphicsView.OptimizationFlags. DontSavePainterState es seguro porque los items del
+    # canvas fijan pen/brush/fuente antes de dibujar y no cambian transformación ni clip;
+    # DontAdjustForAntialiasing, porque sus boundingRect incluyen el ancho del trazo.
+    optimization_flags: int
+    antialias: bool             # en reposo
+    antialias_moving: bool      # durante pan/zoom
+    text_antialias: bool
+
+
+PROFILES: dict[str, RenderProfile] = {
+    # comportamiento original
+    "quality": RenderProfile(
+        "quality", "Calidad", QGraphicsView.BoundingRectViewportUpdate, False, 0,
+        antialias=True, antialias_moving=True, text_antialias=True,
+    ),
+    "balanced": RenderProfile(
+        "balanced", "Equilibrado", QGraphicsView.MinimalViewportUpdate, True,
+        QGraphicsView.DontSavePainterState | QGraphicsView.DontAdjustForAntialiasing,
+        antialias=True, antialias_moving=False, text_antialias=True,
+    ),
+    # camino rápido sin OpenGL (gráficos integrados): todo por raster, sin suavizado
+    "fast": RenderProfile(
+        "fast", "Rápido (gráficos integrados)", QGraphicsView.MinimalViewportUpdate, True,
+        QGraphicsView.DontSavePainterState | QGraphicsView.DontAdjustForAntialiasing,
+        antialias=False, antialias_moving=False, text_antialias=False,
+    ),
+}
+DEFAULT_PROFILE = "balanced"
+
 
 class CanvasView(QGraphicsView):
-    def __init__(self, scene):
+    """Vista de una bahía. El perfil de dibujo (`set_render_profile`) define el modo de
+    actualización, el caché de fondo y el suavizado; si el perfil lo indica, el suavizado
+    se apaga mientras se desplaza o hace zoom y vuelve tras `IDLE_MS` sin movimiento."""
+
+    IDLE_MS = 150
+    FPS_RECT = QRect(6, 6, 92, 20)
+
+    def __init__(self, scene, *, profile: str = DEFAULT_PROFILE, show_fps: bool = False):
         super().__init__(scene)
-        self.setRenderHint(QPainter.Antialiasing, True)
         self.setDragMode(QGraphicsView.RubberBandDrag)
         self.setHorizontalScrollBarPolicy(Qt.ScrollBarAsNeeded)
         self.setVerticalScrollBarPolicy(Qt.ScrollBarAsNeeded)
-        self.setViewportUpdateMode(QGraphicsView.BoundingRectViewportUpdate)
         self._last_context_scene_pos = None
         self._panning = False
         self._pan_start = None
 
+        self._profile = PROFILES[DEFAULT_PROFILE]
+        self._moving = False
+        self._idle = QTimer(self)
+        self._idle.setSingleShot(True)
+        self._idle.setInterval(self.IDLE_MS)
+        self._idle.timeout.connect(self._end_motion)
+        for bar in (self.horizontalScrollBar(), self.verticalScrollBar()):
+            bar.valueChanged.connect(self._begin_motion)
+
+        # lectura de cuadros por segundo (cuadros = paintEvent del viewport)
+        self._fps = 0.0
+        self._frames = 0
+        self._fps_t0 = time.perf_counter()
+        self._fps_timer = QTimer(self)
+        self._fps_timer.setInterval(1000)
+        self._fps_timer.timeout.connect(self._sample_fps)
+
+        self.set_render_profile(profile)
+        self.set_show_fps(show_fps)
+
+    # ---------------- Perfil de dibujo ----------------
+    @property
+    def render_profile(self) -> str:
+        return self._profile.key
+
+    def set_render_profile(self, key: str) -> None:
+        p = PROFILES.get(key, PROFILES[DEFAULT_PROFILE])
+        self._profile = p
+        self.setViewportUpdateMode(p.update_mode)
+        self.setCacheMode(QGraphicsView.CacheBackground if p.cache_background else QGraphicsView.CacheNone)
+        for flag in (QGraphicsView.DontSavePainterState, QGraphicsView.DontAdjustForAntialiasing):
+            self.setOptimizationFlag(flag, bool(p.optimization_flags & flag))
+        self.setRenderHint(QPainter.TextAntialiasing, p.text_antialias)
+        self._apply_antialias()
+        self.resetCachedContent()
+        self.viewport().update()
+
+    def _apply_antialias(self) -> None:
+        p = self._profile
+        self.setRenderHint(QPainter.Antialiasing, p.antialias_moving if self._moving else p.antialias)
+
+    def _begin_motion(self, *_args) -> None:
+        p = self._profile
+        if p.antialias == p.antialias_moving:
+            return
+        if not self._moving:
+            self._moving = True
+            self._apply_antialias()
+        self._idle.start()
+
+    def _end_motion(self) -> None:
+        if self._panning:       # sigue arrastrando sin moverse
+            self._idle.start()
+            return
+        self._moving = False
+        self._apply_antialias()
+        self.viewport().update()    # redibujar con la calidad de reposo
+
+    # ---------------- FPS ----------------
+    def set_show_fps(self, enabled: bool) -> None:
+        if enabled:
+            self._frames = 0
+            self._fps_t0 = time.perf_counter()
+            self._fps_timer.start()
+        else:
+            self._fps_timer.stop()
+        self.viewport().update(self.FPS_RECT)
+
+    def _sample_fps(self) -> None:
+        now = time.perf_counter()
+        self._fps = self._frames / max(1e-6, now - self._fps_t0)
+        self._frames = 0
+        self._fps_t0 = now
+        self.viewport().update(self.FPS_RECT)
+
+    def paintEvent(self, event):
+        super().paintEvent(event)
+        if not self._fps_timer.isActive():
+            return
+        # el repintado de la propia lectura no es un cuadro de la escena
+        if not self.FPS_RECT.contains(event.region().boundingRect()):
+            self._frames += 1
+        painter = QPainter(self.viewport())
+        painter.fillRect(self.FPS_RECT, QColor(20, 25, 30, 170))
+        painter.setPen(QColor(235, 240, 245))
+        painter.setFont(QFont("Segoe UI", 8, QFont.Bold))
+        painter.drawText(self.FPS_RECT, Qt.AlignCenter, f"{self._fps:.0f} FPS")
+        painter.end()
+
+    def scrollContentsBy(self, dx, dy):
+        super().scrollContentsBy(dx, dy)
+        if self._fps_timer.isActive():
+            # el desplazamiento copia el viewport: la lectura no debe arrastrarse
+            self.viewport().update(self.FPS_RECT)
+
+    # ---------------- Eventos ----------------
     def wheelEvent(self, event):
         if event.modifiers() & Qt.ControlModifier:
             factor = 1.15 if event.angleDelta().y() > 0 else 1 / 1.15
+            self._begin_motion()
             self.scale(factor, factor)
             event.accept()
         else:
@@ -63,7 +207,10 @@ class CanvasView(QGraphicsView):
         if event.key() == Qt.Key_Delete:
             sc = self.scene()
             if sc:
-                selected = [it for it in sc.selectedItems() if isinstance(it, SignalChipItem)]
+                if hasattr(sc, "selected_chips"):
+                    selected = sc.selected_chips()
+                else:
+                    selected = [it for it in sc.selectedItems() if isinstance(it, SignalChipItem)]
                 if selected and hasattr(sc, "delete_signals_bulk"):
                     sc.delete_signals_bulk(selected, confirm=True)
                     return
@@ -89,3 +236,7 @@ class CanvasView(QGraphicsView):
             sc.validate_current_bay()
         elif chosen == act_export_png and hasattr(sc, "export_canvas_png_dialog"):
             sc.export_canvas_png_dialog()
+
+
+# un cuadro = un paintEvent del viewport
+PROFILER.hook(CanvasView, "paintEvent", name="CanvasView.frame", cat="view")
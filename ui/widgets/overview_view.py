@@ -0,0 +1,24 @@
+from __future__ import annotations
+from PyQt5.QtWidgets import QGraphicsView
+from PyQt5.QtCore import Qt
+from PyQt5.QtGui import QPainter
+
+
+class OverviewView(QGraphicsView):
+    """Vista de la escena general: zoom con la rueda (el nivel de detalle de las bahías
+    depende de la escala) y arrastre para desplazarse."""
+
+    def __init__(self, scene):
+        super().__init__(scene)
+        self.setRenderHint(QPainter.Antialiasing, True)
+        self.setDragMode(QGraphicsView.ScrollHandDrag)
+        self.setTransformationAnchor(QGraphicsView.AnchorUnderMouse)
+        self.setViewportUpdateMode(QGraphicsView.SmartViewportUpdate)
+
+    def wheelEvent(self, event):
+        factor = 1.15 if event.angleDelta().y() > 0 else 1 / 1.15
+        self.scale(factor, factor)
+        event.accept()
+
+    def fit_all(self):
+        self.fitInView(self.scene().itemsBoundingRect(), Qt.KeepAspectRatio)
@@ -3,37 +3,83 @@ from __future__ import annotations
 import json
 import os
 
-from PyQt5.QtCore import Qt, QMimeData
-from PyQt5.QtGui import QDrag
+from PyQt5.QtCore import Qt, QMimeData, QAbstractListModel, QModelIndex, QTimer
 from PyQt5.QtWidgets import (
-    QDockWidget, QWidget, QVBoxLayout, QHBoxLayout, QListWidget, QListWidgetItem,
+    QDockWidget, QWidget, QVBoxLayout, QHBoxLayout, QListView, QAbstractItemView,
     QPushButton, QLabel, QComboBox, QLineEdit, QMessageBox
 )
 
 from domain.models import SignalTemplate
+from domain.services.template_index import TemplateIndex
 from ui.dialogs.edit_template_dialog import EditTemplateDialog
-from persistence.template_store import load_global_templates, save_global_templates
+from persistence.template_store import (
+    SAVE_DELAY_S, flush_pending_saves, load_global_templates, save_global_templates,
+)
+from domain.events import TemplatesChanged, emit, has_event
+
+MIME_TEMPLATE = "application/x-signal-template"
+
 
+class TemplateListModel(QAbstractListModel):
+    """Filas = índices de plantillas ya filtrados por TemplateIndex; el texto de cada fila
+    se arma sólo cuando la vista lo pide (filas visibles)."""
 
-class TemplateList(QListWidget):
     def __init__(self, parent=None):
         super().__init__(parent)
-        self.setDragEnabled(True)
-        self.setSelectionMode(QListWidget.SingleSelection)
+        self._templates = []
+        self._rows: list[int] = []
+
+    def set_rows(self, templates, rows):
+        self.beginResetModel()
+        self._templates = templates
+        self._rows = rows
+        self.endResetModel()
+
+    def template_at(self, row: int):
+        return self._templates[self._rows[row]] if 0 <= row < len(self._rows) else None
+
+    def rowCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else len(self._rows)
+
+    def data(self, index, role=Qt.DisplayRole):
+        t = self.template_at(index.row()) if index.isValid() else None
+        if t is None:
+            return None
+        if role == Qt.DisplayRole:
+            return f"[{t.category}] {t.code} — {t.label}"
+        if role == Qt.UserRole:
+            return {
+                "code": t.code,
+                "label": t.label,
+                "nature": t.nature,
+                "category": t.category,
+                "description": t.description,
+            }
+        return None
+
+    def flags(self, index):
+        f = super().flags(index)
+        return f | Qt.ItemIsDragEnabled if index.isValid() else f
 
-    def mouseMoveEvent(self, event):
-        item = self.currentItem()
-        if not item:
-            return super().mouseMoveEvent(event)
-        if not (event.buttons() & Qt.LeftButton):
-            return super().mouseMoveEvent(event)
+    def mimeTypes(self):
+        return [MIME_TEMPLATE]
 
-        payload = item.data(Qt.UserRole)
+    def mimeData(self, indexes):
+        if not indexes:
+            return None
         mime = QMimeData()
-        mime.setData("application/x-signal-template", json.dumps(payload).encode("utf-8"))
-        drag = QDrag(self)
-        drag.setMimeData(mime)
-        drag.exec_(Qt.CopyAction)
+        mime.setData(MIME_TEMPLATE, json.dumps(indexes[0].data(Qt.UserRole)).encode("utf-8"))
+        return mime
+
+
+class TemplateList(QListView):
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self.setDragEnabled(True)
+        self.setDragDropMode(QAbstractItemView.DragOnly)
+        self.setDefaultDropAction(Qt.CopyAction)
+        self.setSelectionMode(QAbstractItemView.SingleSelection)
+        self.setUniformItemSizes(True)
 
 
 class TemplateLibraryDock(QDockWidget):
@@ -50,6 +96,11 @@ class TemplateLibraryDock(QDockWidget):
         self._scene = None
         self._app_dir = app_dir or os.getcwd()
         self._global_templates = load_global_templates(self._app_dir)
+        # guardados agrupados de la biblioteca global: se escriben en este hilo (errores al usuario)
+        self._save_timer = QTimer(self)
+        self._save_timer.setSingleShot(True)
+        self._save_timer.setInterval(int(SAVE_DELAY_S * 1000))
+        self._save_timer.timeout.connect(self.flush_saves)
 
         root = QWidget()
         lay = QVBoxLayout(root)
@@ -60,7 +111,7 @@ class TemplateLibraryDock(QDockWidget):
         self.source = QComboBox()
         self.source.addItem("Proyecto", "PROJECT")
         self.source.addItem("Global", "GLOBAL")
-        self.source.currentIndexChanged.connect(self._refresh)
+        self.source.currentIndexChanged.connect(self._on_source_changed)
         top.addWidget(self.source, 1)
 
         top.addWidget(QLabel("Categoría:"))
@@ -74,8 +125,12 @@ class TemplateLibraryDock(QDockWidget):
         top.addWidget(self.search, 3)
         lay.addLayout(top)
 
+        self.model = TemplateListModel(self)
         self.list = TemplateList()
+        self.list.setModel(self.model)
         lay.addWidget(self.list, 1)
+        self._index: TemplateIndex | None = None
+        self._index_key = None
 
         btns = QHBoxLayout()
         self.btn_add = QPushButton("+ Nueva")
@@ -107,8 +162,43 @@ class TemplateLibraryDock(QDockWidget):
         self._rebuild_categories()
         self._refresh()
 
+    def on_model_events(self, events):
+        if has_event(events, TemplatesChanged) and self.source.currentData() == "PROJECT":
+            self._index = None
+            self._rebuild_categories()
+            self._refresh()
+
+    def _on_source_changed(self, _idx=None):
+        self._rebuild_categories()
+        self._refresh()
+
     def _save_global(self):
-        save_global_templates(self._app_dir, self._global_templates)
+        # varias ediciones seguidas se escriben una sola vez
+        save_global_templates(self._app_dir, self._global_templates, coalesce=True)
+        self._save_timer.start()
+
+    def flush_saves(self):
+        """Escribe la biblioteca global pendiente; si falla, avisa (queda pendiente)."""
+        self._save_timer.stop()
+        try:
+            flush_pending_saves()
+        except OSError as e:
+            QMessageBox.warning(
+                self, "Biblioteca global",
+                f"No se pudo guardar la biblioteca de plantillas:\n{e}\n\n"
+                "Los cambios siguen pendientes; se reintentará en la próxima edición o al cerrar.",
+            )
+
+    def _templates_changed(self):
+        """Las plantillas del proyecto se notifican por el bus (refresca on_model_events);
+        las globales se guardan y se refresca aquí."""
+        self._index = None
+        if self.source.currentData() == "PROJECT":
+            emit(self._project, TemplatesChanged(None))
+            return
+        self._save_global()
+        self._rebuild_categories()
+        self._refresh()
 
     def _current_templates(self):
         src = self.source.currentData()
@@ -116,14 +206,26 @@ class TemplateLibraryDock(QDockWidget):
             return (self._project.templates if self._project else [])
         return self._global_templates
 
+    def _current_index(self) -> TemplateIndex:
+        """Índice de la lista actual; se reconstruye si cambió la lista (fuente, proyecto o
+        una edición, que lo descarta en `_templates_changed`)."""
+        templates = self._current_templates()
+        key = (id(templates), len(templates))
+        if self._index is None or self._index_key != key or self._index.templates is not templates:
+            self._index = TemplateIndex(templates)
+            self._index_key = key
+        return self._index
+
     def _rebuild_categories(self):
+        current = self.category.currentData()
         self.category.blockSignals(True)
         try:
             self.category.clear()
             self.category.addItem("Todas", None)
-            cats = sorted({t.category for t in self._current_templates() if getattr(t, "category", None)})
-            for c in cats:
+            for c in self._current_index().categories():
                 self.category.addItem(c, c)
+            idx = self.category.findData(current) if current else -1
+            self.category.setCurrentIndex(max(idx, 0))
         finally:
             self.category.blockSignals(False)
 
@@ -133,31 +235,14 @@ class TemplateLibraryDock(QDockWidget):
             self.source.blockSignals(True)
             self.source.setCurrentIndex(1)
             self.source.blockSignals(False)
+            self._rebuild_categories()
 
-        self.list.clear()
-        cat = self.category.currentData()
-        q = (self.search.text() or "").strip().lower()
-
-        for t in self._current_templates():
-            if cat and t.category != cat:
-                continue
-            if q and (q not in (t.code or "").lower()) and (q not in (t.label or "").lower()):
-                continue
-
-            label = f"[{t.category}] {t.code} — {t.label}"
-            it = QListWidgetItem(label)
-            it.setData(Qt.UserRole, {
-                "code": t.code,
-                "label": t.label,
-                "nature": t.nature,
-                "category": t.category,
-                "description": t.description,
-            })
-            self.list.addItem(it)
+        index = self._current_index()
+        rows = index.filter(self.category.currentData(), self.search.text())
+        self.model.set_rows(index.templates, rows)
 
     def add_template(self):
-        existing = [t.code for t in self._current_templates()]
-        dlg = EditTemplateDialog(existing_codes=existing, parent=self)
+        dlg = EditTemplateDialog(existing_codes=self._current_index().codes, parent=self)
         if dlg.exec_() != dlg.Accepted:
             return
         data, err = dlg.get_data()
@@ -173,28 +258,23 @@ class TemplateLibraryDock(QDockWidget):
             self._project.templates.append(t)
         else:
             self._global_templates.append(t)
-            self._save_global()
 
-        self._rebuild_categories()
-        self._refresh()
+        self._templates_changed()
 
     def _selected_code(self):
-        it = self.list.currentItem()
-        if not it:
-            return None
-        payload = it.data(Qt.UserRole) or {}
-        return payload.get("code")
+        t = self.model.template_at(self.list.currentIndex().row())
+        return t.code if t else None
 
     def edit_selected(self):
         code = self._selected_code()
         if not code:
             return
         arr = self._current_templates()
-        current = next((t for t in arr if t.code == code), None)
+        index = self._current_index()
+        current = index.get(code)
         if not current:
             return
-        existing = [t.code for t in arr]
-        dlg = EditTemplateDialog(template=current, existing_codes=existing, parent=self)
+        dlg = EditTemplateDialog(template=current, existing_codes=index.codes, parent=self)
         if dlg.exec_() != dlg.Accepted:
             return
         data, err = dlg.get_data()
@@ -203,16 +283,9 @@ class TemplateLibraryDock(QDockWidget):
             return
         new_t = SignalTemplate(**data)
 
-        for i, x in enumerate(arr):
-            if x.code == code:
-                arr[i] = new_t
-                break
+        arr[index.position(code)] = new_t
 
-        if self.source.currentData() == "GLOBAL":
-            self._save_global()
-
-        self._rebuild_categories()
-        self._refresh()
+        self._templates_changed()
 
     def delete_selected(self):
         code = self._selected_code()
@@ -222,7 +295,4 @@ class TemplateLibraryDock(QDockWidget):
             return
         arr = self._current_templates()
         arr[:] = [t for t in arr if t.code != code]
-        if self.source.currentData() == "GLOBAL":
-            self._save_global()
-        self._rebuild_categories()
-        self._refresh()
+        self._templates_changed()
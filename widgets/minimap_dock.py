@@ -0,0 +1,198 @@
+from __future__ import annotations
+
+from PyQt5.QtCore import QPointF, QRectF, QTimer, Qt
+from PyQt5.QtGui import QColor, QImage, QPainter, QPen
+from PyQt5.QtWidgets import QDockWidget, QSizePolicy, QWidget
+
+
+class MiniMapWidget(QWidget):
+    """Miniatura de la escena de una QGraphicsView con el rectángulo visible arrastrable.
+
+    La escena se dibuja una vez en una imagen de baja resolución; después sólo se vuelven a
+    dibujar las regiones sucias que informa `QGraphicsScene.changed` (agrupadas con un timer),
+    así la miniatura no provoca repintados completos de la escena. Cambiar el tamaño del
+    widget o el sceneRect rehace la imagen completa.
+    """
+
+    DEBOUNCE_MS = 120
+    # si las regiones sucias cubren más que esta fracción, se redibuja todo de una vez
+    FULL_RENDER_RATIO = 0.6
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self.setMinimumSize(160, 110)
+        self.setSizePolicy(QSizePolicy.Expanding, QSizePolicy.Expanding)
+        self.setMouseTracking(False)
+        self._view = None
+        self._scene = None
+        self._image: QImage | None = None
+        self._source = QRectF()     # sceneRect con que se dibujó la imagen
+        self._scale = 1.0
+        self._offset = QPointF()
+        self._dirty: list[QRectF] = []
+        self._full = True
+        self._dragging = False
+        self._timer = QTimer(self)
+        self._timer.setSingleShot(True)
+        self._timer.setInterval(self.DEBOUNCE_MS)
+        self._timer.timeout.connect(self._render_pending)
+
+    # ---------------- API ----------------
+    def set_view(self, view) -> None:
+        if view is self._view:
+            return
+        self._disconnect()
+        self._view = view
+        self._scene = view.scene() if view is not None else None
+        self._image = None
+        self._dirty = []
+        self._full = True
+        if view is not None:
+            self._scene.changed.connect(self._on_scene_changed)
+            self._scene.sceneRectChanged.connect(self._on_scene_rect_changed)
+            for bar in (view.horizontalScrollBar(), view.verticalScrollBar()):
+                bar.valueChanged.connect(self.update)
+                bar.rangeChanged.connect(self.update)
+            self._timer.start()
+        self.update()
+
+    def _disconnect(self) -> None:
+        if self._view is None:
+            return
+        try:
+            self._scene.changed.disconnect(self._on_scene_changed)
+            self._scene.sceneRectChanged.disconnect(self._on_scene_rect_changed)
+            for bar in (self._view.horizontalScrollBar(), self._view.verticalScrollBar()):
+                bar.valueChanged.disconnect(self.update)
+                bar.rangeChanged.disconnect(self.update)
+        except (RuntimeError, TypeError):   # vista/escena ya destruidas
+            pass
+
+    # ---------------- Render ----------------
+    def _on_scene_changed(self, regions) -> None:
+        if self._full:
+            return
+        if not self.isVisible():
+            # oculto no se dibuja: basta con un render completo al volver a mostrarse
+            self._full = True
+            self._dirty = []
+            return
+        self._dirty.extend(QRectF(r) for r in regions)
+        if not self._timer.isActive():
+            self._timer.start()
+
+    def _on_scene_rect_changed(self, _rect) -> None:
+        self._schedule_full()
+
+    def _schedule_full(self) -> None:
+        self._full = True
+        self._dirty = []
+        self._timer.start()
+
+    def _render_pending(self) -> None:
+        if self._scene is None or not self.isVisible():
+            return
+        source = self._scene.sceneRect()
+        if self._full or self._image is None or source != self._source or self._image.size() != self.size():
+            self._render_full(source)
+            return
+        dirty, self._dirty = self._dirty, []
+        area = sum(r.width() * r.height() for r in dirty)
+        if area > self.FULL_RENDER_RATIO * source.width() * source.height():
+            self._render_full(source)
+            return
+        painter = QPainter(self._image)
+        for r in dirty:
+            r = r.intersected(source)
+            if r.isEmpty():
+                continue
+            target = QRectF(self._to_widget(r).toAlignedRect().adjusted(-1, -1, 1, 1))
+            # redibujar la región en coordenadas de escena que corresponde a `target`
+            src = QRectF(self._to_scene(target.topLeft()), self._to_scene(target.bottomRight()))
+            painter.fillRect(target, Qt.white)
+            self._scene.render(painter, target, src, Qt.IgnoreAspectRatio)
+        painter.end()
+        self.update()
+
+    def _render_full(self, source: QRectF) -> None:
+        self._full = False
+        self._dirty = []
+        self._source = QRectF(source)
+        self._image = QImage(self.size(), QImage.Format_ARGB32_Premultiplied)
+        self._image.fill(Qt.white)
+        if source.isEmpty():
+            self.update()
+            return
+        self._scale = min(self.width() / source.width(), self.height() / source.height())
+        self._offset = QPointF(
+            (self.width() - source.width() * self._scale) / 2,
+            (self.height() - source.height() * self._scale) / 2,
+        )
+        painter = QPainter(self._image)
+        self._scene.render(painter, self._to_widget(source), source, Qt.IgnoreAspectRatio)
+        painter.end()
+        self.update()
+
+    def _to_widget(self, r: QRectF) -> QRectF:
+        tl = (r.topLeft() - self._source.topLeft()) * self._scale + self._offset
+        return QRectF(tl.x(), tl.y(), r.width() * self._scale, r.height() * self._scale)
+
+    def _to_scene(self, p: QPointF) -> QPointF:
+        return (p - self._offset) / self._scale + self._source.topLeft()
+
+    # ---------------- Qt ----------------
+    def resizeEvent(self, event):
+        super().resizeEvent(event)
+        self._schedule_full()
+
+    def showEvent(self, event):
+        super().showEvent(event)
+        self._schedule_full()
+
+    def paintEvent(self, event):
+        painter = QPainter(self)
+        painter.fillRect(self.rect(), QColor(240, 243, 247))
+        if self._image is not None:
+            painter.drawImage(0, 0, self._image)
+        if self._view is not None and self._image is not None and not self._source.isEmpty():
+            visible = self._view.mapToScene(self._view.viewport().rect()).boundingRect()
+            painter.setPen(QPen(QColor(40, 110, 210), 2))
+            painter.setBrush(QColor(40, 110, 210, 40))
+            painter.drawRect(self._to_widget(visible.intersected(self._source)))
+        painter.end()
+
+    def mousePressEvent(self, event):
+        if event.button() == Qt.LeftButton and self._view is not None and self._image is not None:
+            self._dragging = True
+            self._view.centerOn(self._to_scene(QPointF(event.pos())))
+            event.accept()
+            return
+        super().mousePressEvent(event)
+
+    def mouseMoveEvent(self, event):
+        if self._dragging and self._view is not None:
+            self._view.centerOn(self._to_scene(QPointF(event.pos())))
+            event.accept()
+            return
+        super().mouseMoveEvent(event)
+
+    def mouseReleaseEvent(self, event):
+        if self._dragging and event.button() == Qt.LeftButton:
+            self._dragging = False
+            event.accept()
+            return
+        super().mouseReleaseEvent(event)
+
+
+class MiniMapDock(QDockWidget):
+    """Minimapa de la vista abierta (bahía o vista general): click o arrastre para desplazarse."""
+
+    def __init__(self, parent=None):
+        super().__init__("Minimapa", parent)
+        self.setObjectName("MiniMapDock")
+        self.setAllowedAreas(Qt.LeftDockWidgetArea | Qt.RightDockWidgetArea | Qt.BottomDockWidgetArea)
+        self.minimap = MiniMapWidget(self)
+        self.setWidget(self.minimap)
+
+    def set_view(self, view) -> None:
+        self.minimap.set_view(view)
@@ -6,7 +6,9 @@ from PyQt5.QtWidgets import (
     QTreeWidget, QTreeWidgetItem, QMenu
 )
 
-from domain.services.pending_service import count_pending_for_bay, count_pending_for_device
+from domain.events import CONTENT_EVENTS, BayAdded, BayRenamed, affected_bays, has_event
+from domain.services.pending_service import count_pending_by_device, count_pending_for_bay
+from diagnostics.profiler import PROFILER
 
 
 class NavigatorWidget(QWidget):
@@ -61,27 +63,61 @@ class NavigatorWidget(QWidget):
 
             # tree
             for bay_id, bay in project.bays.items():
-                counts = count_pending_for_bay(bay)
-                label = bay.name
-                if counts["total_pending"]:
-                    label = f"{bay.name}  •  P:{counts['total_pending']} (OUT {counts['out_pending']}/IN {counts['in_pending']})"
-                bay_item = QTreeWidgetItem([label])
+                bay_item = QTreeWidgetItem()
                 bay_item.setData(0, Qt.UserRole, ("BAY", bay_id, None))
                 self.tree.addTopLevelItem(bay_item)
+                self._fill_bay_item(bay_item, bay)
+                bay_item.setExpanded(True)
+        finally:
+            self._suspend_signals = False
 
-                for dev in bay.devices.values():
-                    dcounts = count_pending_for_device(dev)
-                    dlabel = dev.name
-                    if dcounts["total_pending"]:
-                        dlabel = f"{dev.name}  •  P:{dcounts['total_pending']} (OUT {dcounts['out_pending']}/IN {dcounts['in_pending']})"
-                    dev_item = QTreeWidgetItem([dlabel])
-                    dev_item.setData(0, Qt.UserRole, ("DEV", bay_id, dev.device_id))
-                    bay_item.addChild(dev_item)
+    def on_model_events(self, events) -> None:
+        """Refresca sólo las bahías afectadas; una bahía nueva cambia el orden y rehace todo."""
+        if not self._project:
+            return
+        if has_event(events, BayAdded):
+            self.refresh()
+            return
+        self.refresh_bays(affected_bays(events, CONTENT_EVENTS + (BayRenamed,)))
 
-                bay_item.setExpanded(True)
+    def refresh_bays(self, bay_ids) -> None:
+        if not self._project or not bay_ids:
+            return
+        self._suspend_signals = True
+        try:
+            for i in range(self.tree.topLevelItemCount()):
+                bay_item = self.tree.topLevelItem(i)
+                _kind, bay_id, _ = bay_item.data(0, Qt.UserRole)
+                bay = self._project.bays.get(bay_id)
+                if bay_id not in bay_ids or bay is None:
+                    continue
+                expanded = bay_item.isExpanded()
+                self._fill_bay_item(bay_item, bay)
+                bay_item.setExpanded(expanded)
+                idx = self.bay_combo.findData(bay_id)
+                if idx >= 0:
+                    self.bay_combo.setItemText(idx, bay.name)
         finally:
             self._suspend_signals = False
 
+    def _fill_bay_item(self, bay_item: QTreeWidgetItem, bay) -> None:
+        counts = count_pending_for_bay(bay)
+        label = bay.name
+        if counts["total_pending"]:
+            label = f"{bay.name}  •  P:{counts['total_pending']} (OUT {counts['out_pending']}/IN {counts['in_pending']})"
+        bay_item.setText(0, label)
+
+        bay_item.takeChildren()
+        by_dev = count_pending_by_device(bay)
+        for dev in bay.devices.values():
+            dcounts = by_dev[dev.device_id]
+            dlabel = dev.name
+            if dcounts["total_pending"]:
+                dlabel = f"{dev.name}  •  P:{dcounts['total_pending']} (OUT {dcounts['out_pending']}/IN {dcounts['in_pending']})"
+            dev_item = QTreeWidgetItem([dlabel])
+            dev_item.setData(0, Qt.UserRole, ("DEV", bay.bay_id, dev.device_id))
+            bay_item.addChild(dev_item)
+
     def select_bay(self, bay_id: str) -> None:
         idx = self.bay_combo.findData(bay_id)
         if idx >= 0:
@@ -129,3 +165,6 @@ class NavigatorWidget(QWidget):
         elif kind == "DEV":
             self.deviceRenameRequested.emit(bay_id, dev_id)
 
+
+PROFILER.hook(NavigatorWidget, "refresh", cat="ui")
+PROFILER.hook(NavigatorWidget, "refresh_bays", cat="ui")
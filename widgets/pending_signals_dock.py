@@ -8,18 +8,28 @@ from PyQt5.QtWidgets import (
 
 from ui.dialogs.recognize_signal_dialog import RecognizeSignalDialog
 from ui.dialogs.edit_signal_dialog import EditSignalDialog
+from ui.dialogs.bulk_recognize_dialog import BulkRecognizeDialog
+from domain.services.bulk_recognition_service import apply_matches, match_pending_outputs
 from domain.services.link_service import (
     find_signal_destination_device_id,
     recognize_pending_link_cross,
-    remove_link_project,
+    remove_links_project,
     rename_signal_texts,
+    set_signal_nature,
     update_signal_destination,
 )
+from diagnostics.profiler import PROFILER
+from domain.events import (
+    CONTENT_EVENTS, BayAdded, BayRenamed, affected_bays, has_event,
+)
+from domain.services.pending_service import iter_pending
+
+# eventos que pueden cambiar filas visibles (estado, textos, nombres de equipo/bahía)
+_ROW_EVENTS = CONTENT_EVENTS + (BayRenamed,)
 
 
 class PendingSignalsDock(QDockWidget):
     jumpRequested = pyqtSignal(str, str)      # bay_id, device_id
-    projectMutated = pyqtSignal(set)          # bay_ids affected
 
     def __init__(self, parent=None):
         super().__init__("Pendientes", parent)
@@ -66,6 +76,7 @@ class PendingSignalsDock(QDockWidget):
         btns = QHBoxLayout()
         self.btn_jump = QPushButton("Ir al equipo")
         self.btn_rec = QPushButton("Reconocer…")
+        self.btn_rec_rule = QPushButton("Reconocer por regla…")
         self.btn_edit = QPushButton("Editar…")
         self.btn_del = QPushButton("Eliminar…")
         self.btn_next = QPushButton("Siguiente pendiente")
@@ -73,12 +84,13 @@ class PendingSignalsDock(QDockWidget):
 
         self.btn_jump.clicked.connect(self.jump_to_selected)
         self.btn_rec.clicked.connect(self.recognize_selected)
+        self.btn_rec_rule.clicked.connect(self.recognize_by_rule)
         self.btn_edit.clicked.connect(self.edit_selected)
         self.btn_del.clicked.connect(self.delete_selected)
         self.btn_next.clicked.connect(self.next_pending)
         self.btn_refresh.clicked.connect(self.refresh)
 
-        for b in [self.btn_jump, self.btn_rec, self.btn_edit, self.btn_del]:
+        for b in [self.btn_jump, self.btn_rec, self.btn_rec_rule, self.btn_edit, self.btn_del]:
             btns.addWidget(b)
         btns.addWidget(self.btn_next)
         btns.addStretch(1)
@@ -90,13 +102,29 @@ class PendingSignalsDock(QDockWidget):
         self._populate_bays()
         self.refresh()
 
+    def on_model_events(self, events):
+        """Actualiza sólo si el lote toca lo que la tabla muestra con el filtro actual."""
+        if not self._project:
+            return
+        if has_event(events, (BayAdded, BayRenamed)):
+            self._populate_bays()
+        if not has_event(events, _ROW_EVENTS):
+            return
+        filter_bay = self.cmb_bay.currentData()
+        if filter_bay and filter_bay not in affected_bays(events, _ROW_EVENTS):
+            return
+        self.refresh()
+
     def _populate_bays(self):
+        current = self.cmb_bay.currentData()
         self.cmb_bay.blockSignals(True)
         self.cmb_bay.clear()
         self.cmb_bay.addItem("Todas", None)
         if self._project:
             for bay_id, bay in self._project.bays.items():
                 self.cmb_bay.addItem(bay.name, bay_id)
+        idx = self.cmb_bay.findData(current) if current else -1
+        self.cmb_bay.setCurrentIndex(max(idx, 0))
         self.cmb_bay.blockSignals(False)
 
     def _collect_pending(self):
@@ -107,36 +135,32 @@ class PendingSignalsDock(QDockWidget):
         search = (self.txt_search.text() or "").strip().lower()
         only_out = self.chk_only_out.isChecked()
 
+        if filter_bay and filter_bay not in self._project.bays:
+            return []
+
+        # bahía/dirección/estado se filtran sobre el almacén columnar; la búsqueda de texto
+        # sólo recorre los pendientes ya filtrados
         rows = []
-        for bay_id, bay in self._project.bays.items():
-            if filter_bay and bay_id != filter_bay:
+        for bay, dev, direction, e in iter_pending(self._project, bay_id=filter_bay, only_out=only_out):
+            sig = bay.signals.get(e.signal_id)
+            name = sig.name if sig else e.signal_id
+            txt_ = e.text or ""
+            if search and (search not in name.lower()
+                           and search not in txt_.lower()
+                           and search not in e.signal_id.lower()
+                           and search not in dev.name.lower()):
                 continue
-            for dev in bay.devices.values():
-                ends = [("IN", e) for e in dev.inputs] + [("OUT", e) for e in dev.outputs]
-                for direction, e in ends:
-                    if only_out and direction != "OUT":
-                        continue
-                    if (e.status or "").upper() != "PENDING":
-                        continue
-                    sig = bay.signals.get(e.signal_id)
-                    name = sig.name if sig else e.signal_id
-                    txt_ = e.text or ""
-                    if search and (search not in name.lower()
-                                   and search not in txt_.lower()
-                                   and search not in e.signal_id.lower()
-                                   and search not in dev.name.lower()):
-                        continue
-                    rows.append({
-                        "bay_id": bay_id,
-                        "bay_name": bay.name,
-                        "device_id": dev.device_id,
-                        "device_name": dev.name,
-                        "direction": direction,
-                        "signal_id": e.signal_id,
-                        "signal_name": name,
-                        "text": txt_,
-                        "status": e.status,
-                    })
+            rows.append({
+                "bay_id": bay.bay_id,
+                "bay_name": bay.name,
+                "device_id": dev.device_id,
+                "device_name": dev.name,
+                "direction": direction,
+                "signal_id": e.signal_id,
+                "signal_name": name,
+                "text": txt_,
+                "status": e.status,
+            })
         return rows
 
     def refresh(self):
@@ -222,7 +246,8 @@ class PendingSignalsDock(QDockWidget):
             QMessageBox.information(self, "Reconocer", "Solo se reconoce desde una salida (OUT).")
             return
 
-        dlg = RecognizeSignalDialog(self._project, origin_bay_id=bay_id, origin_device_id=dev_id, parent=self)
+        dlg = RecognizeSignalDialog(self._project, origin_bay_id=bay_id, origin_device_id=dev_id, parent=self,
+                                    signal_id=signal_id)
         if dlg.exec_() != dlg.Accepted:
             return
         dest_bay_id, dest_dev_id = dlg.get_selection()
@@ -230,10 +255,30 @@ class PendingSignalsDock(QDockWidget):
             return
 
         recognize_pending_link_cross(self._project, bay_id, dev_id, signal_id, dest_bay_id, dest_dev_id)
-        self.refresh()
-        self.projectMutated.emit({bay_id, dest_bay_id})
         QMessageBox.information(self, "OK", "Señal reconocida (creada entrada espejo y confirmada salida).")
 
+    def recognize_by_rule(self):
+        """Reconoce en bloque los OUT pendientes cuyo texto nombra un equipo existente
+        (bahía del filtro, o todo el proyecto), previa vista previa."""
+        if not self._project:
+            return
+        matches = match_pending_outputs(self._project, bay_id=self.cmb_bay.currentData())
+        if not matches:
+            QMessageBox.information(self, "Reconocer por regla", "No hay salidas pendientes.")
+            return
+        dlg = BulkRecognizeDialog(self._project, matches, parent=self)
+        if dlg.exec_() != dlg.Accepted:
+            return
+        selected = dlg.get_selected()
+        if not selected:
+            return
+        try:
+            n = apply_matches(self._project, selected)
+        except Exception as e:
+            QMessageBox.critical(self, "Reconocer por regla", f"No se aplicó ningún cambio.\n{e}")
+            return
+        QMessageBox.information(self, "OK", f"Se reconocieron {n} señales.")
+
     def edit_selected(self):
         sel = self._get_selected()
         if not sel or not self._project:
@@ -263,19 +308,16 @@ class PendingSignalsDock(QDockWidget):
             return
         new_name, new_nature, _new_tb, new_dest_id = dlg.get_data()
 
-        affected = set()
-        for b in self._project.bays.values():
-            if signal_id in b.signals:
-                affected.add(b.bay_id)
-                rename_signal_texts(b, signal_id, new_name)
-                b.signals[signal_id].nature = new_nature
+        project = self._project
+        with project.batch():
+            for b in project.bays.values():
+                if signal_id in b.signals:
+                    rename_signal_texts(b, signal_id, new_name, project=project)
+                    set_signal_nature(b, signal_id, new_nature, project=project)
 
-        if new_dest_id != current_dest_id:
-            update_signal_destination(bay, signal_id, new_dest_id)
-            affected.add(bay.bay_id)
+            if new_dest_id != current_dest_id:
+                update_signal_destination(bay, signal_id, new_dest_id, project=project)
 
-        self.refresh()
-        self.projectMutated.emit(affected)
         QMessageBox.information(self, "OK", "Señal actualizada en el proyecto.")
 
     def delete_selected(self):
@@ -291,13 +333,10 @@ class PendingSignalsDock(QDockWidget):
         if btn != QMessageBox.Yes:
             return
 
-        affected = set()
-        for sid in signal_ids:
-            for b in self._project.bays.values():
-                if sid in b.signals:
-                    affected.add(b.bay_id)
-            remove_link_project(self._project, sid)
+        with self._project.batch():
+            remove_links_project(self._project, signal_ids)
 
-        self.refresh()
-        self.projectMutated.emit(affected)
         QMessageBox.information(self, "OK", "Señales eliminadas del proyecto.")
+
+
+PROFILER.hook(PendingSignalsDock, "refresh", cat="ui")
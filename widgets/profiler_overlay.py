@@ -0,0 +1,79 @@
+from __future__ import annotations
+
+from PyQt5.QtCore import QEvent, QRect, Qt, QTimer
+from PyQt5.QtGui import QColor, QFont, QFontMetrics, QPainter
+from PyQt5.QtWidgets import QWidget
+
+from diagnostics.profiler import PROFILER
+
+
+class ProfilerOverlay(QWidget):
+    """Panel semitransparente sobre el canvas con las mediciones del perfilador: llamadas,
+    tiempo total, promedio y máximo por nombre (los de mayor tiempo total primero).
+
+    Se ubica en la esquina superior derecha del widget padre y no recibe el mouse.
+    Mostrarlo activa el perfilador; ocultarlo lo desactiva (las mediciones se conservan).
+    """
+
+    REFRESH_MS = 500
+    ROWS = 16
+    MARGIN = 8
+
+    def __init__(self, parent):
+        super().__init__(parent)
+        self.setAttribute(Qt.WA_TransparentForMouseEvents, True)
+        self.setAttribute(Qt.WA_NoSystemBackground, True)
+        self._font = QFont("Consolas", 8)
+        self._font.setStyleHint(QFont.Monospace)
+        self._lines: list[str] = []
+        self._timer = QTimer(self)
+        self._timer.setInterval(self.REFRESH_MS)
+        self._timer.timeout.connect(self._refresh)
+        parent.installEventFilter(self)
+        self.hide()
+
+    def set_active(self, active: bool) -> None:
+        PROFILER.set_enabled(active)
+        if active:
+            self._refresh()
+            self._place()
+            self.show()
+            self.raise_()
+            self._timer.start()
+        else:
+            self._timer.stop()
+            self.hide()
+
+    def eventFilter(self, obj, event):
+        if obj is self.parent() and event.type() in (QEvent.Resize, QEvent.ChildAdded):
+            if self.isVisible():
+                self._place()
+                self.raise_()
+        return False
+
+    def _refresh(self) -> None:
+        header = f"{'':<34}{'llam.':>7}{'total ms':>11}{'prom ms':>9}{'máx ms':>9}"
+        rows = [
+            f"{s['name'][:33]:<34}{s['calls']:>7}{s['total_ms']:>11.1f}{s['mean_ms']:>9.2f}{s['max_ms']:>9.1f}"
+            for s in PROFILER.stats()[:self.ROWS]
+        ]
+        self._lines = [header] + (rows or ["(sin mediciones)"])
+        self._place()
+        self.update()
+
+    def _place(self) -> None:
+        fm = QFontMetrics(self._font)
+        w = max(fm.horizontalAdvance(line) for line in self._lines or [""]) + 2 * self.MARGIN
+        h = fm.height() * max(1, len(self._lines)) + 2 * self.MARGIN
+        parent = self.parentWidget()
+        self.setGeometry(QRect(parent.width() - w - 12, 12, w, h))
+
+    def paintEvent(self, event):
+        painter = QPainter(self)
+        painter.fillRect(self.rect(), QColor(20, 25, 30, 200))
+        painter.setFont(self._font)
+        fm = painter.fontMetrics()
+        for i, line in enumerate(self._lines):
+            painter.setPen(QColor(150, 200, 255) if i == 0 else QColor(235, 240, 245))
+            painter.drawText(self.MARGIN, self.MARGIN + fm.ascent() + i * fm.height(), line)
+        painter.end()
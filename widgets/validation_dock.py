@@ -0,0 +1,279 @@
+from __future__ import annotations
+
+from PyQt5.QtCore import Qt, pyqtSignal, QAbstractTableModel, QModelIndex, QSortFilterProxyModel
+from PyQt5.QtGui import QColor
+from PyQt5.QtWidgets import (
+    QDockWidget, QWidget, QVBoxLayout, QHBoxLayout, QLabel, QPushButton, QComboBox, QLineEdit,
+    QCheckBox, QTableView, QAbstractItemView, QProgressBar
+)
+
+
+class IssueTableModel(QAbstractTableModel):
+    """Observaciones (ValidationIssue) como tabla: nivel, bahía, equipo, dir, SignalID, mensaje."""
+
+    COLUMNS = ["Nivel", "Bahía", "Equipo", "Dir", "SignalID", "Observación"]
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self._project = None
+        self._issues: list = []
+
+    def set_project(self, project):
+        self._project = project
+        self.set_issues([])
+
+    def set_issues(self, issues: list):
+        self.beginResetModel()
+        self._issues = list(issues)
+        self.endResetModel()
+
+    def append_issues(self, issues: list):
+        if not issues:
+            return
+        start = len(self._issues)
+        self.beginInsertRows(QModelIndex(), start, start + len(issues) - 1)
+        self._issues.extend(issues)
+        self.endInsertRows()
+
+    def issue_at(self, row: int):
+        return self._issues[row] if 0 <= row < len(self._issues) else None
+
+    def bay_name(self, bay_id: str) -> str:
+        bay = self._project.bays.get(bay_id) if self._project else None
+        return bay.name if bay else bay_id
+
+    def device_name(self, bay_id: str, device_id: str | None) -> str:
+        if not device_id:
+            return ""
+        bay = self._project.bays.get(bay_id) if self._project else None
+        dev = bay.devices.get(device_id) if bay else None
+        return dev.name if dev else device_id
+
+    # ---------------- Qt model API ----------------
+    def rowCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else len(self._issues)
+
+    def columnCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else len(self.COLUMNS)
+
+    def headerData(self, section, orientation, role=Qt.DisplayRole):
+        if role == Qt.DisplayRole and orientation == Qt.Horizontal:
+            return self.COLUMNS[section]
+        return None
+
+    def data(self, index, role=Qt.DisplayRole):
+        if not index.isValid():
+            return None
+        issue = self._issues[index.row()]
+        col = index.column()
+        if role == Qt.DisplayRole:
+            if col == 0:
+                return issue.level
+            if col == 1:
+                return self.bay_name(issue.bay_id)
+            if col == 2:
+                return self.device_name(issue.bay_id, issue.device_id)
+            if col == 3:
+                return issue.direction or ""
+            if col == 4:
+                return issue.signal_id
+            return issue.message
+        if role == Qt.TextAlignmentRole and col in (0, 3):
+            return Qt.AlignCenter
+        if role == Qt.ForegroundRole and col == 0 and issue.level == "ERROR":
+            return QColor(170, 30, 30)
+        if role == Qt.UserRole:
+            return issue
+        return None
+
+
+class IssueFilterProxy(QSortFilterProxyModel):
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self._level = None
+        self._bay_id = None
+        self._text = ""
+
+    def set_filters(self, *, level=None, bay_id=None, text: str = ""):
+        self._level = level
+        self._bay_id = bay_id
+        self._text = (text or "").strip().lower()
+        self.invalidateFilter()
+
+    def filterAcceptsRow(self, source_row, source_parent):
+        issue = self.sourceModel().issue_at(source_row)
+        if issue is None:
+            return False
+        if self._level and issue.level != self._level:
+            return False
+        if self._bay_id and issue.bay_id != self._bay_id:
+            return False
+        if self._text:
+            src = self.sourceModel()
+            hay = f"{issue.message} {issue.signal_id} {src.device_name(issue.bay_id, issue.device_id)}".lower()
+            if self._text not in hay:
+                return False
+        return True
+
+
+class ValidationDock(QDockWidget):
+    """Observaciones de validación.
+
+    - En vivo: se actualiza tras cada edición (validador incremental).
+    - Validar proyecto: validación completa (incluye chequeos entre bahías) en segundo plano;
+      los resultados se agregan a medida que cada bahía termina.
+    Click en una fila selecciona el equipo/chip en el canvas.
+    """
+    issueActivated = pyqtSignal(str, str, str, str)   # bay_id, device_id, direction, signal_id
+    validateRequested = pyqtSignal()
+    cancelRequested = pyqtSignal()
+    liveToggled = pyqtSignal(bool)
+
+    def __init__(self, parent=None):
+        super().__init__("Validación", parent)
+        self.setObjectName("ValidationDock")
+        self.setAllowedAreas(Qt.LeftDockWidgetArea | Qt.RightDockWidgetArea | Qt.BottomDockWidgetArea)
+
+        self._project = None
+        self._total_bays = 0
+        self._done_bays = 0
+
+        w = QWidget()
+        self.setWidget(w)
+        lay = QVBoxLayout(w)
+        lay.setContentsMargins(8, 8, 8, 8)
+
+        top = QHBoxLayout()
+        self.chk_live = QCheckBox("En vivo")
+        self.chk_live.toggled.connect(self.liveToggled.emit)
+        top.addWidget(self.chk_live)
+        self.btn_validate = QPushButton("Validar proyecto")
+        self.btn_cancel = QPushButton("Cancelar")
+        self.btn_cancel.setEnabled(False)
+        self.btn_validate.clicked.connect(self.validateRequested.emit)
+        self.btn_cancel.clicked.connect(self.cancelRequested.emit)
+        top.addWidget(self.btn_validate)
+        top.addWidget(self.btn_cancel)
+        self.progress = QProgressBar()
+        self.progress.setTextVisible(True)
+        self.progress.setRange(0, 1)
+        self.progress.setValue(0)
+        top.addWidget(self.progress, 1)
+        lay.addLayout(top)
+
+        fl = QHBoxLayout()
+        fl.addWidget(QLabel("Nivel:"))
+        self.cmb_level = QComboBox()
+        self.cmb_level.addItem("Todos", None)
+        self.cmb_level.addItem("Errores", "ERROR")
+        self.cmb_level.addItem("Advertencias", "WARNING")
+        self.cmb_level.currentIndexChanged.connect(self._apply_filters)
+        fl.addWidget(self.cmb_level)
+        fl.addWidget(QLabel("Bahía:"))
+        self.cmb_bay = QComboBox()
+        self.cmb_bay.currentIndexChanged.connect(self._apply_filters)
+        fl.addWidget(self.cmb_bay, 1)
+        self.txt_search = QLineEdit()
+        self.txt_search.setPlaceholderText("Buscar…")
+        self.txt_search.textChanged.connect(self._apply_filters)
+        fl.addWidget(self.txt_search, 2)
+        lay.addLayout(fl)
+
+        self.lbl_status = QLabel("Sin validar.")
+        self.lbl_status.setStyleSheet("color:#555;")
+        lay.addWidget(self.lbl_status)
+
+        self.model = IssueTableModel(self)
+        self.proxy = IssueFilterProxy(self)
+        self.proxy.setSourceModel(self.model)
+
+        self.tbl = QTableView()
+        self.tbl.setModel(self.proxy)
+        self.tbl.setSelectionBehavior(QAbstractItemView.SelectRows)
+        self.tbl.setSelectionMode(QAbstractItemView.SingleSelection)
+        self.tbl.setEditTriggers(QAbstractItemView.NoEditTriggers)
+        self.tbl.setAlternatingRowColors(True)
+        self.tbl.setWordWrap(False)
+        self.tbl.verticalHeader().setVisible(False)
+        self.tbl.horizontalHeader().setStretchLastSection(True)
+        self.tbl.clicked.connect(self._on_activated)
+        self.tbl.activated.connect(self._on_activated)
+        lay.addWidget(self.tbl, 1)
+
+    # ---------------- API ----------------
+    def is_live(self) -> bool:
+        return self.chk_live.isChecked()
+
+    def set_project(self, project):
+        self._project = project
+        self.model.set_project(project)
+        self._populate_bays()
+        self.lbl_status.setText("Sin validar.")
+        self.progress.setRange(0, 1)
+        self.progress.setValue(0)
+
+    def set_live_issues(self, issues: list):
+        self.model.set_issues(issues)
+        n_err = sum(1 for i in issues if i.level == "ERROR")
+        self.lbl_status.setText(
+            f"En vivo: {len(issues)} observaciones ({n_err} errores)." if issues else "En vivo: sin observaciones."
+        )
+
+    def refresh_bays(self):
+        self._populate_bays()
+
+    def begin(self, total_bays: int):
+        self.model.set_issues([])
+        self._total_bays = total_bays
+        self._done_bays = 0
+        self.progress.setRange(0, max(1, total_bays))
+        self.progress.setValue(0)
+        self.btn_validate.setEnabled(False)
+        self.btn_cancel.setEnabled(True)
+        self.lbl_status.setText("Validando proyecto…")
+
+    def append_issues(self, bay_id: str, issues: list):
+        self._done_bays += 1
+        self.progress.setValue(self._done_bays)
+        self.model.append_issues(issues)
+
+    def finish(self, *, cancelled: bool):
+        self.btn_validate.setEnabled(True)
+        self.btn_cancel.setEnabled(False)
+        n = self.model.rowCount()
+        if cancelled:
+            self.lbl_status.setText(f"Cancelado ({self._done_bays}/{self._total_bays} bahías, {n} observaciones).")
+        elif n == 0:
+            self.lbl_status.setText("Proyecto: OK, sin observaciones.")
+        else:
+            self.lbl_status.setText(f"Proyecto: {n} observaciones en {self._total_bays} bahías.")
+        self.tbl.resizeColumnsToContents()
+
+    # ---------------- Helpers ----------------
+    def _populate_bays(self):
+        current = self.cmb_bay.currentData()
+        self.cmb_bay.blockSignals(True)
+        self.cmb_bay.clear()
+        self.cmb_bay.addItem("Todas", None)
+        if self._project:
+            for bay_id, bay in self._project.bays.items():
+                self.cmb_bay.addItem(bay.name, bay_id)
+        idx = self.cmb_bay.findData(current)
+        self.cmb_bay.setCurrentIndex(idx if idx >= 0 else 0)
+        self.cmb_bay.blockSignals(False)
+        self._apply_filters()
+
+    def _apply_filters(self, *_args):
+        self.proxy.set_filters(
+            level=self.cmb_level.currentData(),
+            bay_id=self.cmb_bay.currentData(),
+            text=self.txt_search.text(),
+        )
+
+    def _on_activated(self, index):
+        if not index.isValid():
+            return
+        issue = self.proxy.data(index, Qt.UserRole)
+        if issue is None or not issue.device_id:
+            return
+        self.issueActivated.emit(issue.bay_id, issue.device_id, issue.direction or "", issue.signal_id)